@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+    Times 'harvest' on synthetic benchmark trees whose tasks list many input paths (library directories
+    and files within their own input directory), and compares the timings with stored baselines.
+
+    Run from the repository root (nothing outside the scratch directory is touched):
+        python -m benchmarks.harvest_inputs --inputs 100 --inputs 1000
+        python -m benchmarks.harvest_inputs --save-baseline
+"""
+
+# Standard library imports
+import io
+import json
+import time
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import Annotated, Optional
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import rich
+import typer
+from rich.table import Table
+
+# Project-local imports
+from cli.commands import harvest
+from benchmarks.synthetic import generate_benchmark_tree
+from benchmarks.scoring_pipeline import DEFAULT_BASELINES
+
+STAGE = "harvest-inputs"
+DEFAULT_INPUTS = [10, 100, 1000]
+
+def main(
+        inputs: Annotated[Optional[list[int]], typer.Option("--inputs", "-i", help="Input paths per task to benchmark with (repeatable, defaults to 10, 100 and 1000)")] = None,
+        tasks: Annotated[int, typer.Option("--tasks", "-n", help="Number of synthetic tasks")] = 200,
+        baselines: Annotated[Path, typer.Option("--baselines", help="JSON file of the baseline timings")] = DEFAULT_BASELINES,
+        save_baseline: Annotated[bool, typer.Option("--save-baseline", help="Store the measured timings as the new baselines")] = False,
+        fail_over: Annotated[Optional[float], typer.Option("--fail-over", help="Exit with an error when slower than this ratio of the baseline (e.g. 1.5)")] = None,
+):
+    inputs = sorted(set(inputs or DEFAULT_INPUTS))
+    reference = json.loads(baselines.read_text()) if baselines.exists() else {}
+
+    measured: dict[str, float] = {}
+    scratch = Path(tempfile.mkdtemp(prefix="sv-comp-bench-"))
+    try:
+        for count in inputs:
+            root = scratch / str(count)
+            bench, out = root / "bench", root / "out"
+            out.mkdir(parents=True)
+            rich.print(f"[yellow]Generating {tasks} synthetic tasks with {count} more input paths each...[/yellow]")
+            generate_benchmark_tree(bench, tasks, inputs=count)
+            harvest.config.path_to_sv_comp_benchmark_dir = bench
+            harvest.config.path_to_output_dir = out
+            measured[str(count)] = __timed_harvest()
+            shutil.rmtree(root, ignore_errors=True)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    table = Table(title=f"Harvest wall time, {tasks} tasks (seconds, ratio to baseline)")
+    table.add_column("Inputs per task", justify="right")
+    table.add_column("Wall time", justify="right")
+    regressed = []
+    for count, elapsed in measured.items():
+        baseline = reference.get(STAGE, {}).get(count)
+        cell = f"{elapsed:.2f}"
+        if baseline:
+            ratio = elapsed / baseline
+            slower = fail_over is not None and ratio > fail_over
+            if slower:
+                regressed.append(count)
+            cell += f" [{'red' if slower else 'green' if ratio <= 1 else 'yellow'}]({ratio:.2f}x)[/]"
+        table.add_row(count, cell)
+    rich.print(table)
+
+    if save_baseline:
+        reference.setdefault(STAGE, {}).update(measured)
+        baselines.write_text(json.dumps(reference, indent=4, sort_keys=True) + "\n")
+        rich.print(f"[green]Baselines saved to[/green] [cyan]{baselines}[/cyan]")
+    if regressed:
+        rich.print(f"[bold red]Slower than {fail_over}x the baseline with[/bold red] {', '.join(regressed)} [bold red]inputs per task[/bold red]")
+        raise typer.Exit(code=1)
+
+def __timed_harvest() -> float:
+    # harvest prints its own report: keep it out of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        harvest.harvest()
+        return time.perf_counter() - start
+
+if __name__ == "__main__":
+    typer.run(main)
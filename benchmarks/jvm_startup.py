@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+    Compares LiSA start-up and end-to-end time on the bundled test programs (test/01 and test/02)
+    under each JVM profile, with and without an AppCDS archive.
+
+    Run from the repository root (uses config.json like the CLI does):
+        python -m benchmarks.jvm_startup --repeat 5
+"""
+
+# Standard library imports
+import time
+import shutil
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Annotated, Optional
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import rich
+import typer
+from rich.table import Table
+
+# Project-local imports
+from cli.commands import analyse
+from cli.commands.analyse import get_lisa_cmd, prepare_cds_archive
+from cli.models.jvm_profile import BUILTIN_JVM_PROFILES
+from cli.utils.util import resource_path
+
+PROGRAMS = {
+    "test/01": resource_path("test/01/Main.java"),
+    "test/02": resource_path("test/02/Main.java"),
+}
+
+def main(
+        repeat: Annotated[int, typer.Option("--repeat", "-r", help="Runs per (profile, CDS, program) combination")] = 5,
+        profiles: Annotated[Optional[list[str]], typer.Option("--profile", help="JVM profiles to compare (defaults to all)")] = None,
+        max_memory: Annotated[int, typer.Option("--max-memory", "-m", help="Maximum heap in GB")] = 2,
+):
+    config = analyse.config
+    config.validate()
+    names = profiles or list({**BUILTIN_JVM_PROFILES, **config.jvm_profiles})
+    scratch = Path(config.path_to_output_dir) / "bench-jvm-startup"
+
+    table = Table(title=f"LiSA wall time per run (median / min of {repeat}, seconds)")
+    table.add_column("Profile")
+    table.add_column("CDS")
+    for program in PROGRAMS:
+        table.add_column(program, justify="right")
+
+    for name in names:
+        profile = config.get_jvm_profile(name)
+        for cds in (False, True):
+            options = profile.to_options()
+            if cds:
+                archive = prepare_cds_archive(name, profile, max_memory)
+                if archive is None:
+                    continue
+                options.append(f"-XX:SharedArchiveFile={archive}")
+
+            cells = []
+            for program, source in PROGRAMS.items():
+                command = get_lisa_cmd(config, str(source), scratch.name, max_memory, options)
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    subprocess.run(command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                    timings.append(time.perf_counter() - start)
+                    shutil.rmtree(scratch, ignore_errors=True)
+                cells.append(f"{statistics.median(timings):.3f} / {min(timings):.3f}")
+            table.add_row(name, "yes" if cds else "no", *cells)
+
+    rich.print(table)
+
+if __name__ == "__main__":
+    typer.run(main)
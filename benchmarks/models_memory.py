@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""
+    Measures the memory held by the task and report models (TaskDefinition as loaded from tasks.json,
+    LisaReport as loaded from report.json) on synthetic data, per task and per warning,
+    and compares it with stored baselines.
+
+    Run from the repository root:
+        python -m benchmarks.models_memory --tasks 100000
+        python -m benchmarks.models_memory --save-baseline
+"""
+
+# Standard library imports
+import gc
+import json
+import random
+import tracemalloc
+from pathlib import Path
+from typing import Annotated, Callable
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import rich
+import typer
+from rich.table import Table
+
+# Project-local imports
+from cli.models.lisa_report.lisa_report import LisaReport
+from cli.models.task_definition.task_definition import TaskDefinition
+from benchmarks.synthetic import ASSERT_WARNINGS, OTHER_WARNINGS, RUNTIME_WARNINGS, TASKS_PER_CATEGORY, task_name
+
+DEFAULT_BASELINES = Path(__file__).parent / "memory_baselines.json"
+
+def main(
+        tasks: Annotated[int, typer.Option("--tasks", "-n", help="Number of synthetic tasks (and reports) to load")] = 100000,
+        warnings: Annotated[int, typer.Option("--warnings", help="Average number of warnings in each synthetic report")] = 5,
+        baselines: Annotated[Path, typer.Option("--baselines", help="JSON file of the baseline sizes")] = DEFAULT_BASELINES,
+        save_baseline: Annotated[bool, typer.Option("--save-baseline", help="Store the measured sizes as the new baselines")] = False,
+):
+    reference = json.loads(baselines.read_text()) if baselines.exists() else {}
+    rnd = random.Random(0)
+
+    rich.print(f"[yellow]Loading {tasks} synthetic tasks and reports...[/yellow]")
+    tasks_json = json.dumps([__task_record(i, rnd) for i in range(tasks)])
+    reports_json = [json.dumps(__report_record(warnings, rnd)) for _ in range(tasks)]
+    total_warnings = sum(len(json.loads(r)["warnings"]) for r in reports_json)
+
+    measured = {
+        "bytes per task": __retained(lambda: [TaskDefinition(**t) for t in json.loads(tasks_json)]) / tasks,
+        "bytes per warning": __retained(lambda: [LisaReport(**json.loads(r)) for r in reports_json]) / max(total_warnings, 1),
+    }
+
+    table = Table(title=f"Memory held by the models ({tasks:,} tasks, {total_warnings:,} warnings)")
+    table.add_column("Measure")
+    table.add_column("Measured", justify="right")
+    table.add_column("Baseline", justify="right")
+    for measure, size in measured.items():
+        baseline = reference.get(measure)
+        cells = [f"{size:.0f}", "[dim]none[/dim]"]
+        if baseline:
+            ratio = size / baseline
+            cells[1] = f"{baseline:.0f} [{'green' if ratio <= 1 else 'red'}]({ratio:.2f}x)[/]"
+        table.add_row(measure, *cells)
+    rich.print(table)
+
+    if save_baseline:
+        reference.update({measure: round(size) for measure, size in measured.items()})
+        baselines.write_text(json.dumps(reference, indent=4, sort_keys=True) + "\n")
+        rich.print(f"[green]Baselines saved to[/green] [cyan]{baselines}[/cyan]")
+
+def __retained(load: Callable[[], list]) -> int:
+    """
+        Bytes still allocated once the models are loaded, i.e. held by the models
+        (the parsed JSON they are built from is garbage by then)
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        models = load()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del models
+    return retained
+
+def __task_record(i: int, rnd: random.Random) -> dict:
+    """
+        A task as saved in tasks.json by 'harvest' for generate_benchmark_tree's layout
+    """
+    category = f"/sv-benchmarks/java/category{i // TASKS_PER_CATEGORY:04d}"
+    properties = []
+    if rnd.random() < 0.9:
+        properties.append({"property_file": "../properties/valid-assert.prp", "expected_verdict": rnd.random() < 0.5})
+    if rnd.random() < 0.9 or not properties:
+        properties.append({"property_file": "../properties/no-runtime-exception.prp", "expected_verdict": rnd.random() < 0.5})
+    return {
+        "file_name": f"{task_name(i)}.yml",
+        "path_to_definition": f"{category}/{task_name(i)}.yml",
+        "input_files": [f"{category}/{task_name(i)}", f"{category}/../common"],
+        "properties": properties,
+    }
+
+def __report_record(warnings: int, rnd: random.Random) -> dict:
+    messages = [
+        f"Main.java:{rnd.randrange(1, 500)}:{rnd.randrange(1, 80)}: "
+        + rnd.choice(rnd.choice([ASSERT_WARNINGS, RUNTIME_WARNINGS, OTHER_WARNINGS]))
+        for _ in range(rnd.randint(0, 2 * warnings))
+    ]
+    return {"warnings": [{"message": m} for m in messages], "info": {"warnings": len(messages)}}
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+"""
+    Times the Python side of a run (harvest, analyse with a stub LiSA, statistics and compare)
+    on synthetic benchmark and results trees of growing size, and compares the timings with stored baselines.
+
+    Run from the repository root (nothing outside the scratch directory is touched):
+        python -m benchmarks.scoring_pipeline --scale 1000 --scale 10000
+        python -m benchmarks.scoring_pipeline --save-baseline
+"""
+
+# Standard library imports
+import io
+import os
+import json
+import math
+import time
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+from typing import Annotated, Callable, Optional
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import rich
+import typer
+from rich.table import Table
+
+# Project-local imports
+from cli.commands import analyse, compare, harvest, statistics
+from benchmarks.synthetic import generate_benchmark_tree, generate_results_tree, generate_svcomp_pair
+
+STAGES = ["harvest", "analyse", "statistics", "compare"]
+DEFAULT_SCALES = [1000, 10000, 100000]
+DEFAULT_BASELINES = Path(__file__).parent / "baselines.json"
+STUB_DIR = Path(__file__).parent / "stub"
+
+def main(
+        scales: Annotated[Optional[list[int]], typer.Option("--scale", "-n", help="Numbers of tasks to benchmark with (repeatable, defaults to 1k, 10k and 100k)")] = None,
+        stages: Annotated[Optional[list[str]], typer.Option("--stage", "-s", help=f"Stages to time (repeatable, defaults to all: {', '.join(STAGES)})")] = None,
+        budget: Annotated[float, typer.Option("--budget", help="Skip the larger scales of a stage once it is expected to take longer than this (seconds)")] = 120,
+        warnings: Annotated[int, typer.Option("--warnings", help="Average number of warnings in each synthetic report.json")] = 5,
+        parallelism: Annotated[int, typer.Option("--parallelism", "-p", help="Parallel analyses in the 'analyse' stage")] = os.cpu_count() or 1,
+        baselines: Annotated[Path, typer.Option("--baselines", help="JSON file of the baseline timings")] = DEFAULT_BASELINES,
+        save_baseline: Annotated[bool, typer.Option("--save-baseline", help="Store the measured timings as the new baselines")] = False,
+        fail_over: Annotated[Optional[float], typer.Option("--fail-over", help="Exit with an error when a stage is slower than this ratio of its baseline (e.g. 1.5)")] = None,
+        workdir: Annotated[Optional[Path], typer.Option("--workdir", help="Scratch directory for the synthetic trees (defaults to a temporary one, removed at the end)")] = None,
+):
+    scales = sorted(set(scales or DEFAULT_SCALES))
+    stages = stages or STAGES
+    for stage in stages:
+        if stage not in STAGES:
+            raise typer.BadParameter(f"Unknown stage {stage}: choose among {', '.join(STAGES)}")
+
+    reference = json.loads(baselines.read_text()) if baselines.exists() else {}
+    scratch = Path(workdir or tempfile.mkdtemp(prefix="sv-comp-bench-"))
+    os.environ["PATH"] = f"{STUB_DIR}{os.pathsep}{os.environ['PATH']}"
+    os.environ["STUB_SLEEP"] = "0"
+
+    measured: dict[str, dict[str, float]] = {stage: {} for stage in stages}
+    try:
+        for scale in scales:
+            root = scratch / str(scale)
+            bench, out, analysed = root / "bench", root / "out", root / "analysed"
+            out.mkdir(parents=True, exist_ok=True)
+            analysed.mkdir(exist_ok=True)
+            rich.print(f"[yellow]Generating {scale} synthetic tasks in {root}...[/yellow]")
+            generate_benchmark_tree(bench, scale)
+            for module in (harvest, analyse, statistics):
+                module.config.path_to_sv_comp_benchmark_dir = bench
+                module.config.path_to_lisa_instance = STUB_DIR
+                module.config.path_to_output_dir = out
+
+            # tasks.json is needed by the later stages: harvest always runs, timed or not
+            elapsed = __timed(harvest.harvest)
+            if "harvest" in stages:
+                measured["harvest"][str(scale)] = elapsed
+
+            if __within_budget(measured, "analyse", scale, budget):
+                measured["analyse"][str(scale)] = __timed(lambda: analyse.analyse(
+                    benchdir=bench, lisadir=STUB_DIR, outdir=analysed, parallelism=parallelism, plain=True, no_cache=True,
+                ))
+
+            if __within_budget(measured, "statistics", scale, budget):
+                generate_results_tree(out, [task.file_name for task in harvest.get_tasks()], warnings)
+                measured["statistics"][str(scale)] = __timed(lambda: statistics.statistics(bundle=None))
+
+            if __within_budget(measured, "compare", scale, budget):
+                generate_svcomp_pair(root / "first.csv", root / "second.csv", 2 * scale)
+                measured["compare"][str(scale)] = __timed(lambda: compare.compare(
+                    first=str(root / "first.csv"), second=str(root / "second.csv"), output=str(root / "comparison.csv"),
+                ))
+
+            shutil.rmtree(root, ignore_errors=True)
+    finally:
+        if not workdir:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    table = Table(title="Wall time per stage (seconds, ratio to baseline)")
+    table.add_column("Stage")
+    for scale in scales:
+        table.add_column(f"{scale:,} tasks", justify="right")
+    regressed = []
+    for stage, timings in measured.items():
+        cells = []
+        for scale in scales:
+            elapsed = timings.get(str(scale))
+            baseline = reference.get(stage, {}).get(str(scale))
+            if elapsed is None:
+                cells.append("[dim]skipped[/dim]")
+            elif baseline:
+                ratio = elapsed / baseline
+                slower = fail_over is not None and ratio > fail_over
+                if slower:
+                    regressed.append(f"{stage} at {scale} tasks")
+                cells.append(f"{elapsed:.2f} [{'red' if slower else 'green' if ratio <= 1 else 'yellow'}]({ratio:.2f}x)[/]")
+            else:
+                cells.append(f"{elapsed:.2f}")
+        table.add_row(stage, *cells)
+    rich.print(table)
+
+    if save_baseline:
+        for stage, timings in measured.items():
+            reference.setdefault(stage, {}).update(timings)
+        baselines.write_text(json.dumps(reference, indent=4, sort_keys=True) + "\n")
+        rich.print(f"[green]Baselines saved to[/green] [cyan]{baselines}[/cyan]")
+    if regressed:
+        rich.print(f"[bold red]Slower than {fail_over}x the baseline:[/bold red] {', '.join(regressed)}")
+        raise typer.Exit(code=1)
+
+def __timed(stage: Callable[[], None]) -> float:
+    # the commands print their own reports: keep them out of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        start = time.perf_counter()
+        stage()
+        return time.perf_counter() - start
+
+def __within_budget(measured: dict[str, dict[str, float]], stage: str, scale: int, budget: float) -> bool:
+    """
+        Whether the stage is selected and expected to fit the budget at this scale, extrapolating
+        from the two largest scales measured so far (hence catching super-linear stages)
+    """
+    if stage not in measured:
+        return False
+    timings = sorted((int(n), t) for n, t in measured[stage].items())
+    if not timings:
+        return True
+    (n, t), exponent = timings[-1], 1.0
+    if len(timings) > 1 and timings[-2][1] > 0:
+        (m, s) = timings[-2]
+        exponent = max(1.0, math.log(t / s) / math.log(n / m))
+    expected = t * (scale / n) ** exponent
+    if expected > budget:
+        rich.print(f"[dim]Skipping {stage} at {scale} tasks: expected to take about {expected:.0f}s[/dim]")
+        return False
+    return True
+
+if __name__ == "__main__":
+    typer.run(main)
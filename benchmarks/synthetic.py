@@ -0,0 +1,141 @@
+"""
+    Generators of synthetic inputs for the tooling benchmarks: SV-COMP-like benchmark trees,
+    'analyse' results trees and pairs of svcomp.csv tables. Everything is seeded, hence reproducible
+"""
+
+# Standard library imports
+import os
+import json
+import random
+from pathlib import Path
+
+# Warnings in the wording LiSA uses, as matched by cli.models.lisa_report
+ASSERT_WARNINGS = [
+    "[ASSERT] DEFINITE: the assertion holds",
+    "[ASSERT] POSSIBLE: the assertion DOES NOT hold",
+    "[ASSERT] the assertion DOES NOT hold",
+]
+RUNTIME_WARNINGS = [
+    "[RUNTIME] POSSIBLE uncaught runtime exception",
+    "[RUNTIME] DEFINITE uncaught runtime exception",
+]
+OTHER_WARNINGS = [
+    "[DIVISION] possible division by zero",
+    "[NULL] possible null pointer dereference",
+]
+
+VERDICTS = ["TRUE", "FALSE", "UNKNOWN", "UNKNOWN (parsing)", "UNKNOWN (frontend)", "UNKNOWN (analysis)", "TIMEOUT", "OOM"]
+
+# Tasks per category directory, as in the real benchmark (a few hundreds at most)
+TASKS_PER_CATEGORY = 200
+
+def task_name(i: int) -> str:
+    return f"Task{i:06d}"
+
+def generate_benchmark_tree(root: Path, tasks: int, seed: int = 0, inputs: int = 0):
+    """
+        Writes <root>/java/<category>/<task>.yml definitions with their input directories (one Main.java each)
+        and a shared ../common directory, laid out like the SV-COMP Java benchmark.
+        With 'inputs', each definition lists that many more input paths (not written): half of them library
+        directories, half of them files within its own input directory (hence redundant)
+    """
+
+    rnd = random.Random(seed)
+    java = root / "java"
+    (java / "common" / "org" / "sosy_lab" / "sv_benchmarks").mkdir(parents=True, exist_ok=True)
+    (java / "common" / "org" / "sosy_lab" / "sv_benchmarks" / "Verifier.java").write_text("public final class Verifier {}\n")
+    (java / "properties").mkdir(exist_ok=True)
+    for prp in ("valid-assert.prp", "no-runtime-exception.prp"):
+        (java / "properties" / prp).write_text("CHECK( init(main()), LTL(G assert) )\n")
+
+    for i in range(tasks):
+        category = java / f"category{i // TASKS_PER_CATEGORY:04d}"
+        name = task_name(i)
+        (category / name).mkdir(parents=True, exist_ok=True)
+        (category / name / "Main.java").write_text(f"public class Main {{ public static void main(String[] args) {{ assert {i} >= 0; }} }}\n")
+
+        properties = []
+        if rnd.random() < 0.9:
+            properties.append(f"  - property_file: ../properties/valid-assert.prp\n    expected_verdict: {str(rnd.random() < 0.5).lower()}\n")
+        if rnd.random() < 0.9 or not properties:
+            properties.append(f"  - property_file: ../properties/no-runtime-exception.prp\n    expected_verdict: {str(rnd.random() < 0.5).lower()}\n")
+        extra_inputs = "".join(
+            f"  - ../libs/lib{k}/\n" if k % 2 else f"  - {name}/src/File{k}.java\n"
+            for k in range(inputs)
+        )
+        (category / f"{name}.yml").write_text(
+            'format_version: "2.0"\n'
+            "input_files:\n"
+            "  - ../common/\n"
+            f"  - {name}/\n"
+            + extra_inputs
+            + "properties:\n"
+            + "".join(properties)
+            + "options:\n"
+            "  language: Java\n"
+        )
+
+def generate_results_tree(output_dir: Path, task_names: list[str], warnings: int = 5, error_rate: float = 0.05, timeout_rate: float = 0.02, seed: int = 0):
+    """
+        Writes what 'analyse' would leave in output_dir for the given tasks: results/<task>/report.json
+        with about 'warnings' warnings each, error CSVs (parsing, frontend, analysis) for a share of the tasks
+        and timed_out.txt for another share
+    """
+
+    rnd = random.Random(seed)
+    results = output_dir / "results"
+    timed_out = []
+    for name in task_names:
+        kind = rnd.random()
+        if kind < timeout_rate:
+            timed_out.append(name)
+            continue
+
+        directory = results / name
+        os.makedirs(directory, exist_ok=True)
+        if kind < timeout_rate + error_rate:
+            error_file = rnd.choice(["frontend.csv", "frontend-noparsing.csv", "analysis.csv"])
+            messages = [f"error {rnd.randrange(20)}: unsupported construct" for _ in range(rnd.randint(1, 3))]
+            (directory / error_file).write_text("Message;Type\n" + "".join(f"{m};ERROR\n" for m in messages))
+            continue
+
+        count = rnd.randint(0, 2 * warnings)
+        messages = [
+            f"Main.java:{rnd.randrange(1, 500)}:{rnd.randrange(1, 80)}: "
+            + rnd.choice(rnd.choice([ASSERT_WARNINGS, RUNTIME_WARNINGS, OTHER_WARNINGS]))
+            for _ in range(count)
+        ]
+        report = {
+            "warnings": [{"message": m} for m in messages],
+            "info": {"warnings": len(messages)},
+        }
+        (directory / "report.json").write_text(json.dumps(report))
+
+    (output_dir / "timed_out.txt").write_text("".join(f"{name}\n" for name in timed_out))
+
+def generate_svcomp_pair(first: Path, second: Path, test_cases: int, change_rate: float = 0.1, seed: int = 0):
+    """
+        Writes two svcomp.csv tables over the same test cases, the second one differing in a share of the verdicts
+    """
+
+    rnd = random.Random(seed)
+
+    def row(verdict: str, expected: bool) -> int:
+        if verdict == "TRUE":
+            return 2 if expected else -32
+        if verdict == "FALSE":
+            return -16 if expected else 1
+        return 0
+
+    first_rows, second_rows = [], []
+    for i in range(test_cases):
+        expected = rnd.random() < 0.5
+        test_case = f"{task_name(i // 2)}.yml|{'assert' if i % 2 else 'runtime'}|{expected}"
+        verdict = rnd.choice(VERDICTS)
+        changed = rnd.choice(VERDICTS) if rnd.random() < change_rate else verdict
+        first_rows.append(f"{i // 2 + 1},{test_case},{verdict},{row(verdict, expected)}\n")
+        second_rows.append(f"{i // 2 + 1},{test_case},{changed},{row(changed, expected)}\n")
+
+    header = "No.,Test case,Virdict,Score\n"
+    first.write_text(header + "".join(first_rows))
+    second.write_text(header + "".join(second_rows))
@@ -6,8 +6,10 @@ import time
 import shutil
 import os
 import signal
-from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
+import json
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import Lock, Condition
 
 # Load vendored packages
 from vendor.package_loader import load_packages
@@ -16,28 +18,173 @@ load_packages()
 # Third-party imports
 import rich
 import typer
-from typing import Annotated
+from typing import Annotated, Any
 from typing_extensions import Optional
 
 # Project-local imports
 from cli.models.config import Config
-from cli.commands.harvest import fetch_tasks, get_tasks
+from cli.commands.harvest import fetch_tasks, get_tasks, group_by_inputs, dedup_ratio
 from cli.models.task_definition.task_definition import TaskDefinition
+from cli.models.task_outcome import TaskOutcome
+from cli.utils.progress import AnalysisProgress
+from cli.utils.sandbox import SandboxMode, SandboxLimits, Sandbox, ResourceUsage, create_sandbox
+from cli.utils.usage import UsageJournal, USAGE_FILE, read_usage
+from cli.utils.affinity import CpuSlots, plan_cpu_slots, format_cpu_list
+from cli.utils.jvm import cds_archive_path, create_cds_archive, classpath_fingerprint
+from cli.utils.timeouts import TimeoutPolicy, TIMEOUTS_FILE, load_task_history
+from cli.utils.history import DEFAULT_HISTORY_DB
+from cli.utils.cache import ResultCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_SIZE
+from cli.utils.results_store import SqliteStore, DirectoryStore, PACKED_RESULTS_FILE
+from cli.utils.bundle import RUN_FILE
+from cli.utils.util import resource_path
+from cli.utils.profiling import redirect_profile
+from cli.models.jvm_profile import JvmProfile
+from cli.models.lisa_configuration import LisaConfiguration, BUILTIN_LISA_CONFIGURATIONS
+from cli.models.lisa_report.lisa_report import LisaReport
+from cli.utils.util import classify_asserts, classify_runtime
 
 # CLI setup
 cli = typer.Typer()
 config = Config.get()
 
-class WorkerTask:
-    def __init__(self, task: TaskDefinition, start_time: float, timeout: int, max_memory: int, timed_out: list[str], total_tasks: int, task_idx: int, lock: Lock):
-        self.task = task
-        self.start_time = start_time
+# Written to the output directory by matrix runs, lists the LiSA configurations results are grouped by
+MATRIX_FILE = "matrix.json"
+
+# Written to the output directory by portfolio runs, maps each task to the configuration that settled it
+PORTFOLIO_FILE = "portfolio.json"
+
+# Remaining per-task budget (in seconds) below which a portfolio does not escalate to the next configuration
+MIN_STAGE_BUDGET = 1
+
+# Written to the output directory by runs with --repeat, lists the repeated tasks (results of repeat k go to repeats/<k>)
+REPEATS_FILE = "repeats.json"
+
+# With --repeat-suspicious, analyses that took longer than this fraction of the timeout in the previous run are repeated
+SUSPICIOUS_TIME_FRACTION = 0.8
+
+# With --score, threads scoring the results of finished analyses (parsing and classifying reports is light next to LiSA)
+SCORING_WORKERS = 2
+
+# With --batch-size, main class of the multi-job entry point: it runs the jobs listed in a file ('-s <inputs> -o <output>'
+# per line, as for Main) in a single JVM, and appends '<job> <exit status>' to a status file as each job ends
+BATCH_MAIN_CLASS = "it.unive.jlisa.BatchMain"
+
+# With --batch-size, only tasks whose input files add up to at most this many bytes are batched: JVM start-up
+# is worth sharing for small analyses only
+BATCH_INPUT_LIMIT = 256 * 1024
+
+# With --batch-size, directory (in the output directory) of the job and status files of the running batches
+BATCHES_DIR = "batches"
+
+# With --batch-size, how often (in seconds) a batch is checked for finished and hung jobs
+BATCH_POLL_INTERVAL = 0.05
+
+# With --batch-size, how long (in seconds) the JVM is given to exit once it reported every job, before being killed
+BATCH_EXIT_GRACE = 5
+
+# With --early-kill, how often (in seconds) an analysis past the given fraction of its timeout is checked
+EARLY_KILL_POLL = 1
+
+class AnalysisRun:
+    """
+        State shared by all the analyses of a single 'analyse' run
+    """
+
+    def __init__(self, total_tasks: int, timeout: int, max_memory: int, progress: AnalysisProgress, sandbox: Sandbox, usage: UsageJournal, cpu_slots: Optional[CpuSlots] = None, jvm_options: Optional[list[str]] = None, cache: Optional[ResultCache] = None):
+        self.start_time = time.time()
+        self.total_tasks = total_tasks
         self.timeout = timeout
         self.max_memory = max_memory
-        self.timed_out = timed_out
-        self.total_tasks = total_tasks
+        self.progress = progress
+        self.sandbox = sandbox
+        self.usage = usage
+        self.cpu_slots = cpu_slots
+        self.jvm_options = jvm_options or []
+        self.cache = cache
+        self.store: Optional[SqliteStore] = None
+        self.lock = Lock()
+        # killed tasks, per LiSA configuration (None outside of matrix runs)
+        self.timed_out: dict[Optional[str], list[str]] = {}
+        self.oom_killed: dict[Optional[str], list[str]] = {}
+
+        # portfolio runs: configurations from cheapest to most expensive, per-task budget and final outcomes
+        self.portfolio: list[tuple[str, LisaConfiguration]] = []
+        self.task_budget: float = timeout
+        self.portfolio_outcomes: dict[str, dict] = {}
+
+        # runs with --batch-size: main class of the multi-job entry point small tasks are batched through
+        self.batch_main_class = BATCH_MAIN_CLASS
+
+        # runs with an adaptive timeout policy: decides the timeout of each analysis as it starts
+        self.timeouts: Optional[TimeoutPolicy] = None
+
+        # runs with --score: pool scoring the results of each task as soon as they are in place, the scoring function
+        # and the scored tasks by results key
+        self.scoring: Optional[ThreadPoolExecutor] = None
+        self.score_task = None
+        self.scores: dict[str, Any] = {}
+
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.submitted = 0
+        self.pending = 0
+        self.idle = Condition()
+
+    def submit(self, fn, task: 'WorkerTask | list[WorkerTask]'):
+        """
+            Schedules an analysis (or a batch of analyses) on the shared pool. Workers may schedule follow-up analyses
+            themselves (e.g., the next portfolio stage), hence the pool is kept open until 'wait' sees no pending work
+        """
+
+        with self.idle:
+            self.pending += 1
+            for worker_task in task if isinstance(task, list) else [task]:
+                self.submitted += 1
+                worker_task.task_idx = self.submitted
+        self.executor.submit(fn, task).add_done_callback(self.__work_done)
+
+    def wait(self):
+        with self.idle:
+            while self.pending:
+                self.idle.wait()
+
+    def __work_done(self, _: Future):
+        with self.idle:
+            self.pending -= 1
+            if not self.pending:
+                self.idle.notify_all()
+
+class WorkerTask:
+    def __init__(self, task: TaskDefinition, task_idx: int, run: AnalysisRun, configuration_name: Optional[str] = None, configuration: Optional[LisaConfiguration] = None):
+        self.task = task
         self.task_idx = task_idx
-        self.lock = lock
+        self.run = run
+        self.configuration_name = configuration_name
+        self.configuration = configuration
+        # tasks with the same input files as 'task': they are not analysed, its results are copied to them
+        self.followers: list[TaskDefinition] = []
+        # runs with --repeat: which execution of the task this is (1 is the regular one)
+        self.repeat = 1
+        # portfolio runs: index of the configuration being tried and time spent on the previous ones
+        self.stage = 0
+        self.spent = 0.0
+        self.timeout = run.timeout
+        # measurements of the last analysis, recorded in usage.csv once its results are in place
+        self.duration = 0.0
+        self.resources = ResourceUsage()
+
+    @property
+    def results_dir(self) -> str:
+        """
+            Output directory of the task, relative to the output directory
+        """
+
+        return self.results_dir_of(self.task)
+
+    def results_dir_of(self, task: TaskDefinition) -> str:
+        root = "results" if self.repeat == 1 else f"repeats/{self.repeat}"
+        if self.configuration_name:
+            return f"{root}/{self.configuration_name}/{task.file_name}"
+        return f"{root}/{task.file_name}"
 
 @cli.command()
 def analyse(
@@ -66,6 +213,143 @@ def analyse(
             "--parallelism", "-p",
             help="Number of parallel analyses to run"
         )] = 1,
+        plain: Annotated[bool, typer.Option(
+            "--plain",
+            help="Print one log line per task instead of the live progress display (e.g., for CI)"
+        )] = False,
+        metrics_port: Annotated[Optional[int], typer.Option(
+            "--metrics-port",
+            help="Expose progress counters in Prometheus text format over HTTP on this port"
+        )] = None,
+        metrics_host: Annotated[str, typer.Option(
+            "--metrics-host",
+            help="Address the metrics endpoint listens on (e.g. 0.0.0.0 to be scraped from other hosts; it has no authentication)"
+        )] = "127.0.0.1",
+        metrics_file: Annotated[Optional[Path], typer.Option(
+            "--metrics-file",
+            help="Periodically write progress counters in Prometheus text format to this file"
+        )] = None,
+        sandbox: Annotated[SandboxMode, typer.Option(
+            "--sandbox",
+            help="Confine each analysis with hard limits: cgroup v2, setrlimit, or auto (cgroup v2 when writable, setrlimit otherwise)"
+        )] = SandboxMode.NONE,
+        memory_limit: Annotated[Optional[float], typer.Option(
+            "--memory-limit",
+            help="Hard memory limit for each sandboxed analysis in GB, covering heap and native memory (defaults to --max-memory + 2)"
+        )] = None,
+        cpu_limit: Annotated[Optional[float], typer.Option(
+            "--cpu-limit",
+            help="Number of CPU cores each sandboxed analysis may use"
+        )] = None,
+        pids_limit: Annotated[int, typer.Option(
+            "--pids-limit",
+            help="Maximum number of processes/threads in each sandboxed analysis (cgroup v2 only)"
+        )] = 1024,
+        cgroup_parent: Annotated[Optional[Path], typer.Option(
+            "--cgroup-parent",
+            help="Delegated cgroup v2 directory under which the per-analysis cgroups are created (defaults to the current cgroup)"
+        )] = None,
+        pin_cpus: Annotated[bool, typer.Option(
+            "--pin-cpus",
+            help="Bind each worker slot to a fixed set of cores for reproducible timing"
+        )] = False,
+        numa: Annotated[bool, typer.Option(
+            "--numa",
+            help="With --pin-cpus, keep each core set within a single NUMA node and spread slots across nodes"
+        )] = False,
+        cpus_per_task: Annotated[Optional[int], typer.Option(
+            "--cpus-per-task",
+            help="With --pin-cpus, number of cores bound to each worker slot (defaults to all available cores split evenly)"
+        )] = None,
+        jvm_profile: Annotated[Optional[str], typer.Option(
+            "--jvm-profile", "-j",
+            help="JVM profile to launch LiSA with (built-in: default, startup, throughput; more in config.json)"
+        )] = None,
+        cds: Annotated[bool, typer.Option(
+            "--cds",
+            help="Generate (once per LiSA build and JVM profile) an AppCDS archive and share it among all analyses"
+        )] = False,
+        lisa_configs: Annotated[Optional[list[str]], typer.Option(
+            "--lisa-config", "-c",
+            help="LiSA configuration to run (repeatable). With any given, every (task, configuration) pair is analysed and results go to results/<configuration>/<task>"
+        )] = None,
+        portfolio: Annotated[Optional[list[str]], typer.Option(
+            "--portfolio",
+            help="LiSA configurations to try in order, cheapest first (repeatable): the next one runs only on tasks still UNKNOWN"
+        )] = None,
+        task_budget: Annotated[Optional[int], typer.Option(
+            "--task-budget",
+            help="With --portfolio, total time in seconds all the configurations may spend on a single task (defaults to --timeout)"
+        )] = None,
+        cache_dir: Annotated[Path, typer.Option(
+            "--cache-dir",
+            help="Directory of the analysis result cache, keyed by input files, LiSA build and command line"
+        )] = DEFAULT_CACHE_DIR,
+        no_cache: Annotated[bool, typer.Option(
+            "--no-cache",
+            help="Always launch LiSA, neither reusing nor storing cached results"
+        )] = False,
+        cache_size: Annotated[float, typer.Option(
+            "--cache-size",
+            help="Size bound of the analysis result cache in GB: least recently used results are evicted beyond it"
+        )] = DEFAULT_CACHE_SIZE,
+        no_dedup: Annotated[bool, typer.Option(
+            "--no-dedup",
+            help="Analyse every task on its own, even when other tasks share the very same input files"
+        )] = False,
+        pack: Annotated[bool, typer.Option(
+            "--pack",
+            help=f"Pack the outputs of each finished task into a single compressed {PACKED_RESULTS_FILE} instead of keeping one directory per task"
+        )] = False,
+        score: Annotated[bool, typer.Option(
+            "--score",
+            help="Score each task as soon as its analysis ends, alongside the running analyses, and write the statistics (as 'statistics' does) at the end of the run"
+        )] = False,
+        repeat: Annotated[int, typer.Option(
+            "--repeat",
+            help="Analyse the selected tasks this many times, to measure how stable their verdicts and timings are (repeats go to repeats/<k>)",
+            min=1,
+        )] = 1,
+        repeat_only: Annotated[Optional[list[str]], typer.Option(
+            "--repeat-only",
+            help="With --repeat, repeat only the given tasks (repeatable, e.g. Ackermann01.yml)"
+        )] = None,
+        repeat_suspicious: Annotated[bool, typer.Option(
+            "--repeat-suspicious",
+            help=f"With --repeat, repeat only the tasks that, in the previous run, did not complete or took more than {SUSPICIOUS_TIME_FRACTION:.0%} of the timeout"
+        )] = False,
+        batch_size: Annotated[int, typer.Option(
+            "--batch-size",
+            help=f"Analyse up to this many small tasks (input files up to {BATCH_INPUT_LIMIT // 1024} KB) in a single JVM, through the multi-job entry point of LiSA. Each task keeps its own timeout; the tasks of a batch that hangs or crashes are analysed on their own",
+            min=1,
+        )] = 1,
+        batch_main_class: Annotated[str, typer.Option(
+            "--batch-main-class",
+            help="With --batch-size, main class of the multi-job entry point"
+        )] = BATCH_MAIN_CLASS,
+        adaptive_timeout: Annotated[bool, typer.Option(
+            "--adaptive-timeout",
+            help="Give each task a timeout (at most --timeout) from its wall times in past runs, shorter for tasks that only ever timed out"
+        )] = False,
+        timeout_history: Annotated[int, typer.Option(
+            "--timeout-history",
+            help="With --adaptive-timeout, number of most recent runs of the history database to learn from (the previous usage.csv, if it records none)",
+            min=1,
+        )] = 5,
+        history_db: Annotated[Path, typer.Option(
+            "--history-db",
+            help="With --adaptive-timeout, history database of past runs (see 'history ingest')"
+        )] = DEFAULT_HISTORY_DB,
+        run_budget: Annotated[Optional[int], typer.Option(
+            "--run-budget",
+            help="Wall-clock budget of the whole run in seconds, shared among the analyses still to finish: analyses get shorter timeouts as it runs out, and do not run once it is spent"
+        )] = None,
+        early_kill: Annotated[Optional[float], typer.Option(
+            "--early-kill",
+            help="Kill analyses past this fraction of their timeout (e.g. 0.5) while others wait for a worker, unless a past run of the task completed after running as long",
+            min=0.0,
+            max=1.0,
+        )] = None,
 ):
     """
         Sends collected tasks to the LiSA instance for analysis
@@ -83,74 +367,718 @@ def analyse(
         config.path_to_sv_comp_benchmark_dir = benchdir
         config.path_to_lisa_instance = lisadir
         config.path_to_output_dir = outdir
+        redirect_profile(outdir)
         tasks = fetch_tasks(benchdir)
     else:
         tasks = get_tasks()
 
+    if lisa_configs and portfolio:
+        raise typer.BadParameter("--lisa-config and --portfolio cannot be used together.")
+    if repeat > 1 and portfolio:
+        raise typer.BadParameter("--repeat and --portfolio cannot be used together.")
+
+    # everything that can fail is resolved before the previous run is cleared
+    configurations: list[tuple[Optional[str], Optional[LisaConfiguration]]] = [(None, None)]
+    if lisa_configs:
+        configurations = [(name, config.get_lisa_configuration(name)) for name in dict.fromkeys(lisa_configs)]
+    portfolio_configurations = [(name, config.get_lisa_configuration(name)) for name in dict.fromkeys(portfolio or [])]
+
+    profile_name = jvm_profile or config.jvm_profile
+    profile = config.get_jvm_profile(profile_name)
+    jvm_options = profile.to_options()
+    if cds:
+        archive = prepare_cds_archive(profile_name, profile, max_memory)
+        if archive:
+            jvm_options.append(f"-XX:SharedArchiveFile={archive}")
+
+    cpu_slots = None
+    if pin_cpus:
+        cpu_slots = CpuSlots(plan_cpu_slots(parallelism, numa, cpus_per_task))
+        if len(set(map(tuple, cpu_slots.slots))) < len(cpu_slots.slots):
+            rich.print("[bold yellow]Not enough cores for disjoint core sets: some worker slots share cores.[/bold yellow]")
+        for i, cpus in enumerate(cpu_slots.slots):
+            rich.print(f"Worker slot {i} pinned to cores [bold]{format_cpu_list(cpus)}[/bold]")
+
+    repeated_tasks: set[str] = set()
+    if repeat > 1:
+        repeated_tasks = __select_repeated_tasks(tasks, repeat_only, repeat_suspicious, timeout)
+
+    groups = [[task] for task in tasks] if no_dedup else group_by_inputs(tasks)
+    if len(groups) < len(tasks):
+        rich.print(f"{len(tasks)} tasks share [bold]{len(groups)}[/bold] distinct input sets: LiSA runs once per input set (dedup ratio {dedup_ratio(tasks, groups):.2f})")
+
+    repeated_groups = [group for group in groups if any(t.file_name in repeated_tasks for t in group)]
+    if repeat > 1:
+        rich.print(f"Repeating [bold]{len(repeated_groups)}[/bold] analyses {repeat} times each")
+
+    total_tasks = (len(groups) + len(repeated_groups) * (repeat - 1)) * len(configurations)
+    progress = AnalysisProgress(total_tasks, parallelism, plain, metrics_file)
+    if metrics_port:
+        try:
+            progress.serve_metrics(metrics_port, metrics_host)
+        except OSError as e:
+            rich.print(f"[bold red]Cannot serve the metrics on {metrics_host}:{metrics_port}:[/bold red] {e}")
+            raise typer.Exit(code=1)
+
+    limits = SandboxLimits(
+        memory_bytes=int((memory_limit or max_memory + 2) * 1024 ** 3),
+        cpu_cores=cpu_limit,
+        pids=pids_limit,
+        timeout=timeout,
+    )
+    try:
+        task_sandbox = create_sandbox(sandbox, limits, cgroup_parent)
+    except OSError as e:
+        rich.print(f"[bold red]Cannot set up the cgroup v2 sandbox:[/bold red] {e}")
+        raise typer.Exit(code=1)
+    if sandbox != SandboxMode.NONE:
+        rich.print(f"Sandboxing each analysis with [bold]{type(task_sandbox).__name__}[/bold]")
+
     workdir = f"{str(config.path_to_output_dir)}/results"
     if os.path.exists(workdir):
         shutil.rmtree(workdir, ignore_errors=True)
-    
-    start_time = time.time()
-    timed_out = []
-    total_tasks = len(tasks)
-    lock = Lock()
-    
-    with ThreadPoolExecutor(max_workers=parallelism) as executor:
-        i = 1
-        for task in tasks:
-            tsk = WorkerTask(task, start_time, timeout, max_memory, timed_out, total_tasks, i, lock)
-            i += 1
-            executor.submit(__perform_analysis, tsk)
-    
-    if timed_out:
-        rich.print("[red]The following tasks timed out:[/red]")
-        with open(f"{str(config.path_to_output_dir)}/timed_out.txt", 'w') as f:
-            for t in timed_out:
+    shutil.rmtree(config.path_to_output_dir / "repeats", ignore_errors=True)
+    shutil.rmtree(config.path_to_output_dir / BATCHES_DIR, ignore_errors=True)
+
+    for stale in ("timed_out.txt", "oom_killed.txt", MATRIX_FILE, PORTFOLIO_FILE, REPEATS_FILE, RUN_FILE, TIMEOUTS_FILE, PACKED_RESULTS_FILE, f"{PACKED_RESULTS_FILE}-wal", f"{PACKED_RESULTS_FILE}-shm"):
+        if os.path.exists(f"{str(config.path_to_output_dir)}/{stale}"):
+            os.remove(f"{str(config.path_to_output_dir)}/{stale}")
+
+    # the files of the run are written before any analysis creates the output directory
+    os.makedirs(config.path_to_output_dir, exist_ok=True)
+    if lisa_configs:
+        (config.path_to_output_dir / MATRIX_FILE).write_text(json.dumps({"configurations": [name for name, _ in configurations]}, indent=4))
+
+    lisa_sha256 = classpath_fingerprint(config.path_to_lisa_instance, content=True)
+    cache = None
+    if not no_cache:
+        cache = ResultCache(cache_dir, int(cache_size * 1024 ** 3), lisa_sha256)
+
+    # read before the journal of this run replaces it
+    history = {}
+    if adaptive_timeout or early_kill is not None:
+        history = load_task_history(history_db, [name for name, _ in configurations] + list(portfolio or []), timeout_history, read_usage(config.path_to_output_dir / USAGE_FILE))
+        if adaptive_timeout:
+            rich.print(f"Adaptive timeouts from the past timings of [bold]{len({task for _, task in history})}[/bold] tasks")
+    usage = UsageJournal(config.path_to_output_dir / USAGE_FILE)
+    run = AnalysisRun(total_tasks, timeout, max_memory, progress, task_sandbox, usage, cpu_slots, jvm_options, cache)
+    if portfolio:
+        run.portfolio = portfolio_configurations
+        run.task_budget = task_budget or timeout
+        configurations = run.portfolio[:1]
+    run.batch_main_class = batch_main_class
+    if adaptive_timeout or run_budget is not None or early_kill is not None:
+        run.timeouts = TimeoutPolicy(timeout, history, config.path_to_output_dir / TIMEOUTS_FILE, progress, adaptive_timeout, run_budget, early_kill)
+    if pack:
+        run.store = SqliteStore(config.path_to_output_dir / PACKED_RESULTS_FILE)
+    if score:
+        # imported here, as 'statistics' depends on this module
+        from cli.commands.statistics import score_task, compute_statistics
+        run.scoring = ThreadPoolExecutor(max_workers=SCORING_WORKERS)
+        run.score_task = score_task
+
+    with progress, ThreadPoolExecutor(max_workers=parallelism) as executor:
+        run.executor = executor
+        # repeats are scheduled in rounds after the regular analyses: first results come as early as usual,
+        # and the executions of a task never run side by side (which would correlate their timings)
+        for k, round_groups in [(1, groups)] + [(k, repeated_groups) for k in range(2, repeat + 1)]:
+            worker_tasks = []
+            for leader, *followers in round_groups:
+                for name, configuration in configurations:
+                    worker_task = WorkerTask(leader, 0, run, name, configuration)
+                    worker_task.followers = followers
+                    worker_task.repeat = k
+                    worker_tasks.append(worker_task)
+            if batch_size == 1:
+                for worker_task in worker_tasks:
+                    run.submit(__perform_analysis, worker_task)
+                continue
+            for batch in __plan_batches(worker_tasks, batch_size):
+                if len(batch) == 1:
+                    run.submit(__perform_analysis, batch[0])
+                else:
+                    run.submit(__perform_batch, batch)
+        run.wait()
+    shutil.rmtree(config.path_to_output_dir / BATCHES_DIR, ignore_errors=True)
+    if run.scoring:
+        run.scoring.shutdown(wait=True)
+
+    task_sandbox.close()
+    usage.close()
+    if run.store:
+        run.store.close()
+        rich.print(f"Results packed into [cyan]{config.path_to_output_dir / PACKED_RESULTS_FILE}[/cyan]")
+    if cache:
+        rich.print(cache.summary())
+    if run.timeouts:
+        run.timeouts.close()
+        rich.print(f"{run.timeouts.summary()} (decisions logged to [cyan]{config.path_to_output_dir / TIMEOUTS_FILE}[/cyan])")
+
+    if repeat > 1:
+        (config.path_to_output_dir / REPEATS_FILE).write_text(json.dumps({
+            "repeat": repeat,
+            "tasks": sorted(t.file_name for group in repeated_groups for t in group),
+        }, indent=4))
+
+    if portfolio:
+        (config.path_to_output_dir / PORTFOLIO_FILE).write_text(json.dumps({
+            "configurations": [name for name, _ in run.portfolio],
+            "tasks": run.portfolio_outcomes,
+        }, indent=4))
+        settled = {}
+        for outcome in run.portfolio_outcomes.values():
+            settled[outcome["configuration"]] = settled.get(outcome["configuration"], 0) + 1
+        rich.print("Tasks settled per configuration: " + ", ".join(f"[bold]{name}[/bold] {count}" for name, count in settled.items()))
+
+    for name, tasks_timed_out in run.timed_out.items():
+        rich.print(f"[red]The following tasks timed out{f' with configuration {name}' if name else ''}:[/red]")
+        with open(f"{__killed_tasks_dir(name)}/timed_out.txt", 'w') as f:
+            for t in tasks_timed_out:
                 rich.print(f"[red]- {t}[/red]")
                 f.write(f"{t}\n")
 
+    for name, tasks_oom_killed in run.oom_killed.items():
+        rich.print(f"[red]The following tasks were killed for exceeding the memory limit{f' with configuration {name}' if name else ''}:[/red]")
+        with open(f"{__killed_tasks_dir(name)}/oom_killed.txt", 'w') as f:
+            for t in tasks_oom_killed:
+                rich.print(f"[red]- {t}[/red]")
+                f.write(f"{t}\n")
+
+    # written last: 'statistics --watch' takes it as the sign that the run is over
+    (config.path_to_output_dir / RUN_FILE).write_text(json.dumps({
+        "arguments": sys.argv[1:],
+        "lisa_commands": {
+            name or "default": get_lisa_cmd(config, "<input>", "results/<task>", max_memory, jvm_options, configuration)
+            for name, configuration in (run.portfolio or configurations)
+        },
+        "lisa_instance": str(config.path_to_lisa_instance),
+        "lisa_sha256": lisa_sha256,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(run.start_time)),
+        "finished": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "tasks": len(tasks),
+        "timeout": timeout,
+        "max_memory": max_memory,
+        "parallelism": parallelism,
+        "batch_size": batch_size,
+    }, indent=4))
+
+    if run.scoring:
+        rich.print(f"\nScored [bold]{len(run.scores)}[/bold] task results while analysing")
+        compute_statistics(run.scores)
+
+def __select_repeated_tasks(tasks: list[TaskDefinition], only: Optional[list[str]], suspicious: bool, timeout: int) -> set[str]:
+    """
+        Tasks to analyse more than once: the given ones, the suspicious ones according to the previous run's usage.csv, or all
+    """
+    selected = {t.file_name for t in tasks}
+    if only:
+        selected &= set(only)
+    if suspicious:
+        previous = read_usage(config.path_to_output_dir / USAGE_FILE)
+        if not previous:
+            rich.print("[bold yellow]No usage.csv from a previous run: --repeat-suspicious repeats every task.[/bold yellow]")
+        else:
+            selected &= {
+                row["Test case"] for row in previous
+                if row["Outcome"] not in (TaskOutcome.DONE.value, TaskOutcome.CACHED.value)
+                or float(row["Wall time"]) > SUSPICIOUS_TIME_FRACTION * timeout
+            }
+    return selected
+
+def __killed_tasks_dir(configuration_name: Optional[str]) -> str:
+    """
+        Directory holding timed_out.txt/oom_killed.txt: the output directory, or the configuration's results in matrix runs
+    """
+    if configuration_name is None:
+        return str(config.path_to_output_dir)
+    path = f"{str(config.path_to_output_dir)}/results/{configuration_name}"
+    os.makedirs(path, exist_ok=True)
+    return path
+
 def __perform_analysis(task: WorkerTask):
-    command = get_lisa_cmd(config, task.task.input_file, f"results/{task.task.file_name}", task.max_memory)
+    run = task.run
+    if run.cpu_slots is None:
+        outcome = __run_analysis(task, None)
+    else:
+        slot = run.cpu_slots.acquire()
+        try:
+            outcome = __run_analysis(task, run.cpu_slots.cpus(slot))
+        finally:
+            run.cpu_slots.release(slot)
+    __complete_analysis(task, outcome)
+
+def __complete_analysis(task: WorkerTask, outcome: TaskOutcome):
+    """
+        Puts the results of an analysis in place (for its followers too), records it and schedules what comes next
+    """
+    run = task.run
+    if task.followers:
+        __fan_out(task, outcome)
+    packed = [task.results_dir_of(t) for t in [task.task, *task.followers]] if run.store and task.repeat == 1 else []
+    for results_dir in packed:
+        run.store.pack(results_dir.removeprefix("results/"), config.path_to_output_dir / results_dir, remove=False)
+    # usage.csv is followed by 'statistics --watch': a task is recorded once its results (and those of its followers)
+    # are final, and before any later portfolio stage is scheduled
+    run.usage.record(task.task.file_name, outcome, task.duration, task.resources, task.configuration_name, task.repeat)
+    if run.scoring and task.repeat == 1 and outcome not in (TaskOutcome.TIMEOUT, TaskOutcome.OOM):
+        run.scoring.submit(__score_results, task)
+    if run.portfolio:
+        __advance_portfolio(task, outcome)
+    for results_dir in packed:
+        shutil.rmtree(config.path_to_output_dir / results_dir, ignore_errors=True)
 
-    rich.print(f"Running command {task.task_idx}/{task.total_tasks}: [bold blue]{command}[/bold blue]")
-    proc = subprocess.Popen(command, shell=True, preexec_fn=os.setsid)
+def __perform_batch(batch: list[WorkerTask]):
+    run = batch[0].run
+    if run.cpu_slots is None:
+        outcomes, retried = __run_batch(batch, None)
+    else:
+        slot = run.cpu_slots.acquire()
+        try:
+            outcomes, retried = __run_batch(batch, run.cpu_slots.cpus(slot))
+        finally:
+            run.cpu_slots.release(slot)
+
+    for task, outcome in outcomes.items():
+        __complete_analysis(task, outcome)
+    for task in retried:
+        run.submit(__perform_analysis, task)
+
+def __plan_batches(tasks: list[WorkerTask], batch_size: int) -> list[list[WorkerTask]]:
+    """
+        Groups the analyses of small tasks by 'batch_size', tasks of similar input size (and the same LiSA configuration)
+        together; the other analyses are left on their own, and come first as they are likely the longest
+    """
+    small: dict[Optional[str], list[WorkerTask]] = {}
+    batches = []
+    for task in tasks:
+        if __input_size(task.task) <= BATCH_INPUT_LIMIT:
+            small.setdefault(task.configuration_name, []).append(task)
+        else:
+            batches.append([task])
+    for same_configuration in small.values():
+        same_configuration.sort(key=lambda t: __input_size(t.task))
+        batches += [same_configuration[i:i + batch_size] for i in range(0, len(same_configuration), batch_size)]
+    return batches
+
+def __input_size(task: TaskDefinition) -> int:
+    """
+        Estimate of the cost of analysing a task: the size in bytes of its input files
+    """
+    return sum(__path_size(path) for path in task.input_files)
+
+@lru_cache(maxsize=None)
+def __path_size(path: str) -> int:
+    # input directories are often shared by many tasks (e.g. common)
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    size = 0
+    for directory, _, files in os.walk(path):
+        for file in files:
+            try:
+                size += os.path.getsize(os.path.join(directory, file))
+            except OSError:
+                pass
+    return size
+
+def __score_results(task: WorkerTask):
+    """
+        Scores the results of an analysis (and of its followers) while other analyses are still running
+    """
+    run = task.run
+    store = run.store or DirectoryStore(config.path_to_output_dir / "results")
+    for scored in [task.task, *task.followers]:
+        results_key = task.results_dir_of(scored).removeprefix("results/")
+        try:
+            result = run.score_task(store, results_key, scored.file_name)
+        except Exception as e:
+            # left to the final scoring, which reports the error as 'statistics' would
+            run.progress.log(f"[yellow]Could not score {scored.file_name} while analysing: {e}[/yellow]", verbose=True)
+            continue
+        if result is not None:
+            with run.lock:
+                run.scores[results_key] = result
+
+def __fan_out(task: WorkerTask, outcome: TaskOutcome):
+    """
+        Hands the results of an analysis over to the tasks sharing its input files (hard links where possible)
+    """
+    run = task.run
+    source = config.path_to_output_dir / task.results_dir
+    for follower in task.followers:
+        if source.is_dir():
+            destination = config.path_to_output_dir / task.results_dir_of(follower)
+            shutil.rmtree(destination, ignore_errors=True)
+            shutil.copytree(source, destination, copy_function=__link_or_copy)
+        if task.repeat > 1:
+            continue
+        with run.lock:
+            if outcome == TaskOutcome.TIMEOUT:
+                run.timed_out.setdefault(task.configuration_name, []).append(str(follower.file_name))
+            elif outcome == TaskOutcome.OOM:
+                run.oom_killed.setdefault(task.configuration_name, []).append(str(follower.file_name))
+
+def __link_or_copy(source: str, destination: str):
     try:
-        proc.wait(timeout=task.timeout)
-        if proc.returncode != 0:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
+def __advance_portfolio(task: WorkerTask, outcome: TaskOutcome):
+    """
+        Settles the task if the last configuration produced a verdict for every expected property; otherwise,
+        schedules the next (more expensive) configuration with what is left of the per-task budget
+    """
+    run = task.run
+    remaining = run.task_budget - task.spent
+    next_stage = task.stage + 1
+
+    if __is_settled(task, outcome) or next_stage >= len(run.portfolio) or remaining < MIN_STAGE_BUDGET:
+        with run.lock:
+            for settled in [task.task, *task.followers]:
+                run.portfolio_outcomes[settled.file_name] = {
+                    "configuration": task.configuration_name,
+                    "outcome": outcome.value,
+                    "time": round(task.spent, 3),
+                }
+        return
+
+    name, configuration = run.portfolio[next_stage]
+    run.progress.log(f"{task.task.file_name} still UNKNOWN with {task.configuration_name}, escalating to [bold]{name}[/bold] ({remaining:.0f}s left)", verbose=True)
+    follow_up = WorkerTask(task.task, 0, run, name, configuration)
+    follow_up.followers = task.followers
+    follow_up.stage = next_stage
+    follow_up.spent = task.spent
+    follow_up.timeout = min(run.timeout, remaining)
+    run.progress.extend(1)
+    run.submit(__perform_analysis, follow_up)
+
+def __is_settled(task: WorkerTask, outcome: TaskOutcome) -> bool:
+    """
+        Whether the analysis produced a definitive verdict for every expected property of the task (and of its followers).
+        Frontend failures are settled as well: no other configuration can overcome them
+    """
+    if outcome not in (TaskOutcome.DONE, TaskOutcome.CACHED):
+        return False
+
+    results_dir = config.path_to_output_dir / task.results_dir
+    if (results_dir / "frontend.csv").exists() or (results_dir / "frontend-noparsing.csv").exists():
+        return True
+    if not (results_dir / "report.json").exists():
+        return False
+
+    with open(results_dir / "report.json", encoding="utf-8") as f:
+        lisa_report = LisaReport(**json.load(f))
+    # tasks sharing the input files may expect verdicts on different properties
+    group = [task.task, *task.followers]
+    if any(t.are_assertions_expected() is not None for t in group) and classify_asserts(lisa_report).value[1] == "UNKNOWN":
+        return False
+    if any(t.are_runtime_exceptions_expected() is not None for t in group) and classify_runtime(lisa_report).value[1] == "UNKNOWN":
+        return False
+    return True
+
+def __run_analysis(task: WorkerTask, cpus: Optional[list[int]]) -> TaskOutcome:
+    run = task.run
+    jvm_options = run.jvm_options + ([f"-XX:ActiveProcessorCount={len(cpus)}"] if cpus else [])
+    command = get_lisa_cmd(config, task.task.input_file, task.results_dir, run.max_memory, jvm_options, task.configuration)
+
+    results_dir = config.path_to_output_dir / task.results_dir
+
+    run.progress.task_started()
+    task_start = time.time()
+    outcome = TaskOutcome.FAILED
+    usage = ResourceUsage()
+    cache_key = None
+
+    try:
+        # repeats are meant to run LiSA again
+        if run.cache and task.repeat == 1:
+            cache_key = run.cache.key(str(task.task.input_file), command, str(results_dir))
+            if run.cache.restore(cache_key, results_dir):
+                outcome = TaskOutcome.CACHED
+                run.progress.log(f"[green]Command {task.task_idx} ({task.task.file_name}) restored from cache.[/green]", verbose=True)
+                return outcome
+
+        if run.timeouts:
+            task.timeout = run.timeouts.assign(task.task.file_name, task.configuration_name, task.timeout)
+            if task.timeout <= 0:
+                outcome = TaskOutcome.TIMEOUT
+                if task.repeat == 1:
+                    with run.lock:
+                        run.timed_out.setdefault(task.configuration_name, []).append(str(task.task.file_name))
+                run.progress.log(f"[yellow]Command {task.task_idx} ({task.task.file_name}) not run: the run budget is spent.[/yellow]")
+                return outcome
+
+        run.progress.log(f"Running command {task.task_idx}/{run.progress.total_tasks}: [bold blue]{command}[/bold blue]", verbose=True)
+        slot = run.sandbox.enter(f"task-{task.task_idx}")
+
+        def preexec():
+            os.setsid()
+            slot.preexec()
+            if cpus:
+                os.sched_setaffinity(0, cpus)
+
+        proc = subprocess.Popen(command, shell=True, preexec_fn=preexec)
+        try:
+            __wait_for_analysis(proc, task)
+        except subprocess.TimeoutExpired:
+            outcome = TaskOutcome.TIMEOUT
+            run.progress.log(f"[yellow]Command {task.task_idx} timed out, waiting for termination...[/yellow]", verbose=True)
+            os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+            slot.kill()
+            proc.wait()
+        usage = slot.release()
+
+        elapsed = time.time() - run.start_time
+        elapsed_hms = time.strftime('%H:%M:%S', time.gmtime(elapsed))
+        # killed repeats are accounted for by the stability statistics, not as killed tasks
+        if usage.oom_killed:
+            outcome = TaskOutcome.OOM
+            with run.lock:
+                if task.repeat == 1:
+                    run.oom_killed.setdefault(task.configuration_name, []).append(str(task.task.file_name))
+            run.progress.log(f"[red]Command {task.task_idx} ({task.task.file_name}) killed for exceeding the memory limit. Elapsed time: {elapsed_hms}[/red]")
+        elif outcome == TaskOutcome.TIMEOUT:
+            with run.lock:
+                if task.repeat == 1:
+                    run.timed_out.setdefault(task.configuration_name, []).append(str(task.task.file_name))
+            run.progress.log(f"[yellow]Command {task.task_idx} ({task.task.file_name}) terminated. Elapsed time: {elapsed_hms}[/yellow]")
+        elif proc.returncode != 0:
             raise subprocess.CalledProcessError(proc.returncode, command)
-        elapsed = time.time() - task.start_time
+        else:
+            outcome = TaskOutcome.DONE
+            run.progress.log(f"[green]Command {task.task_idx} successful. Elapsed time: {elapsed_hms}[/green]", verbose=True)
+            if cache_key:
+                __store_in_cache(task, cache_key, results_dir)
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}", file=sys.stderr)
+        elapsed = time.time() - run.start_time
         elapsed_hms = time.strftime('%H:%M:%S', time.gmtime(elapsed))
-        rich.print(f"[green]Command {task.task_idx} successful. Elapsed time: {elapsed_hms}[/green]")
+        run.progress.log(f"[red]Command {task.task_idx} ({task.task.file_name}) failed. Elapsed time: {elapsed_hms}[/red]")
+    finally:
+        task.duration = time.time() - task_start
+        task.resources = usage
+        task.spent += task.duration
+        run.progress.task_finished(outcome, task.duration)
+
+    return outcome
+
+def __run_batch(batch: list[WorkerTask], cpus: Optional[list[int]]) -> tuple[dict[WorkerTask, TaskOutcome], list[WorkerTask]]:
+    """
+        Runs the analyses of a batch in a single JVM through the multi-job entry point, and returns the outcomes of those
+        that ended and the tasks left to analyse on their own. Jobs run one after the other, each watched with the timeout
+        of its task from the end of the previous one (the first job pays for the JVM start-up). A job running past it
+        times out, as it would on its own: the JVM is killed and the jobs after it are left. When the JVM dies otherwise
+        (crash, memory limit), the job it was running is left as well, as the batch may be to blame
+    """
+    run = batch[0].run
+    jvm_options = run.jvm_options + ([f"-XX:ActiveProcessorCount={len(cpus)}"] if cpus else [])
+    outcomes: dict[WorkerTask, TaskOutcome] = {}
+    jobs: list[WorkerTask] = []
+    cache_keys: dict[WorkerTask, str] = {}
+    for task in batch:
+        results_dir = config.path_to_output_dir / task.results_dir
+        # cached under the command the task would run with on its own: results do not depend on batching
+        if run.cache and task.repeat == 1:
+            cache_keys[task] = run.cache.key(str(task.task.input_file), get_lisa_cmd(config, task.task.input_file, task.results_dir, run.max_memory, jvm_options, task.configuration), str(results_dir))
+            if run.cache.restore(cache_keys[task], results_dir):
+                run.progress.task_started()
+                run.progress.log(f"[green]Command {task.task_idx} ({task.task.file_name}) restored from cache.[/green]", verbose=True)
+                outcomes[task] = TaskOutcome.CACHED
+                task.duration, task.resources = 0.0, ResourceUsage()
+                run.progress.task_finished(TaskOutcome.CACHED, 0.0)
+                continue
+        jobs.append(task)
+    if not jobs:
+        return outcomes, []
+
+    batch_name = f"batch-{jobs[0].task_idx}"
+    batch_dir = config.path_to_output_dir / BATCHES_DIR
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    jobs_file, status_file = batch_dir / f"{batch_name}.jobs", batch_dir / f"{batch_name}.status"
+    jobs_file.write_text("".join(f"-s {task.task.input_file.strip()} -o {config.path_to_output_dir}/{task.results_dir}\n" for task in jobs))
+    status_file.write_text("")
+    command = get_lisa_batch_cmd(config, str(jobs_file), str(status_file), run.max_memory, jvm_options, jobs[0].configuration, run.batch_main_class)
+
+    def job_started(task: WorkerTask):
+        run.progress.task_started()
+        if run.timeouts:
+            task.timeout = run.timeouts.assign(task.task.file_name, task.configuration_name, task.timeout)
+
+    def job_finished(task: WorkerTask, outcome: TaskOutcome, duration: float):
+        outcomes[task] = outcome
+        task.duration = duration
+        task.resources = ResourceUsage()
+        task.spent += duration
+        run.progress.task_finished(outcome, duration)
+
+    run.progress.log(f"Running batch of commands {jobs[0].task_idx}-{jobs[-1].task_idx} ({len(jobs)} tasks): [bold blue]{command}[/bold blue]", verbose=True)
+    slot = run.sandbox.enter(batch_name)
+
+    def preexec():
+        os.setsid()
+        slot.preexec()
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+
+    proc = subprocess.Popen(command, shell=True, preexec_fn=preexec)
+    hung = False
+    reported, offset = 0, 0
+    job_start = time.time()
+    job_started(jobs[0])
+    try:
+        with open(status_file, "rb") as status:
+            while reported < len(jobs):
+                try:
+                    proc.wait(timeout=BATCH_POLL_INTERVAL)
+                    exited = True
+                except subprocess.TimeoutExpired:
+                    exited = False
+                # only whole lines: the entry point may be halfway through writing one
+                status.seek(offset)
+                lines = status.read()
+                lines = lines[:lines.rfind(b"\n") + 1]
+                offset += len(lines)
+                # jobs end when their line is written, not when it is read
+                now = os.fstat(status.fileno()).st_mtime if lines else time.time()
+                for line in lines.decode().splitlines():
+                    job, exit_status = map(int, line.split())
+                    task = jobs[job]
+                    if exit_status == 0:
+                        run.progress.log(f"[green]Command {task.task_idx} successful (batched).[/green]", verbose=True)
+                        if task in cache_keys:
+                            __store_in_cache(task, cache_keys[task], config.path_to_output_dir / task.results_dir)
+                        job_finished(task, TaskOutcome.DONE, now - job_start)
+                    else:
+                        run.progress.log(f"[red]Command {task.task_idx} ({task.task.file_name}) failed (batched).[/red]")
+                        job_finished(task, TaskOutcome.FAILED, now - job_start)
+                    reported += 1
+                    job_start = now
+                    if reported < len(jobs):
+                        job_started(jobs[reported])
+                if exited or reported == len(jobs):
+                    break
+                task, elapsed = jobs[reported], time.time() - job_start
+                if elapsed > task.timeout or (run.timeouts and run.timeouts.should_kill(task.task.file_name, task.configuration_name, elapsed, task.timeout)):
+                    hung = True
+                    os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+                    slot.kill()
+                    proc.wait()
+                    break
+    except Exception as e:
+        # e.g. a malformed status line: the batch is given up on as if it had crashed
+        print(f"An unexpected error occurred: {e}", file=sys.stderr)
+        os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+        slot.kill()
+        proc.wait()
+    # the JVM may still be shutting down after reporting its last job: its slot is not released before it is gone
+    try:
+        proc.wait(timeout=BATCH_EXIT_GRACE)
     except subprocess.TimeoutExpired:
-        rich.print(f"[yellow]Command {task.task_idx} timed out, waiting for termination...[/yellow]")
         os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+        slot.kill()
         proc.wait()
-        with task.lock:
-            task.timed_out.append(str(task.task.file_name))
-        elapsed = time.time() - task.start_time
-        elapsed_hms = time.strftime('%H:%M:%S', time.gmtime(elapsed))
-        rich.print(f"[yellow]Command {task.task_idx} terminated. Elapsed time: {elapsed_hms}[/yellow]")
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}", file=sys.stderr)
-        elapsed = time.time() - task.start_time
-        elapsed_hms = time.strftime('%H:%M:%S', time.gmtime(elapsed))
-        rich.print(f"[red]Command {task.task_idx} failed. Elapsed time: {elapsed_hms}[/red]")
+    usage = slot.release()
+    jobs_file.unlink(missing_ok=True)
+    status_file.unlink(missing_ok=True)
 
-def get_lisa_cmd(config: Config, input_file: str, file_name: str, max_memory: int) -> str:
+    left = jobs[reported:]
+    if hung and not usage.oom_killed:
+        task, left = left[0], left[1:]
+        if task.repeat == 1:
+            with run.lock:
+                run.timed_out.setdefault(task.configuration_name, []).append(str(task.task.file_name))
+        run.progress.log(f"[yellow]Command {task.task_idx} ({task.task.file_name}) terminated (batched), {len(left)} tasks of its batch left to analyse on their own.[/yellow]")
+        job_finished(task, TaskOutcome.TIMEOUT, time.time() - job_start)
+    elif left:
+        # the job that was running starts again from scratch, on its own
+        run.progress.task_requeued()
+        run.progress.log(f"[yellow]Batch of commands {jobs[0].task_idx}-{jobs[-1].task_idx} died after {reported} of {len(jobs)} tasks, analysing the others on their own.[/yellow]")
+    for task in left:
+        shutil.rmtree(config.path_to_output_dir / task.results_dir, ignore_errors=True)
+    return outcomes, left
+
+def __store_in_cache(task: WorkerTask, cache_key: str, results_dir: Path):
+    """
+        Caches the results of a successful analysis: failing to do so (e.g. a full disk) does not make the analysis fail
+    """
+    try:
+        task.run.cache.store(cache_key, results_dir)
+    except OSError as e:
+        task.run.progress.log(f"[yellow]Could not cache the results of {task.task.file_name}: {e}[/yellow]")
+
+def __wait_for_analysis(proc: subprocess.Popen, task: WorkerTask):
+    """
+        Waits for the analysis to end within its timeout, raises subprocess.TimeoutExpired otherwise. With --early-kill,
+        the timeout policy is asked every EARLY_KILL_POLL seconds, past the given fraction of the timeout, whether to give up
+    """
+    policy = task.run.timeouts
+    if policy is None or policy.early_kill is None:
+        proc.wait(timeout=task.timeout)
+        return
+
+    start = time.time()
+    check = policy.early_kill * task.timeout
+    while True:
+        elapsed = time.time() - start
+        if elapsed >= task.timeout or (elapsed >= check and policy.should_kill(task.task.file_name, task.configuration_name, elapsed, task.timeout)):
+            raise subprocess.TimeoutExpired(proc.args, task.timeout)
+        try:
+            proc.wait(timeout=min(max(check - elapsed, EARLY_KILL_POLL), task.timeout - elapsed))
+            return
+        except subprocess.TimeoutExpired:
+            pass
+
+def prepare_cds_archive(profile_name: str, profile: JvmProfile, max_memory: int) -> Optional[Path]:
+    """
+        Returns the AppCDS archive for the configured LiSA instance and the given JVM profile,
+        generating it with a training analysis of the bundled test programs if it does not exist yet
+    """
+
+    if profile.share == "off":
+        rich.print(f"[bold yellow]JVM profile '{profile_name}' disables class data sharing, ignoring --cds.[/bold yellow]")
+        return None
+
+    archive = cds_archive_path(config.path_to_output_dir / "cds", config.path_to_lisa_instance, profile_name, profile.to_options() + [f"-Xmx{max_memory}G"])
+    if archive.exists():
+        rich.print(f"Reusing AppCDS archive [cyan]{archive}[/cyan]")
+        return archive
+
+    training_inputs = " ".join(str(p) for p in (resource_path("test/01/Main.java"), resource_path("test/02/Main.java")) if p.exists())
+    options = profile.to_options() + [f"-XX:ArchiveClassesAtExit={archive}"]
+    if training_inputs:
+        command = get_lisa_cmd(config, training_inputs, "cds/training", max_memory, options)
+    else:
+        command = f"java {' '.join(options)} -Xmx{max_memory}G -cp {config.path_to_lisa_instance} it.unive.jlisa.Main -v"
+
+    rich.print(f"[yellow]Generating AppCDS archive for JVM profile '{profile_name}'...[/yellow]")
+    if not create_cds_archive(command, archive):
+        rich.print("[bold yellow]AppCDS archive could not be generated, running without it.[/bold yellow]")
+        return None
+    rich.print(f"[green]AppCDS archive saved to[/green] [cyan]{archive}[/cyan]")
+    return archive
+
+def get_lisa_cmd(config: Config, input_file: str, file_name: str, max_memory: int, jvm_options: Optional[list[str]] = None, lisa_configuration: Optional[LisaConfiguration] = None) -> str:
     """
         Get the command to run LiSA from the configuration file
     """
     out = str(config.path_to_output_dir) if not file_name else f"{str(config.path_to_output_dir)}/{file_name}"
+    return __java_cmd(config, "it.unive.jlisa.Main", f"-s {input_file} -o {out}", max_memory, jvm_options, lisa_configuration)
+
+def get_lisa_batch_cmd(config: Config, jobs_file: str, status_file: str, max_memory: int, jvm_options: Optional[list[str]] = None, lisa_configuration: Optional[LisaConfiguration] = None, main_class: str = BATCH_MAIN_CLASS) -> str:
+    """
+        Get the command to run the jobs listed in a file in a single JVM, through the multi-job entry point of LiSA
+    """
+    return __java_cmd(config, main_class, f"--jobs {jobs_file} --status {status_file}", max_memory, jvm_options, lisa_configuration)
+
+def __java_cmd(config: Config, main_class: str, io_arguments: str, max_memory: int, jvm_options: Optional[list[str]], lisa_configuration: Optional[LisaConfiguration]) -> str:
+    lisa_configuration = lisa_configuration or BUILTIN_LISA_CONFIGURATIONS["default"]
     return (f"java"
             f" -Xmx{max_memory}G"
+            f"{''.join(f' {option}' for option in jvm_options or [])}"
             f" -cp {config.path_to_lisa_instance}"
-            f" it.unive.jlisa.Main"
-            f" -s {input_file}"
-            f" -o {out}"
-            f" -n ConstantPropagation"
-            f" -m Statistics"
-            f" -c Assert"
+            f" {main_class}"
+            f" {io_arguments}"
+            f" {' '.join(lisa_configuration.to_arguments())}"
             f" --no-html"
             f" --l ERROR"
-            )
\ No newline at end of file
+            )
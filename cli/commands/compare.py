@@ -1,4 +1,7 @@
 # Standard library imports
+import io
+import json
+import zipfile
 
 # Load vendored packages
 from vendor.package_loader import load_packages
@@ -6,6 +9,9 @@ load_packages()
 
 # Project-local imports
 from cli.models.config import Config
+from cli.commands.analyse import MATRIX_FILE
+from cli.utils.bundle import BundleError, read_manifest, read_bundle_member
+from cli.utils.scoring import score_verdicts
 
 # Third-party imports
 import rich
@@ -22,16 +28,24 @@ config = Config.get()
 def compare(
         first: Annotated[Optional[str], typer.Option(
             "--first", "-f",
-            help="Path to the first SV-COMP results table (produced by command 'statistics')"
+            help="Path to the first SV-COMP results table (produced by command 'statistics') or run bundle (produced by 'export-run')"
         )] = None,
         second: Annotated[Optional[str], typer.Option(
             "--second", "-s",
-            help="Path to the second SV-COMP results table (produced by command 'statistics')",
+            help="Path to the second SV-COMP results table (produced by command 'statistics') or run bundle (produced by 'export-run')",
         )] = None,
         output: Annotated[Optional[str], typer.Option(
             "--output", "-o",
             help="Path to the output file for the comparison results",
-        )] = 'comparison.csv'
+        )] = 'comparison.csv',
+        scheme: Annotated[Optional[str], typer.Option(
+            "--scheme",
+            help="Score both tables again with this score scheme (built-in or declared in config.json), rather than comparing the scores they hold",
+        )] = None,
+        configuration: Annotated[Optional[str], typer.Option(
+            "--configuration", "-c",
+            help="For run bundles of matrix runs, the LiSA configuration whose results table to compare (other tables and bundles are read as they are)",
+        )] = None
 ):
     """
         Compares two SV-COMP results tables (produced by command 'statistics') to find differences
@@ -41,43 +55,52 @@ def compare(
             "Both --first and --second must be provided."
         )
     
-    __compare_csv_files(first, second, output)
+    __compare_csv_files(first, second, output, scheme, configuration)
 
-def __compare_csv_files(file1: str, file2: str, output: str = "comparison.csv"):
+def __compare_csv_files(file1: str, file2: str, output: str = "comparison.csv", scheme: Optional[str] = None, configuration: Optional[str] = None):
     """Compare two CSV files and create a comparison dataframe."""
     
+    points = config.get_score_scheme(scheme)
+
     # Read both files
     rich.print(f"Reading first file: {file1}")
-    df1 = pd.read_csv(file1)
+    df1 = __read_svcomp_table(file1, configuration)
     rich.print(f"Reading second file: {file2}")
-    df2 = pd.read_csv(file2)
+    df2 = __read_svcomp_table(file2, configuration)
+    expected1 = __expected_verdicts(df1)
+    expected2 = __expected_verdicts(df2)
+    if scheme:
+        df1['Score'] = score_verdicts(points, expected1, df1['Virdict'])
+        df2['Score'] = score_verdicts(points, expected2, df2['Virdict'])
     
     # Get all unique test cases from both files
     all_testcases = set(df1['Test case'].unique()) | set(df2['Test case'].unique())
     
     first_testcases = len(df1)
     first_total_score = df1['Score'].sum()
-    first_correct_true = len(df1[(df1['Virdict'] == 'TRUE') & (df1['Score'] == 2)])
-    first_correct_false = len(df1[(df1['Virdict'] == 'FALSE') & (df1['Score'] == 1)])
-    first_incorrect_true = len(df1[(df1['Virdict'] == 'TRUE') & (df1['Score'] == -32)])
-    first_incorrect_false = len(df1[(df1['Virdict'] == 'FALSE') & (df1['Score'] == -16)])
-    first_unknown = len(df1[(df1['Virdict'] == 'UNKNOWN') & (df1['Score'] == 0)])
-    first_unknown_parsing = len(df1[(df1['Virdict'] == 'UNKNOWN (parsing)') & (df1['Score'] == 0)])
-    first_unknown_frontend = len(df1[(df1['Virdict'] == 'UNKNOWN (frontend)') & (df1['Score'] == 0)])
-    first_unknown_analysis = len(df1[(df1['Virdict'] == 'UNKNOWN (analysis)') & (df1['Score'] == 0)])
-    first_timeout = len(df1[(df1['Virdict'] == 'TIMEOUT') & (df1['Score'] == 0)])
+    first_correct_true = len(df1[(df1['Virdict'] == 'TRUE') & expected1])
+    first_correct_false = len(df1[(df1['Virdict'] == 'FALSE') & ~expected1])
+    first_incorrect_true = len(df1[(df1['Virdict'] == 'TRUE') & ~expected1])
+    first_incorrect_false = len(df1[(df1['Virdict'] == 'FALSE') & expected1])
+    first_unknown = len(df1[(df1['Virdict'] == 'UNKNOWN') & (df1['Score'] == points.unknown)])
+    first_unknown_parsing = len(df1[(df1['Virdict'] == 'UNKNOWN (parsing)') & (df1['Score'] == points.unknown)])
+    first_unknown_frontend = len(df1[(df1['Virdict'] == 'UNKNOWN (frontend)') & (df1['Score'] == points.unknown)])
+    first_unknown_analysis = len(df1[(df1['Virdict'] == 'UNKNOWN (analysis)') & (df1['Score'] == points.unknown)])
+    first_timeout = len(df1[(df1['Virdict'] == 'TIMEOUT') & (df1['Score'] == points.unknown)])
+    first_oom = len(df1[(df1['Virdict'] == 'OOM') & (df1['Score'] == points.unknown)])
     
     second_testcases = len(df2)
     second_total_score = df2['Score'].sum()
-    second_correct_true = len(df2[(df2['Virdict'] == 'TRUE') & (df2['Score'] == 2)])
-    second_correct_false = len(df2[(df2['Virdict'] == 'FALSE') & (df2['Score'] == 1)])
-    second_incorrect_true = len(df2[(df2['Virdict'] == 'TRUE') & (df2['Score'] == -32)])
-    second_incorrect_false = len(df2[(df2['Virdict'] == 'FALSE') & (df2['Score'] == -16)])
-    second_unknown = len(df2[(df2['Virdict'] == 'UNKNOWN') & (df2['Score'] == 0)])
-    second_unknown_parsing = len(df2[(df2['Virdict'] == 'UNKNOWN (parsing)') & (df2['Score'] == 0)])
-    second_unknown_frontend = len(df2[(df2['Virdict'] == 'UNKNOWN (frontend)') & (df2['Score'] == 0)])
-    second_unknown_analysis = len(df2[(df2['Virdict'] == 'UNKNOWN (analysis)') & (df2['Score'] == 0)])
-    second_timeout = len(df2[(df2['Virdict'] == 'TIMEOUT') & (df2['Score'] == 0)])
+    second_correct_true = len(df2[(df2['Virdict'] == 'TRUE') & expected2])
+    second_correct_false = len(df2[(df2['Virdict'] == 'FALSE') & ~expected2])
+    second_incorrect_true = len(df2[(df2['Virdict'] == 'TRUE') & ~expected2])
+    second_incorrect_false = len(df2[(df2['Virdict'] == 'FALSE') & expected2])
+    second_unknown = len(df2[(df2['Virdict'] == 'UNKNOWN') & (df2['Score'] == points.unknown)])
+    second_unknown_parsing = len(df2[(df2['Virdict'] == 'UNKNOWN (parsing)') & (df2['Score'] == points.unknown)])
+    second_unknown_frontend = len(df2[(df2['Virdict'] == 'UNKNOWN (frontend)') & (df2['Score'] == points.unknown)])
+    second_unknown_analysis = len(df2[(df2['Virdict'] == 'UNKNOWN (analysis)') & (df2['Score'] == points.unknown)])
+    second_timeout = len(df2[(df2['Virdict'] == 'TIMEOUT') & (df2['Score'] == points.unknown)])
+    second_oom = len(df2[(df2['Virdict'] == 'OOM') & (df2['Score'] == points.unknown)])
     
     positive_changes = 0
     total_score_increase = 0
@@ -149,34 +172,36 @@ def __compare_csv_files(file1: str, file2: str, output: str = "comparison.csv"):
     rich.print(f"    Total test cases: {first_testcases}")
     rich.print(f"    Total score: {first_total_score}")
     rich.print(f"    Correct results: {first_correct_true + first_correct_false}")
-    rich.print(f"      Correct true (2 each): {first_correct_true}")
-    rich.print(f"      Correct false (1 each): {first_correct_false}")
+    rich.print(f"      Correct true ({points.correct_true} each): {first_correct_true}")
+    rich.print(f"      Correct false ({points.correct_false} each): {first_correct_false}")
     rich.print(f"    Incorrect results: {first_incorrect_true + first_incorrect_false}")
-    rich.print(f"      Incorrect true (-32 each): {first_incorrect_true}")
-    rich.print(f"      Incorrect false (-16 each): {first_incorrect_false}")
-    rich.print(f"    Inconclusive results (0 each): {first_unknown + first_unknown_parsing + first_unknown_frontend + first_unknown_analysis + first_timeout}")
+    rich.print(f"      Incorrect true ({points.incorrect_true} each): {first_incorrect_true}")
+    rich.print(f"      Incorrect false ({points.incorrect_false} each): {first_incorrect_false}")
+    rich.print(f"    Inconclusive results ({points.unknown} each): {first_unknown + first_unknown_parsing + first_unknown_frontend + first_unknown_analysis + first_timeout + first_oom}")
     rich.print(f"      Unknown results: {first_unknown}")
-    rich.print(f"      Failures: {first_unknown_parsing + first_unknown_frontend + first_unknown_analysis + first_timeout}")
+    rich.print(f"      Failures: {first_unknown_parsing + first_unknown_frontend + first_unknown_analysis + first_timeout + first_oom}")
     rich.print(f"        Parsing: {first_unknown_parsing}")
     rich.print(f"        Frontend: {first_unknown_frontend}")
     rich.print(f"        Analysis: {first_unknown_analysis}")
     rich.print(f"        Timeouts: {first_timeout}")
+    rich.print(f"        Out of memory: {first_oom}")
     rich.print(f"  Second file ({file2}):")
     rich.print(f"    Total test cases: {second_testcases}")
     rich.print(f"    Total score: {second_total_score}")
     rich.print(f"    Correct results: {second_correct_true + second_correct_false}")
-    rich.print(f"      Correct true (2 each): {second_correct_true}")
-    rich.print(f"      Correct false (1 each): {second_correct_false}")
+    rich.print(f"      Correct true ({points.correct_true} each): {second_correct_true}")
+    rich.print(f"      Correct false ({points.correct_false} each): {second_correct_false}")
     rich.print(f"    Incorrect results: {second_incorrect_true + second_incorrect_false}")
-    rich.print(f"      Incorrect true (-32 each): {second_incorrect_true}")
-    rich.print(f"      Incorrect false (-16 each): {second_incorrect_false}")
-    rich.print(f"    Inconclusive results (0 each): {second_unknown + second_unknown_parsing + second_unknown_frontend + second_unknown_analysis + second_timeout}")
+    rich.print(f"      Incorrect true ({points.incorrect_true} each): {second_incorrect_true}")
+    rich.print(f"      Incorrect false ({points.incorrect_false} each): {second_incorrect_false}")
+    rich.print(f"    Inconclusive results ({points.unknown} each): {second_unknown + second_unknown_parsing + second_unknown_frontend + second_unknown_analysis + second_timeout + second_oom}")
     rich.print(f"      Unknown results: {second_unknown}")
-    rich.print(f"      Failures: {second_unknown_parsing + second_unknown_frontend + second_unknown_analysis + second_timeout}")
+    rich.print(f"      Failures: {second_unknown_parsing + second_unknown_frontend + second_unknown_analysis + second_timeout + second_oom}")
     rich.print(f"        Parsing: {second_unknown_parsing}")
     rich.print(f"        Frontend: {second_unknown_frontend}")
     rich.print(f"        Analysis: {second_unknown_analysis}")
     rich.print(f"        Timeouts: {second_timeout}")
+    rich.print(f"        Out of memory: {second_oom}")
     rich.print(f"[bold]Diff:[/bold]")
     rich.print(f"  Changed verdicts: {comparison_df['Virdict'].str.contains('->').sum()}")
     rich.print(f"  Changed scores: {comparison_df['Score'].str.contains('->').sum()}")
@@ -187,3 +212,29 @@ def __compare_csv_files(file1: str, file2: str, output: str = "comparison.csv"):
     
     return comparison_df
     
+
+def __expected_verdicts(df: pd.DataFrame) -> pd.Series:
+    """
+        Expected verdicts of the test cases of an SV-COMP results table ("<task>|<property type>|<expected verdict>")
+    """
+    return df['Test case'].str.rsplit('|', n=1).str[1] == 'True'
+
+def __read_svcomp_table(path: str, configuration: Optional[str] = None) -> pd.DataFrame:
+    """
+        Reads an SV-COMP results table, either as is or from the svcomp.csv of a run bundle
+        (of the given configuration, for bundles of matrix runs)
+    """
+    if not zipfile.is_zipfile(path):
+        return pd.read_csv(path)
+    try:
+        # matrix runs are scored per configuration only (the configuration is ignored for the other runs)
+        files = read_manifest(path)["files"]
+        if MATRIX_FILE not in files:
+            return pd.read_csv(io.BytesIO(read_bundle_member(path, "svcomp.csv")))
+        if not configuration:
+            configurations = json.loads(read_bundle_member(path, MATRIX_FILE))["configurations"]
+            raise BundleError(f"{path} holds a matrix run: choose among its configurations ({', '.join(configurations)}) with --configuration")
+        return pd.read_csv(io.BytesIO(read_bundle_member(path, f"{configuration}/svcomp.csv")))
+    except BundleError as e:
+        rich.print(f"[bold red]Cannot read {path}:[/bold red] {e}")
+        raise typer.Exit(code=1)
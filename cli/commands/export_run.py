@@ -0,0 +1,100 @@
+# Standard library imports
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import rich
+import typer
+from typing import Annotated
+from typing_extensions import Optional
+
+# Project-local imports
+from cli.models.config import Config
+from cli.commands.analyse import MATRIX_FILE, PORTFOLIO_FILE
+from cli.commands.harvest import get_tasks
+from cli.utils.usage import USAGE_FILE
+from cli.utils.timeouts import TIMEOUTS_FILE
+from cli.utils.bundle import RUN_FILE, write_bundle
+from cli.utils.results_store import SqliteStore, PACKED_RESULTS_FILE
+
+# CLI setup
+cli = typer.Typer()
+config = Config.get()
+
+# Files of the output directory describing a run ('analyse' outputs and task index)
+RUN_FILES = [RUN_FILE, "tasks.json", USAGE_FILE, "timed_out.txt", "oom_killed.txt", MATRIX_FILE, PORTFOLIO_FILE, TIMEOUTS_FILE]
+
+# Files written by 'statistics' (at the top of the output directory, or per configuration in matrix runs)
+STATISTICS_FILES = ["svcomp.csv", "score.csv", "summary.txt", "parsing.csv", "frontend.csv", "analysis.csv", "categories.csv", "portfolio.csv"]
+
+@cli.command()
+def export_run(
+        bundle: Annotated[Path, typer.Argument(
+            help="Path of the bundle (.zip) to write"
+        )],
+):
+    """
+        Exports the last run (task index, packed results, outcomes, metrics and run metadata) to a self-contained bundle
+    """
+    output_dir = config.path_to_output_dir
+    if not (output_dir / "tasks.json").exists():
+        rich.print(f"[bold red]No run to export in {output_dir}.[/bold red]")
+        raise typer.Exit(code=1)
+
+    files: dict[str, Path] = {}
+    matrix = (output_dir / MATRIX_FILE).exists()
+    # matrix runs are scored per configuration, plus the virtual-best portfolio.csv and summary.txt at the top
+    top_level_files = ["portfolio.csv", "summary.txt"] if matrix else [f for f in STATISTICS_FILES if f != "portfolio.csv"]
+    for name in RUN_FILES + top_level_files:
+        if (output_dir / name).exists():
+            files[name] = output_dir / name
+    if matrix:
+        for configuration in json.loads((output_dir / MATRIX_FILE).read_text())["configurations"]:
+            for name in STATISTICS_FILES:
+                if (output_dir / configuration / name).exists():
+                    files[f"{configuration}/{name}"] = output_dir / configuration / name
+
+    if "svcomp.csv" not in files and "summary.txt" not in files:
+        rich.print("[bold yellow]No svcomp.csv found: run 'statistics' before exporting to include scored outcomes.[/bold yellow]")
+    if RUN_FILE not in files:
+        rich.print(f"[bold yellow]No {RUN_FILE} found: the run was made by an older version and carries no metadata.[/bold yellow]")
+
+    with tempfile.TemporaryDirectory() as scratch:
+        packed = output_dir / PACKED_RESULTS_FILE
+        store = None
+        if not packed.exists():
+            packed = Path(scratch) / PACKED_RESULTS_FILE
+            store = SqliteStore(packed)
+        try:
+            files.update(__collect_results(output_dir / "results", {task.file_name for task in get_tasks()}, store))
+        finally:
+            if store:
+                store.close()
+        files[PACKED_RESULTS_FILE] = packed
+
+        write_bundle(bundle, files)
+
+    rich.print(f"[green]Run exported to[/green] [cyan]{bundle}[/cyan] ({bundle.stat().st_size / 1024 ** 2:.1f} MB, {len(files) + 1} files)")
+
+def __collect_results(results_dir: Path, task_names: set[str], store: Optional[SqliteStore]) -> dict[str, Path]:
+    """
+        Packs the task result directories into the store, if any (they are already packed otherwise).
+        Returns the other files found among the results (e.g. per-configuration timed_out.txt), to be bundled as they are
+    """
+    others: dict[str, Path] = {}
+    for root, dirs, files in os.walk(results_dir):
+        relative = Path(root).relative_to(results_dir).as_posix()
+        if Path(root).name in task_names and root != str(results_dir):
+            if store:
+                store.pack(relative, Path(root), remove=False)
+            dirs.clear()
+            continue
+        for file in files:
+            others[f"results/{file}" if relative == "." else f"results/{relative}/{file}"] = Path(root) / file
+    return others
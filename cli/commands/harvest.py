@@ -2,7 +2,8 @@
 import os
 import json
 from pathlib import Path
-from typing import List, Optional
+from threading import Lock
+from typing import Annotated, List, Optional
 
 # Load vendored packages
 from vendor.package_loader import load_packages
@@ -16,6 +17,8 @@ import typer
 # Project-local imports
 from cli.models.config import Config
 from cli.utils.util import json_serializer
+from cli.utils.profiling import span
+from cli.utils.discovery import TaskSets, discover_task_files
 from cli.models.task_definition.fields.property import Property
 from cli.models.task_definition.task_definition import TaskDefinition
 
@@ -25,7 +28,20 @@ config = Config.get()
 
 
 @cli.command()
-def harvest():
+def harvest(
+        include: Annotated[Optional[list[str]], typer.Option(
+            "--include", "-i",
+            help="Harvest only this top directory of the benchmark, e.g. jbmc-regression (repeatable)"
+        )] = None,
+        exclude: Annotated[Optional[list[str]], typer.Option(
+            "--exclude", "-x",
+            help="Do not harvest this top directory of the benchmark (repeatable)"
+        )] = None,
+        set_files: Annotated[Optional[list[Path]], typer.Option(
+            "--set", "-s",
+            help="Harvest only the tasks selected by this SV-COMP .set file, i.e. of its category (repeatable). By default, every task is harvested and tagged with the categories of the .set files of the benchmark"
+        )] = None,
+):
     """
         Harvests task definitions (.yml files) and saves them in tasks.json
     """
@@ -36,15 +52,42 @@ def harvest():
 
     rich.print("[yellow]Harvesting task definitions from SV-COMP benchmark directory...[/yellow]")
 
-    definitions = fetch_tasks()
+    for set_file in set_files or []:
+        if not set_file.is_file():
+            raise typer.BadParameter(f"Set file {set_file} not found")
+
+    definitions = fetch_tasks(include=include, exclude=exclude, set_files=set_files)
     __save_tasks(definitions)
 
-def fetch_tasks(benchmark_dir_path_from_cli: Optional[Path] = None) -> list[TaskDefinition]:
+    groups = group_by_inputs(definitions)
+    rich.print(f"Harvested [bold blue]{len(definitions)}[/bold blue] task definitions over [bold blue]{len(groups)}[/bold blue] distinct input sets (dedup ratio {dedup_ratio(definitions, groups):.2f})")
+
+def fetch_tasks(
+        benchmark_dir_path_from_cli: Optional[Path] = None,
+        include: Optional[list[str]] = None,
+        exclude: Optional[list[str]] = None,
+        set_files: Optional[list[Path]] = None,
+) -> list[TaskDefinition]:
     """
-        Main function to harvest task definitions. Left as public for other commands to use
+        Main function to harvest task definitions, optionally only those selected by some .set files
+        (otherwise, the .set files of the benchmark only tag the tasks with their categories). Left as public for other commands to use
     """
-    raw_task_files = __harvest_tasks(benchmark_dir_path_from_cli)
-    definitions = __construct_task_definition(raw_task_files)
+    if benchmark_dir_path_from_cli:
+        config.path_to_sv_comp_benchmark_dir = benchmark_dir_path_from_cli
+    java_dir = config.path_to_sv_comp_benchmark_dir / "java"
+
+    sets = TaskSets(set_files or sorted(java_dir.glob("*.set")))
+    if set_files and sets.roots() is not None:
+        include = sorted(sets.roots() & set(include)) if include else sorted(sets.roots())
+    with span("walk"):
+        raw_task_files = discover_task_files(java_dir, include, exclude)
+
+    # one pass over the definitions found: the set patterns are matched on their path relative to the java directory
+    prefix = len(os.fspath(java_dir)) + 1
+    categories = {path: sets.categories(path[prefix:].replace(os.sep, "/")) for path in raw_task_files}
+    if set_files:
+        raw_task_files = [path for path in raw_task_files if categories[path]]
+    definitions = __construct_task_definition(raw_task_files, categories)
 
     return definitions
 
@@ -53,50 +96,68 @@ def get_tasks() -> list[TaskDefinition]:
         Returns tasks they have been harvested and saved in tasks.json
     """
 
-    tasks_file = config.path_to_output_dir / "tasks.json"
-    with tasks_file.open(encoding="utf-8") as f:
-        raw_tasks = json.load(f)
-
-    return [TaskDefinition(**t) for t in raw_tasks]
+    return list(__load_tasks()[0])
 
 
 def get_task(file_name: str) -> TaskDefinition | None:
     """
         Returns a task definition by a filename (e.g. "StringValueOf09.yml")
     """
-    tasks_file = config.path_to_output_dir / "tasks.json"
-    with tasks_file.open(encoding="utf-8") as f:
-        raw_tasks = json.load(f)
-
-    for raw_task in raw_tasks:
-        if raw_task["file_name"] == file_name:
-            return TaskDefinition(**raw_task)
-
-    return None
 
+    return __load_tasks()[1].get(file_name)
 
-def __harvest_tasks(benchmark_dir_path_from_cli: Optional[Path] = None) -> list[str]:
-    paths_to_definition_files: list[str] = []
+# tasks.json as last loaded, shared by the scoring threads of 'analyse --score'
+__loaded_tasks: tuple[tuple, list[TaskDefinition], dict[str, TaskDefinition]] = ((), [], {})
+__loading = Lock()
 
-    if benchmark_dir_path_from_cli:
-        config.path_to_sv_comp_benchmark_dir = benchmark_dir_path_from_cli
+def __load_tasks() -> tuple[list[TaskDefinition], dict[str, TaskDefinition]]:
+    """
+        Parses tasks.json once and indexes it by file name (first task of each name), until the file changes
+        (e.g. harvested again or another output directory)
+    """
+    global __loaded_tasks
 
-    for root, dirs, files in os.walk(config.path_to_sv_comp_benchmark_dir / "java"):
-        for file in files:
-            if file.endswith(".yml"):
-                paths_to_definition_files.append(os.path.join(root, file))
+    tasks_file = config.path_to_output_dir / "tasks.json"
+    stat = tasks_file.stat()
+    signature = (str(tasks_file), stat.st_mtime_ns, stat.st_size)
+    with __loading:
+        if __loaded_tasks[0] != signature:
+            with tasks_file.open(encoding="utf-8") as f:
+                tasks = [TaskDefinition(**t) for t in json.load(f)]
+            by_name: dict[str, TaskDefinition] = {}
+            for task in tasks:
+                by_name.setdefault(task.file_name, task)
+            __loaded_tasks = (signature, tasks, by_name)
+        return __loaded_tasks[1], __loaded_tasks[2]
+
+
+def input_set(task: TaskDefinition) -> tuple[str, ...]:
+    """
+        Normalized set of the input files of a task: tasks with the same input set get the same LiSA results
+    """
+    return tuple(sorted({os.path.realpath(p) for p in task.input_files}))
 
-    return paths_to_definition_files
+def group_by_inputs(tasks: list[TaskDefinition]) -> list[list[TaskDefinition]]:
+    """
+        Groups tasks sharing the same input set (e.g., definitions differing only in properties or expected verdicts),
+        preserving the order in which they first appear
+    """
+    groups: dict[tuple[str, ...], list[TaskDefinition]] = {}
+    for task in tasks:
+        groups.setdefault(input_set(task), []).append(task)
+    return list(groups.values())
 
+def dedup_ratio(tasks: list[TaskDefinition], groups: list[list[TaskDefinition]]) -> float:
+    return len(tasks) / len(groups) if groups else 1.0
 
-def __construct_task_definition(paths_to_definition_files: list[str]) -> list[TaskDefinition]:
+def __construct_task_definition(paths_to_definition_files: list[str], categories: dict[str, tuple[str, ...]]) -> list[TaskDefinition]:
     definitions: List[TaskDefinition] = []
 
     for path_str in paths_to_definition_files:
         path = Path(path_str)
 
         try:
-            with path.open() as stream:
+            with path.open() as stream, span("parse"):
                 task_data = yaml.safe_load(stream)
         except yaml.YAMLError as e:
             rich.print(f"[bold red]Error parsing YAML file:[/bold red] {path}\n{e}")
@@ -105,15 +166,10 @@ def __construct_task_definition(paths_to_definition_files: list[str]) -> list[Ta
             rich.print(f"[bold red]File not found:[/bold red] {path}")
             continue
 
-        input_files = ""
-        for file in __filter_out_subdirs(task_data["input_files"]):
-            input_file = (
-                config.path_to_sv_comp_benchmark_dir
-                / "java"
-                / path.parent
-                / file
-            )
-            input_files = input_files + str(input_file) + " "
+        input_files = [
+            str(config.path_to_sv_comp_benchmark_dir / "java" / path.parent / file)
+            for file in __filter_out_subdirs(task_data["input_files"])
+        ]
 
         properties = [
             Property(
@@ -126,8 +182,9 @@ def __construct_task_definition(paths_to_definition_files: list[str]) -> list[Ta
         definitions.append(TaskDefinition(
             file_name=path.name,
             path_to_definition=path,
-            input_file=input_files,
-            properties=properties
+            input_files=input_files,
+            properties=properties,
+            categories=categories[path_str]
         ))
 
     return definitions
@@ -136,7 +193,8 @@ def __construct_task_definition(paths_to_definition_files: list[str]) -> list[Ta
 def __save_tasks(definitions: list[TaskDefinition]) -> None:
 
     tasks_file: Path = config.path_to_output_dir / "tasks.json"
-    tasks_file.write_text(json.dumps(definitions, indent=4, default=json_serializer))
+    with span("write"):
+        tasks_file.write_text(json.dumps(definitions, indent=4, default=json_serializer))
 
     rich.print("[green]Task definitions saved to[/green] [italic]tasks.json[/italic].")
     rich.print("Proceed to [bold magenta]analyse[/bold magenta] command.")
@@ -144,13 +202,20 @@ def __save_tasks(definitions: list[TaskDefinition]) -> None:
 
 def __filter_out_subdirs(paths) -> list[Path]:
     """
-    Given a list of Path objects, remove any that are subdirectories of another.
+    Given a list of Path objects, remove any that are subdirectories of another (or repeat it).
+    The others are kept by depth, in their order otherwise.
     """
 
     paths = sorted(map(Path, paths), key=lambda p: len(p.parts))
 
-    result = []
-    for p in paths:
-        if not any(p.is_relative_to(r) for r in result):
-            result.append(p)
-    return result
+    # sorted by their parts, the paths under a path come right after it: one pass finds them all
+    subsumed = set()
+    root = None
+    for i in sorted(range(len(paths)), key=lambda i: (paths[i].anchor, paths[i].parts)):
+        parts = paths[i].parts
+        # '.' (no parts) holds every relative path
+        if root is not None and parts[:len(root)] == root and (root or not paths[i].anchor):
+            subsumed.add(i)
+        else:
+            root = parts
+    return [p for i, p in enumerate(paths) if i not in subsumed]
@@ -0,0 +1,260 @@
+# Standard library imports
+import io
+import re
+import csv
+import json
+import time
+from pathlib import Path
+from typing import Callable
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import rich
+import typer
+from typing import Annotated
+from typing_extensions import Optional
+from rich.table import Table
+
+# Project-local imports
+from cli.models.config import Config
+from cli.commands.analyse import MATRIX_FILE
+from cli.models.task_outcome import TaskOutcome
+from cli.utils.usage import USAGE_FILE
+from cli.utils.bundle import RUN_FILE, BundleError, read_manifest, read_bundle_member
+from cli.utils.history import HistoryDatabase, DEFAULT_HISTORY_DB
+
+# CLI setup
+cli = typer.Typer(name="history", help="Records scored runs in a local database and queries them over time", no_args_is_help=True)
+config = Config.get()
+
+DatabaseOption = Annotated[Path, typer.Option("--db", help="Path to the history database")]
+ConfigurationOption = Annotated[str, typer.Option("--configuration", "-c", help="LiSA configuration, for runs ingested from a matrix run")]
+
+@cli.command()
+def ingest(
+        source: Annotated[Optional[Path], typer.Argument(
+            help="Output directory scored by 'statistics', or bundle written by 'export-run' (defaults to the configured output directory)"
+        )] = None,
+        label: Annotated[Optional[str], typer.Option(
+            "--label",
+            help="Name of the run in the history (defaults to its start time); ingesting a label again replaces the run"
+        )] = None,
+        db: DatabaseOption = DEFAULT_HISTORY_DB,
+):
+    """
+        Records the per-task verdicts, scores, error categories and timings of a scored run
+    """
+    source = source or config.path_to_output_dir
+    read = __bundle_reader(source) if source.is_file() else __directory_reader(source)
+
+    run_info = json.loads(read(RUN_FILE) or "{}")
+    started = run_info.get("started") or time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(__modification_time(source)))
+    label = label or started
+    matrix = read(MATRIX_FILE)
+    configurations = json.loads(matrix)["configurations"] if matrix else [""]
+
+    # outside of matrix runs, the time of all the analyses of a task adds up (e.g. portfolio stages),
+    # but only of its regular execution: runs with --repeat record the other executions as well.
+    # Results restored from the cache took no analysis time: test cases with only those get no wall time
+    wall_times: dict[tuple[str, str], float] = {}
+    for row in csv.DictReader(io.StringIO((read(USAGE_FILE) or b"").decode())):
+        if row.get("Repeat") not in (None, "", "1") or row["Outcome"] == TaskOutcome.CACHED.value:
+            continue
+        key = (row["Test case"], row["Configuration"] if matrix else "")
+        wall_times[key] = wall_times.get(key, 0.0) + float(row["Wall time"])
+
+    database = HistoryDatabase(db)
+    try:
+        for configuration in configurations:
+            prefix = f"{configuration}/" if configuration else ""
+            svcomp = read(f"{prefix}svcomp.csv")
+            if svcomp is None:
+                rich.print(f"[bold red]No {prefix}svcomp.csv in {source}: run 'statistics' first.[/bold red]")
+                raise typer.Exit(code=1)
+
+            rows = []
+            absolute = 0
+            for row in csv.DictReader(io.StringIO(svcomp.decode())):
+                task = row["Test case"].split("|")[0]
+                rows.append((row["Test case"], row["Virdict"], int(row["Score"]), wall_times.get((task, configuration))))
+                absolute += int(row["Score"])
+            normalized = re.search(r"^Normalized: (-?\d+)$", (read(f"{prefix}summary.txt") or b"").decode(), re.MULTILINE)
+
+            database.ingest(label, configuration, started, run_info.get("lisa_sha256"), absolute, int(normalized.group(1)) if normalized else None, rows)
+            rich.print(f"[green]Ingested run[/green] [bold]{label}[/bold]{f' ({configuration})' if configuration else ''}: {len(rows)} test cases, score {absolute}")
+    finally:
+        database.close()
+
+@cli.command()
+def trend(
+        task: Annotated[Optional[str], typer.Option(
+            "--task", "-t",
+            help="Show the verdicts of a single task (e.g. Ackermann01.yml) or test case (e.g. Ackermann01.yml|assert|False) instead of the run scores"
+        )] = None,
+        last: Annotated[Optional[int], typer.Option("--last", "-n", help="Only the given number of most recent runs")] = None,
+        configuration: ConfigurationOption = "",
+        db: DatabaseOption = DEFAULT_HISTORY_DB,
+):
+    """
+        Shows how scores (or the verdicts of a task) evolved run after run
+    """
+    database = HistoryDatabase(db)
+    try:
+        if task:
+            rows = database.task_history(task, configuration)
+            recent = {run["id"] for run in database.runs(configuration, last)}
+            table = Table(title=f"History of {task}")
+            for column in ("Run", "Started", "Test case", "Verdict", "Score", "Wall time"):
+                table.add_column(column, justify="right" if column in ("Score", "Wall time") else "left")
+            for row in rows:
+                if row["run_id"] in recent:
+                    wall_time = f"{row['wall_time']:.1f}s" if row["wall_time"] is not None else ""
+                    table.add_row(row["label"], row["started"], row["test_case"], row["verdict"], str(row["score"]), wall_time)
+        else:
+            table = Table(title="Scores per run")
+            for column in ("Run", "Started", "LiSA build", "Absolute", "Normalized", "Change"):
+                table.add_column(column, justify="right" if column in ("Absolute", "Normalized", "Change") else "left")
+            previous = None
+            for run in database.runs(configuration, last):
+                change = "" if previous is None else f"{run['absolute'] - previous:+d}"
+                style = "red" if change.startswith("-") else "green" if change.startswith("+") and change != "+0" else None
+                table.add_row(run["label"], run["started"], (run["lisa_sha256"] or "")[:12], str(run["absolute"]), str(run["normalized"] or ""), change, style=style)
+                previous = run["absolute"]
+        rich.print(table)
+    finally:
+        database.close()
+
+@cli.command()
+def flaky(
+        last: Annotated[Optional[int], typer.Option("--last", "-n", help="Only look at the given number of most recent runs")] = None,
+        min_flips: Annotated[int, typer.Option("--min-flips", help="Minimum number of verdict changes between consecutive runs")] = 1,
+        limit: Annotated[int, typer.Option("--limit", help="Maximum number of test cases to show")] = 20,
+        configuration: ConfigurationOption = "",
+        db: DatabaseOption = DEFAULT_HISTORY_DB,
+):
+    """
+        Lists the test cases whose verdict flips across runs
+    """
+    database = HistoryDatabase(db)
+    try:
+        table = Table(title="Flaky test cases")
+        for column in ("Test case", "Flips", "Runs", "Verdicts"):
+            table.add_column(column, justify="right" if column in ("Flips", "Runs") else "left")
+        for row in database.flaky(configuration, last, min_flips, limit):
+            table.add_row(row["test_case"], str(row["flips"]), str(row["runs"]), row["verdicts"])
+        rich.print(table)
+    finally:
+        database.close()
+
+@cli.command()
+def bisect(
+        task: Annotated[str, typer.Argument(
+            help="Regressed task (e.g. Ackermann01.yml, scored over all of its properties) or test case (e.g. Ackermann01.yml|assert|False)"
+        )],
+        good: Annotated[Optional[str], typer.Option(
+            "--good",
+            help="Label of a run where the task was fine (defaults to the oldest run recording the task)"
+        )] = None,
+        configuration: ConfigurationOption = "",
+        db: DatabaseOption = DEFAULT_HISTORY_DB,
+):
+    """
+        Finds the first run of the streak of runs in which a task scores worse than it used to
+    """
+    database = HistoryDatabase(db)
+    try:
+        per_run: dict[int, dict] = {}
+        for row in database.task_history(task, configuration):
+            run = per_run.setdefault(row["run_id"], {"label": row["label"], "started": row["started"], "lisa": row["lisa_sha256"], "score": 0, "verdicts": []})
+            run["score"] += row["score"]
+            run["verdicts"].append(row["verdict"])
+    finally:
+        database.close()
+
+    runs = list(per_run.values())
+    if not runs:
+        rich.print(f"[bold red]No run in the history records {task}.[/bold red]")
+        raise typer.Exit(code=1)
+
+    reference = runs[0]
+    if good:
+        reference = next((run for run in runs if run["label"] == good), None)
+        if reference is None:
+            rich.print(f"[bold red]Run {good} does not record {task}.[/bold red]")
+            raise typer.Exit(code=1)
+
+    # walk back from the most recent run to the last one scoring at least as well as the reference
+    first_bad = None
+    for run in reversed(runs):
+        if run["score"] >= reference["score"]:
+            break
+        first_bad = run
+    if first_bad is None:
+        rich.print(f"[green]{task} is not regressed:[/green] it scores {runs[-1]['score']} in the latest run ({runs[-1]['label']}), {reference['score']} in {reference['label']}")
+        return
+
+    last_good = runs[runs.index(first_bad) - 1] if runs.index(first_bad) > 0 else None
+    rich.print(f"First bad run: [bold red]{first_bad['label']}[/bold red] (started {first_bad['started']}), score {first_bad['score']}, verdicts {', '.join(first_bad['verdicts'])}")
+    if last_good is None:
+        rich.print("[yellow]No earlier run scores as well as the reference.[/yellow]")
+        return
+    rich.print(f"Last good run: [bold green]{last_good['label']}[/bold green] (started {last_good['started']}), score {last_good['score']}, verdicts {', '.join(last_good['verdicts'])}")
+    if last_good["lisa"] and first_bad["lisa"]:
+        if last_good["lisa"] != first_bad["lisa"]:
+            rich.print(f"LiSA build changed in between: [bold]{last_good['lisa'][:12]}[/bold] -> [bold]{first_bad['lisa'][:12]}[/bold]")
+        else:
+            rich.print("Same LiSA build in both runs: the change comes from the benchmark or the run setup")
+
+@cli.command()
+def regressions(
+        base: Annotated[Optional[str], typer.Option("--base", help="Label of the reference run (defaults to the second most recent)")] = None,
+        head: Annotated[Optional[str], typer.Option("--head", help="Label of the run to check (defaults to the most recent)")] = None,
+        limit: Annotated[int, typer.Option("--limit", help="Maximum number of test cases to show")] = 20,
+        configuration: ConfigurationOption = "",
+        db: DatabaseOption = DEFAULT_HISTORY_DB,
+):
+    """
+        Lists the test cases losing the most points between two runs
+    """
+    database = HistoryDatabase(db)
+    try:
+        recent = database.runs(configuration, 2)
+        base_run = database.run(base, configuration) if base else (recent[0] if len(recent) == 2 else None)
+        head_run = database.run(head, configuration) if head else (recent[-1] if recent else None)
+        if base_run is None or head_run is None:
+            rich.print("[bold red]Two runs are needed: ingest more runs or check the given labels.[/bold red]")
+            raise typer.Exit(code=1)
+
+        table = Table(title=f"Regressions from {base_run['label']} to {head_run['label']}")
+        for column in ("Test case", "Before", "After", "Change"):
+            table.add_column(column, justify="right" if column == "Change" else "left")
+        for row in database.regressions(base_run["id"], head_run["id"], limit):
+            table.add_row(row["test_case"], f"{row['base_verdict']} ({row['base_score']})", f"{row['head_verdict']} ({row['head_score']})", str(row["delta"]), style="red")
+        rich.print(table)
+        rich.print(f"Score: {base_run['absolute']} -> {head_run['absolute']} ({head_run['absolute'] - base_run['absolute']:+d})")
+    finally:
+        database.close()
+
+def __directory_reader(directory: Path) -> Callable[[str], Optional[bytes]]:
+    def read(name: str) -> Optional[bytes]:
+        path = directory / name
+        return path.read_bytes() if path.exists() else None
+    return read
+
+def __bundle_reader(bundle: Path) -> Callable[[str], Optional[bytes]]:
+    try:
+        members = read_manifest(bundle)["files"]
+    except BundleError as e:
+        rich.print(f"[bold red]Cannot read {bundle}:[/bold red] {e}")
+        raise typer.Exit(code=1)
+
+    def read(name: str) -> Optional[bytes]:
+        return read_bundle_member(bundle, name) if name in members else None
+    return read
+
+def __modification_time(source: Path) -> float:
+    svcomp = source / "svcomp.csv"
+    return svcomp.stat().st_mtime if source.is_dir() and svcomp.exists() else source.stat().st_mtime
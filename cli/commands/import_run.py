@@ -0,0 +1,91 @@
+# Standard library imports
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import rich
+import typer
+from typing import Annotated
+from typing_extensions import Optional
+
+# Project-local imports
+from cli.models.config import Config
+from cli.commands.analyse import MATRIX_FILE, REPEATS_FILE, BATCHES_DIR
+from cli.commands.export_run import RUN_FILES, STATISTICS_FILES
+from cli.utils.bundle import RUN_FILE, BundleError, extract_bundle
+from cli.utils.results_store import PACKED_RESULTS_FILE
+
+# CLI setup
+cli = typer.Typer()
+config = Config.get()
+
+# Written to the output directory by 'analyse' and 'statistics' besides RUN_FILES and STATISTICS_FILES:
+# removed along with them when a run is replaced
+OTHER_RUN_FILES = [REPEATS_FILE, "stability.csv", PACKED_RESULTS_FILE, f"{PACKED_RESULTS_FILE}-wal", f"{PACKED_RESULTS_FILE}-shm"]
+
+# Directories of the output directory holding the results of a run (matrix runs add one per configuration)
+RUN_DIRS = ["results", "repeats", BATCHES_DIR]
+
+@cli.command()
+def import_run(
+        bundle: Annotated[Path, typer.Argument(
+            help="Path of a bundle written by 'export-run'"
+        )],
+        outdir: Annotated[Optional[Path], typer.Option(
+            "--outdir", "-o",
+            help="Directory to import the run into (defaults to the configured output directory, whose run is replaced)"
+        )] = None,
+):
+    """
+        Imports a run exported by 'export-run', after verifying its checksums, so that 'statistics' can score it
+    """
+    import_bundle(bundle, outdir or config.path_to_output_dir)
+
+def import_bundle(bundle: Path, output_dir: Path):
+    """
+        Replaces the run in output_dir with the one in the bundle. Left as public for other commands to use
+    """
+    # extracted next to output_dir (on the same file system), the run in place is only replaced once the bundle checks out
+    output_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{output_dir.name}-import-", dir=output_dir.parent))
+    try:
+        try:
+            manifest = extract_bundle(bundle, staging)
+        except BundleError as e:
+            rich.print(f"[bold red]Cannot import {bundle}:[/bold red] {e}")
+            raise typer.Exit(code=1)
+
+        __clear_run(output_dir)
+        for entry in staging.iterdir():
+            if entry.is_dir():
+                shutil.rmtree(output_dir / entry.name, ignore_errors=True)
+            os.replace(entry, output_dir / entry.name)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    rich.print(f"[green]Imported {len(manifest['files'])} files from[/green] [cyan]{bundle}[/cyan] [green]into[/green] [cyan]{output_dir}[/cyan] (exported {manifest['created']})")
+    if (output_dir / RUN_FILE).exists():
+        run = json.loads((output_dir / RUN_FILE).read_text())
+        rich.print(f"Run of {run['tasks']} tasks started {run['started']}, LiSA build [bold]{run['lisa_sha256'][:12]}[/bold]")
+        for name, command in run["lisa_commands"].items():
+            rich.print(f"  {name}: [blue]{command}[/blue]")
+
+def __clear_run(output_dir: Path):
+    """
+        Removes everything a run leaves in output_dir: 'analyse' outputs, statistics (per configuration, in matrix runs) and results
+    """
+    directories = list(RUN_DIRS)
+    if (output_dir / MATRIX_FILE).exists():
+        directories += json.loads((output_dir / MATRIX_FILE).read_text())["configurations"]
+    for name in RUN_FILES + STATISTICS_FILES + OTHER_RUN_FILES:
+        if (output_dir / name).exists():
+            os.remove(output_dir / name)
+    for name in directories:
+        shutil.rmtree(output_dir / name, ignore_errors=True)
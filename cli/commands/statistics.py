@@ -1,7 +1,16 @@
 # Standard library imports
+import io
 import os
+import csv
 import json
-from typing import List, Tuple
+import time
+import heapq
+import itertools
+from pathlib import Path
+from collections import Counter
+from dataclasses import dataclass, field
+from statistics import mean, pstdev
+from typing import Annotated, Dict, List, Optional, Tuple
 
 # Load vendored packages
 from vendor.package_loader import load_packages
@@ -9,17 +18,27 @@ load_packages()
 
 # Project-local imports
 from cli.models.config import Config
-from cli.commands.harvest import get_task, get_tasks
+from cli.commands.harvest import get_task, get_tasks, group_by_inputs
 from cli.models.lisa_report.lisa_report import LisaReport
 from cli.models.task_definition.task_definition import TaskDefinition
 from cli.utils.util import classify_asserts, AssertClassification, classify_runtime, RuntimeClassification
+from cli.commands.analyse import MATRIX_FILE, PORTFOLIO_FILE, REPEATS_FILE
+from cli.utils.results_store import ResultsStore, DirectoryStore, open_results_store
+from cli.utils.usage import USAGE_FILE, USAGE_COLUMNS, read_usage
+from cli.utils.profiling import span, redirect_profile
+from cli.utils.tables import NumberedCsvWriter, iter_sorted_rows
+from cli.utils.scoring import score_table
+from cli.models.score_scheme import ScoreScheme
+from cli.commands.import_run import import_bundle
+from cli.utils.bundle import RUN_FILE
 
 # Third-party imports
 import rich
 import typer
 import pandas
-from pandas import DataFrame, concat
+from pandas import DataFrame
 from rich.text import Text
+from rich.table import Table
 
 # CLI setup
 cli = typer.Typer()
@@ -40,86 +59,502 @@ CONFLICT_ALL_WARNING = "LiSA produced both DEFINITE 'holds' and 'does not hold',
 UNKNOWN_WARNING = "LiSA classification unknown"
 NO_WARNINGS = "LiSA produced no warnings"
 
+EXPECTED_VERDICTS = {
+    ("assert", True): ASSERTIONS_TRUE,
+    ("assert", False): ASSERTIONS_FALSE,
+    ("runtime", True): RUNTIME_TRUE,
+    ("runtime", False): RUNTIME_FALSE,
+}
+
+# What each classification of the LiSA warnings is due to, as reported in score.csv
+DUE_TO = {
+    AssertClassification.NO_WARNINGS: NO_WARNINGS,
+    AssertClassification.ONLY_DEFINITE_HOLDS: DEFINITE_WARNING,
+    AssertClassification.ONLY_POSSIBLE_NOT_HOLDS: POSSIBLE_NOT_WARNING,
+    AssertClassification.ONLY_DEFINITE_NOT_HOLDS: DEFINITE_NOT_WARNING,
+    AssertClassification.CONFLICTING_NOT_HOLDS: CONFLICT_NOT_WARNING,
+    AssertClassification.CONFLICTING_HOLDS_AND_NOT_HOLDS: CONFLICT_HOLDS_AND_NOT_WARNING,
+    AssertClassification.CONFLICTING_HOLDS_AND_POSSIBLY_NOT_HOLDS: CONFLICT_HOLDS_AND_POSSIBLY_NOT_WARNING,
+    AssertClassification.ALL: CONFLICT_ALL_WARNING,
+    AssertClassification.UNKNOWN: UNKNOWN_WARNING,
+    RuntimeClassification.NO_WARNINGS: NO_WARNINGS,
+    RuntimeClassification.ONLY_POSSIBLE_NOT_HOLDS: POSSIBLE_NOT_WARNING,
+    RuntimeClassification.ONLY_DEFINITE_NOT_HOLDS: DEFINITE_NOT_WARNING,
+    RuntimeClassification.CONFLICTING_NOT_HOLDS: CONFLICT_NOT_WARNING,
+    RuntimeClassification.UNKNOWN: UNKNOWN_WARNING,
+}
+
+# Seconds between two reads of usage.csv with --watch (at most --interval)
+WATCH_POLL_SECONDS = 2
+
+# Error tables LiSA may write instead of a report, with the error kind and the verdict they stand for
+ERROR_FILES = {
+    "frontend.csv": ("parsing", "UNKNOWN (parsing)"),
+    "frontend-noparsing.csv": ("frontend", "UNKNOWN (frontend)"),
+    "analysis.csv": ("analysis", "UNKNOWN (analysis)"),
+}
+
+@dataclass
+class ScoredTask:
+    """
+        Outcome of scoring the results of a single task: the error tables LiSA wrote (by error kind, messages counted
+        per message) with their UNKNOWN verdicts, or the score.csv and svcomp.csv rows computed from its report
+    """
+
+    errors: List[Tuple[str, DataFrame]] = field(default_factory=list)
+    score_rows: List[list] = field(default_factory=list)
+    svcomp_rows: List[list] = field(default_factory=list)
+
 @cli.command()
-def statistics():
+def statistics(
+        bundle: Annotated[Optional[Path], typer.Option(
+            "--bundle",
+            help="Score the run exported to this bundle by 'export-run' (it is imported into --outdir first)"
+        )] = None,
+        outdir: Annotated[Optional[Path], typer.Option(
+            "--outdir", "-o",
+            help="With --bundle, the directory to import the bundle into and score: the run it holds is replaced"
+        )] = None,
+        watch: Annotated[bool, typer.Option(
+            "--watch",
+            help="Follow a running 'analyse', scoring tasks as they complete and refreshing summary.txt, then compute the full statistics once it is over"
+        )] = False,
+        interval: Annotated[float, typer.Option(
+            "--interval",
+            help="With --watch, seconds between two refreshes of summary.txt"
+        )] = 30,
+        scheme: Annotated[Optional[str], typer.Option(
+            "--scheme",
+            help="Score scheme (points of correct, incorrect and unknown verdicts), among the built-in ones (svcomp, svcomp-2014, svcomp-2012) and those declared in config.json. Defaults to the configured one"
+        )] = None,
+):
     """
         Computes statistics on analysis results
     """
-    output_dir = os.path.join(str(config.path_to_output_dir), "results")
-
-    parsing_error_table = None
-    frontend_error_table = None
-    analysis_error_table = None
-    score_table = DataFrame()
-    svcomp_scores = DataFrame()
-
-    parsing_error_counter = 0
-    frontend_error_counter = 0
-    analysis_error_counter = 0
-
-    def process_csv(file_path, dataframe):
-        temp = pandas.read_csv(file_path, sep=";")[["Message", "Type"]].groupby(["Message"]).count()
-        return __add_row(temp, dataframe, os.path.basename(os.path.dirname(file_path)))
-
-    for dir_name in os.listdir(output_dir):
-        results_dir = os.path.join(output_dir, dir_name)
-        if not os.path.isdir(results_dir):
-            continue
-
-        treated = False
-
-        for file in os.listdir(results_dir):
-            file_path = os.path.join(results_dir, file)
-
-            if file == "frontend.csv":
-                parsing_error_table = process_csv(file_path, parsing_error_table)
-                svcomp_iteration_df = __to_svcomp_table_entry(dir_name, "UNKNOWN (parsing)", 0)
-                svcomp_scores = svcomp_scores._append(svcomp_iteration_df)
-                parsing_error_counter += 1
-                treated = True
-
-            elif file == "frontend-noparsing.csv":
-                frontend_error_table = process_csv(file_path, frontend_error_table)
-                svcomp_iteration_df = __to_svcomp_table_entry(dir_name, "UNKNOWN (frontend)", 0)
-                svcomp_scores = svcomp_scores._append(svcomp_iteration_df)
-                frontend_error_counter += 1
-                treated = True
-
-            elif file == "analysis.csv":
-                analysis_error_table = process_csv(file_path, analysis_error_table)
-                svcomp_iteration_df = __to_svcomp_table_entry(dir_name, "UNKNOWN (analysis)", 0)
-                svcomp_scores = svcomp_scores._append(svcomp_iteration_df)
-                analysis_error_counter += 1
-                treated = True
-
-        if not treated:
-            this_iteration_df, svcomp_iteration_df = __compute_score(results_dir, dir_name)
-            score_table = score_table._append(this_iteration_df)
-            svcomp_scores = svcomp_scores._append(svcomp_iteration_df)
-
-    timed_out_tasks = []
-    if os.path.exists(f"{str(config.path_to_output_dir)}/timed_out.txt"):
-        with open(f"{str(config.path_to_output_dir)}/timed_out.txt", "r") as f:
-            timed_out_tasks = [line.strip() for line in f.readlines()]
-    for t in timed_out_tasks:
-        svcomp_iteration_df = __to_svcomp_table_entry(t, "TIMEOUT", 0)
-        svcomp_scores = svcomp_scores._append(svcomp_iteration_df)
-
-    __save_output_csvs(parsing_error_table, frontend_error_table, analysis_error_table, score_table, svcomp_scores)
-    __save_summary(score_table, parsing_error_counter, frontend_error_counter, analysis_error_counter, timed_out_tasks)
-
-def __to_svcomp_table_entry(file_name, virdict, score):
+    if bundle and watch:
+        raise typer.BadParameter("--bundle and --watch cannot be used together.")
+    # importing replaces the run in place: the live run of the configured output directory is never the implicit target
+    if bundle and not outdir:
+        raise typer.BadParameter("--bundle requires --outdir, the directory to import the bundle into.")
+    if outdir and not bundle:
+        raise typer.BadParameter("--outdir is only used with --bundle.")
+    if scheme:
+        config.get_score_scheme(scheme)
+        config.score_scheme = scheme
+    if bundle:
+        import_bundle(bundle, outdir)
+        config.path_to_output_dir = outdir
+        redirect_profile(outdir)
+    if watch and not __watch(interval):
+        return
+    compute_statistics()
+
+def compute_statistics(prescored: Optional[Dict[str, ScoredTask]] = None):
+    """
+        Scores the run in the output directory and saves the tables and summaries. Tasks found in 'prescored'
+        (by results key) are not scored again (e.g., 'analyse --score' scores them as they complete).
+        Left as public for other commands to use
+    """
+    store = open_results_store(config.path_to_output_dir)
+    try:
+        matrix_file = config.path_to_output_dir / MATRIX_FILE
+        portfolio_file = config.path_to_output_dir / PORTFOLIO_FILE
+        if matrix_file.exists():
+            __matrix_statistics(store, json.loads(matrix_file.read_text())["configurations"], prescored)
+        elif portfolio_file.exists():
+            __portfolio_statistics(store, json.loads(portfolio_file.read_text())["tasks"], prescored)
+        else:
+            __score_directory(store, "", str(config.path_to_output_dir), str(config.path_to_output_dir), prescored)
+
+        repeats_file = config.path_to_output_dir / REPEATS_FILE
+        if repeats_file.exists():
+            configurations = json.loads(matrix_file.read_text())["configurations"] if matrix_file.exists() else [""]
+            __stability_statistics(store, json.loads(repeats_file.read_text()), configurations)
+    finally:
+        store.close()
+
+def __watch(interval: float) -> bool:
+    """
+        Follows usage.csv, where 'analyse' records each task once its results are in place, and scores every
+        recorded task (and the tasks sharing its input files) exactly once, keeping the summary counters in memory.
+        A task analysed again (e.g., by the next portfolio stage) replaces its previous contribution.
+        Returns whether the run finished, rather than the watch being interrupted
+    """
+    output_dir = config.path_to_output_dir
+    all_tasks = get_tasks()
+    followers = {leader.file_name: [t.file_name for t in others] for leader, *others in group_by_inputs(all_tasks)}
+    matrix = (output_dir / MATRIX_FILE).exists()
+
+    # per task: the counters it contributes to the running tally of its configuration ("" outside matrix runs)
+    contributions: Dict[Tuple[str, str], Counter] = {}
+    tallies: Dict[str, Counter] = {}
+    offset = 0
+    last_refresh = time.monotonic()
+    rich.print(f"[yellow]Watching[/yellow] [cyan]{output_dir / USAGE_FILE}[/cyan] [yellow](Ctrl+C to stop)...[/yellow]")
+    try:
+        while True:
+            # checked before reading: every row recorded before the run finished is read in this round
+            finished = (output_dir / RUN_FILE).exists()
+            rows, offset, restarted = __read_new_usage_rows(output_dir / USAGE_FILE, offset)
+            if restarted:
+                contributions.clear()
+                tallies.clear()
+
+            if rows:
+                store = open_results_store(output_dir)
+                try:
+                    for row in rows:
+                        if row["Repeat"] not in ("", "1"):
+                            continue
+                        configuration = row["Configuration"]
+                        scope = configuration if matrix else ""
+                        tally = tallies.setdefault(scope, Counter())
+                        for task in [row["Test case"], *followers.get(row["Test case"], [])]:
+                            contribution = __score_task(store, f"{configuration}/{task}" if configuration else task, task, row["Outcome"])
+                            tally.subtract(contributions.get((scope, task), Counter()))
+                            tally.update(contribution)
+                            contributions[scope, task] = contribution
+                finally:
+                    store.close()
+
+            if finished or time.monotonic() - last_refresh >= interval:
+                last_refresh = time.monotonic()
+                __refresh_watch_summaries(tallies, all_tasks, len(contributions))
+            if finished:
+                rich.print("[green]The run is over: computing the full statistics...[/green]\n")
+                return True
+            time.sleep(min(interval, WATCH_POLL_SECONDS))
+    except KeyboardInterrupt:
+        __refresh_watch_summaries(tallies, all_tasks, len(contributions))
+        return False
+
+def __read_new_usage_rows(journal: Path, offset: int) -> Tuple[List[Dict[str, str]], int, bool]:
+    """
+        Rows appended to usage.csv after the given offset (complete lines only), the offset to read from next time,
+        and whether the journal was read again from the start, having been truncated by a new run
+    """
+    if not journal.exists():
+        return [], 0, offset > 0
+    with open(journal, "rb") as f:
+        restarted = os.fstat(f.fileno()).st_size < offset
+        if restarted:
+            offset = 0
+        f.seek(offset)
+        data = f.read()
+    complete = data[:data.rfind(b"\n") + 1]
+    lines = complete.decode().splitlines()
+    columns = USAGE_COLUMNS
+    if offset == 0 and lines:
+        columns, lines = next(csv.reader(lines[:1])), lines[1:]
+    return list(csv.DictReader(lines, fieldnames=columns)), offset + len(complete), restarted
+
+def __score_task(store: ResultsStore, results_key: str, file_name: str, outcome: str) -> Counter:
+    """
+        Summary counters a single task contributes, as scored by __score_run
+    """
+    if outcome in ("timeout", "oom"):
+        counters = Counter({outcome: 1})
+        counters.update(__unanswered_scores(__to_svcomp_table_entry(file_name, outcome.upper(), config.get_score_scheme())))
+        return counters
+    files = store.files(results_key)
+    errors = [ERROR_FILES[file][0] for file in files if file in ERROR_FILES]
+    if errors:
+        counters = Counter(errors)
+        counters.update(__unanswered_scores(__to_svcomp_table_entry(file_name, "UNKNOWN", config.get_score_scheme())))
+        return counters
+    if "report.json" not in files:
+        return Counter()
+    score_rows, _ = __compute_score(store, results_key, file_name)
+    return __tally_scores(score_rows)
+
+def __refresh_watch_summaries(tallies: Dict[str, Counter], all_tasks: List[TaskDefinition], scored: int):
+    for scope, tally in tallies.items():
+        out_dir = os.path.join(str(config.path_to_output_dir), scope)
+        os.makedirs(out_dir, exist_ok=True)
+        absolute, normalized = __save_summary(out_dir, tally, all_tasks, echo=False)
+        passed = tally["runtime", "passed"] + tally["assert", "passed"]
+        inconclusive = tally["runtime", "inconclusive"] + tally["assert", "inconclusive"]
+        failed = tally["runtime", "failed"] + tally["assert", "failed"]
+        rich.print(
+            f"[dim]{time.strftime('%H:%M:%S')}[/dim] {f'[bold magenta]{scope}[/bold magenta] ' if scope else ''}"
+            f"[bold green]{passed} passed[/bold green] / [bold yellow]{inconclusive} inconclusive[/bold yellow] / [bold red]{failed} failed[/bold red], "
+            f"absolute [bold]{absolute}[/bold], normalized [bold]{normalized}[/bold]"
+        )
+    rich.print(f"[dim]{scored} tasks scored so far[/dim]")
+
+def __stability_statistics(store: ResultsStore, repeats: dict, configurations: List[str]):
+    """
+        For each task analysed more than once (analyse --repeat), reports the distribution of the verdicts of each property,
+        how much the analysis time varies and a stability score: the share of executions agreeing with the most frequent verdict.
+        Results go to stability.csv (per configuration in matrix runs)
+    """
+    tasks = {t.file_name: t for t in get_tasks()}
+    executions = {
+        (row["Test case"], row["Configuration"], int(row.get("Repeat") or 1)): row
+        for row in read_usage(config.path_to_output_dir / USAGE_FILE)
+    }
+    repeat_stores = {k: DirectoryStore(config.path_to_output_dir / "repeats" / str(k)) for k in range(2, repeats["repeat"] + 1)}
+
+    for configuration in configurations:
+        prefix = f"{configuration}/" if configuration else ""
+        rows = []
+        for file_name in repeats["tasks"]:
+            verdicts: Dict[str, List[str]] = {}
+            times = []
+            for k in range(1, repeats["repeat"] + 1):
+                execution = executions.get((file_name, configuration, k))
+                if execution and execution["Outcome"] != "cached":
+                    times.append(float(execution["Wall time"]))
+                execution_verdicts = __execution_verdicts(store if k == 1 else repeat_stores[k], f"{prefix}{file_name}", tasks[file_name], execution)
+                for test_case, verdict in execution_verdicts.items():
+                    verdicts.setdefault(test_case, []).append(verdict)
+
+            for test_case, test_case_verdicts in verdicts.items():
+                counts = Counter(test_case_verdicts)
+                majority, majority_count = counts.most_common(1)[0]
+                rows.append([
+                    test_case,
+                    len(test_case_verdicts),
+                    ", ".join(f"{verdict}: {count}" for verdict, count in counts.most_common()),
+                    majority,
+                    round(majority_count / len(test_case_verdicts), 3),
+                    round(mean(times), 3) if times else None,
+                    round(pstdev(times), 3) if times else None,
+                    min(times, default=None),
+                    max(times, default=None),
+                ])
+
+        stability = DataFrame(rows, columns=["Test case", "Executions", "Verdicts", "Majority verdict", "Stability", "Mean time", "Time std dev", "Min time", "Max time"])
+        stability = stability.sort_values(["Stability", "Test case"], kind="stable").reset_index(drop=True)
+        stability.index += 1
+        stability.index.name = "No."
+        out_dir = os.path.join(str(config.path_to_output_dir), configuration)
+        stability.to_csv(os.path.join(out_dir, "stability.csv"))
+
+        unstable = stability[stability["Stability"] < 1]
+        rich.print(f"\n[italic]Stability{f' ({configuration})' if configuration else ''}[/italic] over {repeats['repeat']} executions")
+        rich.print(f"Stable test cases: [bold green]{len(stability) - len(unstable)}[/bold green] / unstable: [bold red]{len(unstable)}[/bold red] (check stability.csv)")
+        for _, row in unstable.head(10).iterrows():
+            rich.print(f"  [red]{row['Test case']}[/red]: {row['Verdicts']}")
+
+def __execution_verdicts(store: ResultsStore, results_key: str, task: TaskDefinition, execution: Optional[dict]) -> Dict[str, str]:
+    """
+        Verdicts of a single execution of a task, by SV-COMP test case
+    """
+    test_cases = [test_case for test_case, _, _ in __to_svcomp_table_entry(task.file_name, "", config.get_score_scheme())]
+    outcome = execution["Outcome"] if execution else None
+    if outcome in ("timeout", "oom"):
+        return {test_case: outcome.upper() for test_case in test_cases}
+
+    files = store.files(results_key)
+    for file, (_, verdict) in ERROR_FILES.items():
+        if file in files:
+            return {test_case: verdict for test_case in test_cases}
+    if "report.json" not in files:
+        return {test_case: "FAILED" for test_case in test_cases}
+
+    _, svcomp_rows = __compute_score(store, results_key, task.file_name)
+    return {test_case: virdict for test_case, virdict, _ in svcomp_rows}
+
+def __portfolio_statistics(store: ResultsStore, outcomes: Dict[str, dict], prescored: Optional[Dict[str, ScoredTask]] = None):
+    """
+        Scores a portfolio run: each task is scored on the results of the configuration that settled it
+        (i.e., the last one tried), which is reported in the 'Configuration' column of svcomp.csv
+    """
+    task_dirs = [
+        (task, f"{outcome['configuration']}/{task}")
+        for task, outcome in sorted(outcomes.items())
+        if outcome["outcome"] not in ("timeout", "oom")
+    ]
+    timed_out_tasks = [task for task, outcome in sorted(outcomes.items()) if outcome["outcome"] == "timeout"]
+    oom_killed_tasks = [task for task, outcome in sorted(outcomes.items()) if outcome["outcome"] == "oom"]
+    configurations = {task: outcome["configuration"] for task, outcome in outcomes.items()}
+
+    __score_run(store, task_dirs, timed_out_tasks, oom_killed_tasks, str(config.path_to_output_dir), configurations, prescored)
+
+def __matrix_statistics(store: ResultsStore, configurations: List[str], prescored: Optional[Dict[str, ScoredTask]] = None):
+    """
+        Scores each LiSA configuration of a matrix run on its own (outputs go to <output dir>/<configuration>),
+        then scores the virtual-best portfolio picking, for each task, the best verdict among all configurations
+    """
+    scores = {}
+    for name in configurations:
+        rich.print(f"\n[bold magenta]Configuration: {name}[/bold magenta]")
+        killed_tasks_dir = os.path.join(str(config.path_to_output_dir), "results", name)
+        out_dir = os.path.join(str(config.path_to_output_dir), name)
+        os.makedirs(out_dir, exist_ok=True)
+        scores[name] = __score_directory(store, f"{name}/", killed_tasks_dir, out_dir, prescored)
+
+    # the tables of all configurations, each sorted by test case, are merged: the best score of each test case
+    # wins, the first configuration (and row) scoring it on ties
+    def sorted_table(name):
+        for row in iter_sorted_rows(Path(config.path_to_output_dir) / name / "svcomp.csv", key=lambda row: row[1]):
+            yield row, name
+
+    property_scores = Counter()
+    with open(os.path.join(config.path_to_output_dir, "portfolio.csv"), "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(["No.", "Test case", "Virdict", "Score", "Configuration"])
+        merged = heapq.merge(*map(sorted_table, configurations), key=lambda entry: entry[0][1])
+        for number, (test_case, entries) in enumerate(itertools.groupby(merged, key=lambda entry: entry[0][1]), start=1):
+            (_, _, virdict, score), name = max(entries, key=lambda entry: int(entry[0][3]))
+            writer.writerow([number, test_case, virdict, score, name])
+            property_scores[test_case.split("|")[1]] += int(score)
+
+    assert_tasks, runtime_tasks = __count_property_tasks(get_tasks())
+    scores["virtual best"] = (
+        property_scores["runtime"] + property_scores["assert"],
+        __normalized_score(property_scores["runtime"], property_scores["assert"], runtime_tasks, assert_tasks),
+    )
+
+    table = Table(title="Scores per LiSA configuration")
+    table.add_column("Configuration")
+    table.add_column("Absolute", justify="right")
+    table.add_column("Normalized", justify="right")
+    for name, (absolute, normalized) in scores.items():
+        table.add_row(name, str(absolute), str(normalized), style="bold green" if name == "virtual best" else None)
+    rich.print(table)
+
+    with open(os.path.join(config.path_to_output_dir, "summary.txt"), "w") as f:
+        for name, (absolute, normalized) in scores.items():
+            f.write(f"{name}: absolute {absolute}, normalized {normalized}\n")
+
+def __score_directory(store: ResultsStore, prefix: str, killed_tasks_dir: str, out_dir: str, prescored: Optional[Dict[str, ScoredTask]] = None) -> Tuple[int, int]:
+    """
+        Scores the task results found under prefix in the store and saves tables and summary to out_dir.
+        Returns the absolute and normalized scores
+    """
+
+    timed_out_tasks = __read_task_list(killed_tasks_dir, "timed_out.txt")
+    oom_killed_tasks = __read_task_list(killed_tasks_dir, "oom_killed.txt")
+    # killed analyses may leave partial results behind: they are accounted for by their own verdict
+    killed_tasks = set(timed_out_tasks) | set(oom_killed_tasks)
+
+    with span("walk"):
+        task_dirs = [
+            (dir_name, f"{prefix}{dir_name}")
+            for dir_name in store.tasks(prefix)
+            if dir_name not in killed_tasks
+        ]
+    return __score_run(store, task_dirs, timed_out_tasks, oom_killed_tasks, out_dir, prescored=prescored)
+
+def __score_run(
+    store: ResultsStore,
+    task_dirs: List[Tuple[str, str]],
+    timed_out_tasks: List[str],
+    oom_killed_tasks: List[str],
+    out_dir: str,
+    configurations: Optional[Dict[str, str]] = None,
+    prescored: Optional[Dict[str, ScoredTask]] = None,
+) -> Tuple[int, int]:
+    """
+        Scores the given (task, results key in the store) pairs plus the killed tasks, and saves tables and summary to out_dir.
+        svcomp.csv and score.csv are written as tasks are scored, while the summary counters are kept on the fly.
+        With 'configurations', svcomp.csv also reports the LiSA configuration each task was scored on
+    """
+
+    error_tables: Dict[str, Optional[DataFrame]] = {kind: None for kind, _ in ERROR_FILES.values()}
+    tally = Counter()
+    # the same counters, by SV-COMP category of the tasks
+    category_tallies: Dict[str, Counter] = {}
+
+    def tally_categories(file_name: str, counters: Counter):
+        task = get_task(file_name)
+        for category in task.categories if task else ():
+            category_tallies.setdefault(category, Counter()).update(counters)
+
+    svcomp_columns = ["Test case", "Virdict", "Score"] + (["Configuration"] if configurations is not None else [])
+    svcomp_csv = NumberedCsvWriter(Path(out_dir) / "svcomp.csv", svcomp_columns, "Test case")
+    score_csv = NumberedCsvWriter(Path(out_dir) / "score.csv", ["Test case", "Type", "SV-COMP score", "Due to"], "Test case")
+
+    def write_svcomp(rows):
+        if configurations is not None:
+            rows = [[*row, configurations.get(row[0].split("|")[0])] for row in rows]
+        svcomp_csv.write(rows)
+
+    with svcomp_csv, score_csv:
+        for dir_name, results_key in task_dirs:
+            scored = (prescored or {}).get(results_key) or score_task(store, results_key, dir_name)
+            if scored is None:
+                continue
+
+            with span("aggregate"):
+                counters = __tally_scores(scored.score_rows)
+                for kind, messages in scored.errors:
+                    error_tables[kind] = __add_row(messages, error_tables[kind], dir_name)
+                    counters[kind] += 1
+                if scored.errors:
+                    counters.update(__unanswered_scores(__to_svcomp_table_entry(dir_name, "UNKNOWN", config.get_score_scheme())))
+                tally.update(counters)
+                tally_categories(dir_name, counters)
+            with span("write"):
+                score_csv.write(scored.score_rows)
+                write_svcomp(scored.svcomp_rows)
+
+        for outcome, killed_tasks in (("timeout", timed_out_tasks), ("oom", oom_killed_tasks)):
+            for t in killed_tasks:
+                svcomp_rows = __to_svcomp_table_entry(t, outcome.upper(), config.get_score_scheme())
+                counters = Counter({outcome: 1})
+                counters.update(__unanswered_scores(svcomp_rows))
+                write_svcomp(svcomp_rows)
+                tally.update(counters)
+                tally_categories(t, counters)
+
+    with span("write"):
+        __save_error_csvs(out_dir, error_tables["parsing"], error_tables["frontend"], error_tables["analysis"])
+        scores = __save_summary(out_dir, tally)
+        __save_category_scores(out_dir, category_tallies)
+        return scores
+
+def score_task(store: ResultsStore, results_key: str, file_name: str) -> Optional[ScoredTask]:
+    """
+        Scores the results of a task (None if there are none). Left as public for other commands to use
+    """
+    files = store.files(results_key)
+    if not files:
+        return None
+
+    scored = ScoredTask()
+    for file in files:
+        if file in ERROR_FILES:
+            kind, verdict = ERROR_FILES[file]
+            messages = pandas.read_csv(io.BytesIO(store.read(results_key, file)), sep=";")[["Message", "Type"]].groupby(["Message"]).count()
+            scored.errors.append((kind, messages))
+            scored.svcomp_rows += __to_svcomp_table_entry(file_name, verdict, config.get_score_scheme())
+    if not scored.errors:
+        scored.score_rows, scored.svcomp_rows = __compute_score(store, results_key, file_name)
+    return scored
+
+def __read_task_list(directory: str, file_name: str) -> List[str]:
+    """
+        Reads one of the task lists written by 'analyse' (e.g., timed_out.txt), if present
+    """
+    path = os.path.join(directory, file_name)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return [line.strip() for line in f.readlines() if line.strip()]
+
+def __unanswered_scores(svcomp_rows: List[list]) -> Counter:
+    """
+        Score counters (see __tally_scores) of a task LiSA gave no answer on (killed, or failed with an error): its test cases
+        earn what the score scheme gives unknown verdicts, without being counted as inconclusive
+    """
+    counters = Counter()
+    for test_case, _, score in svcomp_rows:
+        counters[test_case.split("|")[1], "score"] += score
+    return counters
+
+def __to_svcomp_table_entry(file_name, virdict, scheme: ScoreScheme):
     task: TaskDefinition = get_task(file_name)
     svcomp_data = []
     if task.are_runtime_exceptions_expected() is not None:
-        svcomp_data.append([f"{file_name}|runtime|{task.are_runtime_exceptions_expected()}", virdict, score])
+        expected = task.are_runtime_exceptions_expected()
+        svcomp_data.append([f"{file_name}|runtime|{expected}", virdict, scheme.score(expected, virdict)])
     if task.are_assertions_expected() is not None:
-        svcomp_data.append([f"{file_name}|assert|{task.are_assertions_expected()}", virdict, score])
-    svcomp_iteration_df = DataFrame(
-        svcomp_data,
-        columns=["Test case", "Virdict", "Score"]
-    )
-    return svcomp_iteration_df
+        expected = task.are_assertions_expected()
+        svcomp_data.append([f"{file_name}|assert|{expected}", virdict, scheme.score(expected, virdict)])
+    return svcomp_data
 
 def __add_row(temp, dataframe, test_case):
     temp["Test_cases"] = str(test_case) + "\n"
@@ -136,13 +571,18 @@ def __add_row(temp, dataframe, test_case):
     return dataframe
 
 
-def __compute_score(results_dir: str, file_name: str) -> DataFrame:
+def __compute_score(store: ResultsStore, results_key: str, file_name: str) -> Tuple[List[list], List[list]]:
+    """
+        Scores a task on its report.json: returns its score.csv rows (test case, type, score, due to)
+        and its svcomp.csv rows (test case, verdict, score)
+    """
     task: TaskDefinition = get_task(file_name)
-    with open(os.path.join(results_dir, "report.json"), encoding="utf-8") as f:
-        lisa_report = LisaReport(**json.load(f))
+    with span("parse"):
+        lisa_report = LisaReport(**json.loads(store.read(results_key, "report.json").decode("utf-8")))
 
-    sv_runtime, due_runtime, virdict_runtime = __score_runtime_exceptions(task, lisa_report)
-    sv_assert, due_assert, virdict_assert = __score_assertions(task, lisa_report)
+    with span("classify"):
+        sv_runtime, due_runtime, virdict_runtime = __score_property(task, lisa_report, "runtime")
+        sv_assert, due_assert, virdict_assert = __score_property(task, lisa_report, "assert")
 
     internal_data = []
     svcomp_data = []
@@ -153,177 +593,80 @@ def __compute_score(results_dir: str, file_name: str) -> DataFrame:
         internal_data.append([file_name, "assert", sv_assert, "\n".join(due_assert)])
         svcomp_data.append([f"{file_name}|assert|{task.are_assertions_expected()}", virdict_assert, sv_assert])
 
-    score_table = DataFrame(
-        internal_data,
-        columns=["Test case", "Type", "SV-COMP score", "Due to"]
-    )
-    svcomp_table = DataFrame(
-        svcomp_data,
-        columns=["Test case", "Virdict", "Score"]
-    )
+    return internal_data, svcomp_data
 
-    return score_table, svcomp_table
-
-
-def __score_assertions(task: TaskDefinition, lisa_report: LisaReport) -> Tuple[int, List[str]]:
-    sv_comp_score = 0
-    due_to: List[str] = []
-
-    expected = task.are_assertions_expected()
-    classification = classify_asserts(lisa_report)
-    virdict = classification.value[1]
-    if expected: # TRUE
-        expected_res = ASSERTIONS_TRUE
-        match classification.value[1]:
-            case "TRUE":
-                sv_comp_score = 2
-            case "FALSE":
-                sv_comp_score = -16
-            case "UNKNOWN":
-                sv_comp_score = 0
-    elif expected is False: # FALSE
-        expected_res = ASSERTIONS_FALSE
-        match classification.value[1]:
-            case "TRUE":
-                sv_comp_score = -32
-            case "FALSE":
-                sv_comp_score = 1
-            case "UNKNOWN":
-                sv_comp_score = 0
-    else: # PROPERTY IS ABSENT
-        return 0, [], "UNKNOWN"
 
-    match classification:
-        case AssertClassification.NO_WARNINGS:
-            due_to.append(f"{expected_res}, and {NO_WARNINGS}")
-        case AssertClassification.ONLY_DEFINITE_HOLDS:
-            due_to.append(f"{expected_res}, and {DEFINITE_WARNING}")
-        case AssertClassification.ONLY_POSSIBLE_NOT_HOLDS:
-            due_to.append(f"{expected_res}, and {POSSIBLE_NOT_WARNING}")
-        case AssertClassification.ONLY_DEFINITE_NOT_HOLDS:
-            due_to.append(f"{expected_res}, and {DEFINITE_NOT_WARNING}")
-        case AssertClassification.CONFLICTING_NOT_HOLDS:
-            due_to.append(f"{expected_res}, and {CONFLICT_NOT_WARNING}")
-        case AssertClassification.CONFLICTING_HOLDS_AND_NOT_HOLDS:
-            due_to.append(f"{expected_res}, and {CONFLICT_HOLDS_AND_NOT_WARNING}")
-        case AssertClassification.CONFLICTING_HOLDS_AND_POSSIBLY_NOT_HOLDS:
-            due_to.append(f"{expected_res}, and {CONFLICT_HOLDS_AND_POSSIBLY_NOT_WARNING}")
-        case AssertClassification.ALL:
-            due_to.append(f"{expected_res}, and {CONFLICT_ALL_WARNING}")
-        case AssertClassification.UNKNOWN:
-            due_to.append(f"{expected_res}, and {UNKNOWN_WARNING}")
-
-    return sv_comp_score, due_to, virdict
-
-
-def __score_runtime_exceptions(task: TaskDefinition, lisa_report: LisaReport) -> Tuple[int, List[str]]:
-    sv_comp_score = 0
-    due_to: List[str] = []
-
-    expected = task.are_runtime_exceptions_expected()
-    classification = classify_runtime(lisa_report)
-    virdict = classification.value[1]
-    if expected: # TRUE
-        expected_res = RUNTIME_TRUE
-        match classification.value[1]:
-            case "TRUE":
-                sv_comp_score = 2
-            case "FALSE":
-                sv_comp_score = -16
-            case "UNKNOWN":
-                sv_comp_score = 0
-    elif expected is False: # FALSE
-        expected_res = RUNTIME_FALSE
-        match classification.value[1]:
-            case "TRUE":
-                sv_comp_score = -32
-            case "FALSE":
-                sv_comp_score = 1
-            case "UNKNOWN":
-                sv_comp_score = 0
-    else: # PROPERTY IS ABSENT
+def __score_property(task: TaskDefinition, lisa_report: LisaReport, property_type: str) -> Tuple[int, List[str], str]:
+    """
+        Score, explanation ("Due to") and SV-COMP verdict of a property type of the task, looked up in the scoring table
+        of the configured score scheme
+    """
+    if property_type == "assert":
+        expected, classification = task.are_assertions_expected(), classify_asserts(lisa_report)
+    else:
+        expected, classification = task.are_runtime_exceptions_expected(), classify_runtime(lisa_report)
+    if expected is None: # PROPERTY IS ABSENT
         return 0, [], "UNKNOWN"
 
-    match classification:
-        case RuntimeClassification.NO_WARNINGS:
-            due_to.append(f"{expected_res}, and {NO_WARNINGS}")
-        case RuntimeClassification.ONLY_POSSIBLE_NOT_HOLDS:
-            due_to.append(f"{expected_res}, and {POSSIBLE_NOT_WARNING}")
-        case RuntimeClassification.ONLY_DEFINITE_NOT_HOLDS:
-            due_to.append(f"{expected_res}, and {DEFINITE_NOT_WARNING}")
-        case RuntimeClassification.CONFLICTING_NOT_HOLDS:
-            due_to.append(f"{expected_res}, and {CONFLICT_NOT_WARNING}")
-        case RuntimeClassification.UNKNOWN:
-            due_to.append(f"{expected_res}, and {UNKNOWN_WARNING}")
+    expected = bool(expected)
+    score, virdict = score_table(config.get_score_scheme())[property_type, expected, classification]
+    return score, [f"{EXPECTED_VERDICTS[property_type, expected]}, and {DUE_TO[classification]}"], virdict
 
-    return sv_comp_score, due_to, virdict
 
-
-def __save_output_csvs(
+def __save_error_csvs(
+    out_dir: str,
     parsing_error_table=None,
     frontend_error_table=None,
     analysis_error_table=None,
-    score_table=None,
-    svcomp_scores=None,
 ):
 
     def __save_sorted_csv(df, filename):
         if df is not None:
             sorted_df = df.sort_values("Type", ascending=False)
             sorted_df.to_csv(
-                os.path.join(config.path_to_output_dir, filename), index=True
+                os.path.join(out_dir, filename), index=True
             )
 
     __save_sorted_csv(parsing_error_table, "parsing.csv")
     __save_sorted_csv(frontend_error_table, "frontend.csv")
     __save_sorted_csv(analysis_error_table, "analysis.csv")
 
-    if svcomp_scores is not None:
-        svcomp_scores = concat([svcomp_scores]).reset_index(drop=True)
-        svcomp_scores.index += 1
-        svcomp_scores["No."] = svcomp_scores["Test case"].factorize()[0] + 1
-        svcomp_scores.set_index("No.", inplace=True)
-        svcomp_scores.to_csv(os.path.join(config.path_to_output_dir, "svcomp.csv"))
-
-    if score_table is not None:
-        score_table = concat([score_table]).reset_index(drop=True)
-        score_table.index += 1
-        score_table["No."] = score_table["Test case"].factorize()[0] + 1
-        score_table.set_index("No.", inplace=True)
-        score_table.to_csv(os.path.join(config.path_to_output_dir, "score.csv"))
-
-
-def __save_summary(
-    score_table,
-    parsing_error_counter: int,
-    frontend_error_counter: int,
-    analysis_error_counter: int,
-    timed_out_tasks: List[str],
-):
-    all_tasks = get_tasks()
-    assert_tasks = 0
-    runtime_tasks = 0
-    for task in all_tasks:
-        if task.are_assertions_expected() is not None:
-            assert_tasks += 1
-        if task.are_runtime_exceptions_expected() is not None:
-            runtime_tasks += 1
 
-    sv_comp_total_passed = (score_table["SV-COMP score"] > 0).sum()
-    sv_comp_total_zero = (score_table["SV-COMP score"] == 0).sum()
-    sv_comp_total_failed = (score_table["SV-COMP score"] < 0).sum()
+def __tally_scores(score_rows: List[list]) -> Counter:
+    """
+        Summary counters of the score.csv rows of a task: test cases by (property type, passed/inconclusive/failed)
+        and score by (property type, "score")
+    """
+    tally = Counter()
+    for _, property_type, score, _ in score_rows:
+        tally[property_type, "passed" if score > 0 else "failed" if score < 0 else "inconclusive"] += 1
+        tally[property_type, "score"] += score
+    return tally
 
-    sv_comp_passed_runtime = (score_table.loc[score_table["Type"] == "runtime", "SV-COMP score"] > 0).sum()
-    sv_comp_zero_runtime = (score_table.loc[score_table["Type"] == "runtime", "SV-COMP score"] == 0).sum()
-    sv_comp_failed_runtime = (score_table.loc[score_table["Type"] == "runtime", "SV-COMP score"] < 0).sum()
+def __save_summary(out_dir: str, tally: Counter, all_tasks: Optional[List[TaskDefinition]] = None, echo: bool = True) -> Tuple[int, int]:
+    """
+        Prints (with 'echo') and saves to summary.txt the summary of the counters kept while scoring
+        (see __tally_scores, plus the number of tasks by error kind). Returns the absolute and normalized scores
+    """
+    all_tasks = all_tasks if all_tasks is not None else get_tasks()
+    assert_tasks, runtime_tasks = __count_property_tasks(all_tasks)
+
+    sv_comp_passed_runtime = tally["runtime", "passed"]
+    sv_comp_zero_runtime = tally["runtime", "inconclusive"]
+    sv_comp_failed_runtime = tally["runtime", "failed"]
+
+    sv_comp_passed_assert = tally["assert", "passed"]
+    sv_comp_zero_assert = tally["assert", "inconclusive"]
+    sv_comp_failed_assert = tally["assert", "failed"]
 
-    sv_comp_passed_assert = (score_table.loc[score_table["Type"] == "assert", "SV-COMP score"] > 0).sum()
-    sv_comp_zero_assert = (score_table.loc[score_table["Type"] == "assert", "SV-COMP score"] == 0).sum()
-    sv_comp_failed_assert = (score_table.loc[score_table["Type"] == "assert", "SV-COMP score"] < 0).sum()
+    sv_comp_total_passed = sv_comp_passed_runtime + sv_comp_passed_assert
+    sv_comp_total_zero = sv_comp_zero_runtime + sv_comp_zero_assert
+    sv_comp_total_failed = sv_comp_failed_runtime + sv_comp_failed_assert
 
-    runtime_score = score_table.loc[score_table['Type'] == 'runtime', 'SV-COMP score'].sum()
-    assert_score = score_table.loc[score_table['Type'] == 'assert', 'SV-COMP score'].sum()
-    norm_score = round(((runtime_score / runtime_tasks) + (assert_score / assert_tasks)) * ((runtime_tasks + assert_tasks) / 2))
+    runtime_score = tally["runtime", "score"]
+    assert_score = tally["assert", "score"]
+    absolute_score = runtime_score + assert_score
+    norm_score = __normalized_score(runtime_score, assert_score, runtime_tasks, assert_tasks)
 
     summary_lines = [
         f"Test files: [bold blue]{len(all_tasks)}[/bold blue]",
@@ -336,23 +679,90 @@ def __save_summary(
         f"Runtime: [bold green]{sv_comp_passed_runtime} passed[/bold green] / [bold yellow]{sv_comp_zero_runtime} inconclusive[/bold yellow] / [bold red]{sv_comp_failed_runtime} failed[/bold red]",
         f"Assert: [bold green]{sv_comp_passed_assert} passed[/bold green] / [bold yellow]{sv_comp_zero_assert} inconclusive[/bold yellow] / [bold red]{sv_comp_failed_assert} failed[/bold red]\n",
         f"[italic]Scores[/italic]",
-        f"Absolute: [bold green]{score_table['SV-COMP score'].sum()}[/bold green]",
+        f"Absolute: [bold green]{absolute_score}[/bold green]",
         f"Normalized: [bold green]{norm_score}[/bold green]",
         f"Runtime: [bold blue]{runtime_score}[/bold blue]",
         f"Assert: [bold yellow]{assert_score}[/bold yellow]\n",
 
         f"[red bold]Errors[/red bold] (check corresponding .csv files)",
-        f"Parsing: [bold red]{parsing_error_counter}[/bold red]",
-        f"Frontend: [bold red]{frontend_error_counter}[/bold red]",
-        f"Analysis: [bold red]{analysis_error_counter}[/bold red]",
-        f"Timeouts: [bold red]{len(timed_out_tasks)}[/bold red]",
+        f"Parsing: [bold red]{tally['parsing']}[/bold red]",
+        f"Frontend: [bold red]{tally['frontend']}[/bold red]",
+        f"Analysis: [bold red]{tally['analysis']}[/bold red]",
+        f"Timeouts: [bold red]{tally['timeout']}[/bold red]",
+        f"Out of memory: [bold red]{tally['oom']}[/bold red]",
     ]
 
-    for line in summary_lines:
-        rich.print(line)
+    if echo:
+        for line in summary_lines:
+            rich.print(line)
 
-    summary_path = os.path.join(config.path_to_output_dir, "summary.txt")
+    summary_path = os.path.join(out_dir, "summary.txt")
     with open(summary_path, "w") as f:
         for line in summary_lines:
             f.write(Text.from_markup(line).plain + "\n")
 
+    return absolute_score, norm_score
+
+def __save_category_scores(out_dir: str, category_tallies: Dict[str, Counter]):
+    """
+        Prints and saves to categories.csv the results and scores of each SV-COMP category (see 'harvest --set'),
+        out of the counters kept while scoring (see __save_summary)
+    """
+    if not category_tallies:
+        return
+    all_tasks = get_tasks()
+
+    rows = []
+    for category in sorted(category_tallies):
+        tally = category_tallies[category]
+        assert_tasks, runtime_tasks = __count_property_tasks([t for t in all_tasks if category in t.categories])
+        runtime_score, assert_score = tally["runtime", "score"], tally["assert", "score"]
+        rows.append([
+            category,
+            sum(category in t.categories for t in all_tasks),
+            assert_tasks + runtime_tasks,
+            *(tally["runtime", outcome] + tally["assert", outcome] for outcome in ("passed", "inconclusive", "failed")),
+            tally["parsing"] + tally["frontend"] + tally["analysis"],
+            tally["timeout"],
+            tally["oom"],
+            runtime_score + assert_score,
+            __normalized_score(runtime_score, assert_score, runtime_tasks, assert_tasks),
+        ])
+
+    columns = ["Category", "Test files", "Tasks", "Passed", "Inconclusive", "Failed", "Errors", "Timeouts", "Out of memory", "Absolute", "Normalized"]
+    with open(os.path.join(out_dir, "categories.csv"), "w", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+    shown = ["Category", "Test files", "Passed", "Inconclusive", "Failed", "Absolute", "Normalized"]
+    table = Table(title="Scores per category (check categories.csv)")
+    for column in shown:
+        table.add_column(column, justify="left" if column == "Category" else "right")
+    for row in rows:
+        table.add_row(*(str(row[columns.index(column)]) for column in shown))
+    rich.print(table)
+
+def __count_property_tasks(tasks: List[TaskDefinition]) -> Tuple[int, int]:
+    """
+        Counts the tasks that expect a verdict on assertions and on runtime exceptions, respectively
+    """
+    assert_tasks = 0
+    runtime_tasks = 0
+    for task in tasks:
+        if task.are_assertions_expected() is not None:
+            assert_tasks += 1
+        if task.are_runtime_exceptions_expected() is not None:
+            runtime_tasks += 1
+    return assert_tasks, runtime_tasks
+
+def __normalized_score(runtime_score, assert_score, runtime_tasks: int, assert_tasks: int) -> int:
+    """
+        SV-COMP normalized score: each property category weighs the same, regardless of how many tasks it counts
+    """
+    # property categories without tasks (e.g. in an SV-COMP category checking assertions only) are left out
+    categories = [(score, tasks) for score, tasks in ((runtime_score, runtime_tasks), (assert_score, assert_tasks)) if tasks]
+    if not categories:
+        return 0
+    return round(sum(score / tasks for score, tasks in categories) * ((runtime_tasks + assert_tasks) / len(categories)))
+
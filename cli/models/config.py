@@ -4,7 +4,7 @@ import dataclasses
 import os
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Load vendored packages
 from vendor.package_loader import load_packages
@@ -17,6 +17,9 @@ from rich.markup import escape
 
 # Project-local imports
 from cli.utils.util import json_serializer, resource_path
+from cli.models.jvm_profile import JvmProfile, BUILTIN_JVM_PROFILES
+from cli.models.lisa_configuration import LisaConfiguration, BUILTIN_LISA_CONFIGURATIONS
+from cli.models.score_scheme import ScoreScheme, BUILTIN_SCORE_SCHEMES
 
 # CLI setup
 cli = typer.Typer()
@@ -30,6 +33,11 @@ class Config:
     path_to_sv_comp_benchmark_dir: Optional[Path] = None
     path_to_lisa_instance: Optional[Path] = None
     path_to_output_dir: Optional[Path] = None
+    jvm_profile: str = "default"
+    jvm_profiles: dict[str, JvmProfile] = field(default_factory=dict)
+    lisa_configurations: dict[str, LisaConfiguration] = field(default_factory=dict)
+    score_scheme: str = "svcomp"
+    score_schemes: dict[str, ScoreScheme] = field(default_factory=dict)
 
     @classmethod
     def get(cls) -> 'Config':
@@ -51,11 +59,19 @@ class Config:
         if not os.path.exists(lisa_inst_clean):
             lisa_inst = resource_path(config_dict.get('path_to_lisa_instance'))
         out_dir = config_dict.get('path_to_output_dir')
+        jvm_profiles = {name: JvmProfile(**p) for name, p in config_dict.get('jvm_profiles', {}).items()}
+        lisa_configurations = {name: LisaConfiguration(**c) for name, c in config_dict.get('lisa_configurations', {}).items()}
+        score_schemes = {name: ScoreScheme(**s) for name, s in config_dict.get('score_schemes', {}).items()}
         
         return cls(
             path_to_sv_comp_benchmark_dir=Path(bench_dir) if bench_dir else None,
             path_to_lisa_instance=Path(lisa_inst) if lisa_inst else None,
-            path_to_output_dir=Path(out_dir) if out_dir else None
+            path_to_output_dir=Path(out_dir) if out_dir else None,
+            jvm_profile=config_dict.get('jvm_profile', "default"),
+            jvm_profiles=jvm_profiles,
+            lisa_configurations=lisa_configurations,
+            score_scheme=config_dict.get('score_scheme', "svcomp"),
+            score_schemes=score_schemes
         )
 
     def is_empty(self) -> bool:
@@ -69,6 +85,40 @@ class Config:
                 self.path_to_output_dir is None
         )
 
+    def get_jvm_profile(self, name: Optional[str] = None) -> JvmProfile:
+        """
+            Resolves a JVM profile by name (the configured 'jvm_profile' by default) among the profiles
+            declared in config.json and the built-in ones
+        """
+
+        name = name or self.jvm_profile
+        profiles = {**BUILTIN_JVM_PROFILES, **self.jvm_profiles}
+        if name not in profiles:
+            raise typer.BadParameter(f"Unknown JVM profile '{name}'. Available profiles: {', '.join(profiles)}")
+        return profiles[name]
+
+    def get_lisa_configuration(self, name: str) -> LisaConfiguration:
+        """
+            Resolves a LiSA configuration by name among the ones declared in config.json and the built-in ones
+        """
+
+        configurations = {**BUILTIN_LISA_CONFIGURATIONS, **self.lisa_configurations}
+        if name not in configurations:
+            raise typer.BadParameter(f"Unknown LiSA configuration '{name}'. Available configurations: {', '.join(configurations)}")
+        return configurations[name]
+
+    def get_score_scheme(self, name: Optional[str] = None) -> ScoreScheme:
+        """
+            Resolves a score scheme by name (the configured 'score_scheme' by default) among the schemes
+            declared in config.json and the built-in ones
+        """
+
+        name = name or self.score_scheme
+        schemes = {**BUILTIN_SCORE_SCHEMES, **self.score_schemes}
+        if name not in schemes:
+            raise typer.BadParameter(f"Unknown score scheme '{name}'. Available schemes: {', '.join(schemes)}")
+        return schemes[name]
+
     def save(self):
         config_file: Path = Path.cwd() / "config.json"
         config_file.write_text(json.dumps(dataclasses.asdict(self), indent=4, default=json_serializer))
@@ -0,0 +1,48 @@
+# Standard library imports
+from typing import Optional
+from dataclasses import dataclass, field
+
+@dataclass
+class JvmProfile:
+    """
+        Represents a named set of JVM tuning options LiSA is launched with.
+        Profiles are declared under 'jvm_profiles' in config.json, e.g.:
+        "jvm_profiles": {
+            "fast-start": {"gc": "SerialGC", "tiered_stop_at_level": 1, "share": "auto"}
+        }
+    """
+
+    gc: Optional[str] = None                    # e.g. SerialGC, ParallelGC, G1GC, ZGC
+    stack_size: Optional[str] = None            # -Xss, e.g. 8m
+    tiered_stop_at_level: Optional[int] = None  # -XX:TieredStopAtLevel
+    share: Optional[str] = None                 # -Xshare: auto, on or off
+    system_properties: dict[str, str] = field(default_factory=dict)
+    extra_options: list[str] = field(default_factory=list)
+
+    def to_options(self) -> list[str]:
+        """
+            Translates the profile into JVM command line options
+        """
+
+        options = []
+        if self.gc:
+            options.append(f"-XX:+Use{self.gc}")
+        if self.stack_size:
+            options.append(f"-Xss{self.stack_size}")
+        if self.tiered_stop_at_level is not None:
+            options.append(f"-XX:TieredStopAtLevel={self.tiered_stop_at_level}")
+        if self.share:
+            options.append(f"-Xshare:{self.share}")
+        options.extend(f"-D{key}={value}" for key, value in self.system_properties.items())
+        options.extend(self.extra_options)
+        return options
+
+# Profiles available even without any 'jvm_profiles' entry in config.json (config.json may override them)
+BUILTIN_JVM_PROFILES = {
+    # the JVM defaults, as LiSA has always been launched
+    "default": JvmProfile(),
+    # short-lived analyses: C1 only and a single-threaded collector minimise boot and warm-up time
+    "startup": JvmProfile(gc="SerialGC", tiered_stop_at_level=1, share="auto"),
+    # long-running analyses: parallel collector and deep recursion headroom
+    "throughput": JvmProfile(gc="ParallelGC", stack_size="16m"),
+}
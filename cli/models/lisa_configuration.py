@@ -0,0 +1,35 @@
+# Standard library imports
+from dataclasses import dataclass, field
+
+@dataclass
+class LisaConfiguration:
+    """
+        Represents a named LiSA analysis setup (abstract domain, mode, checkers and further options).
+        Configurations are declared under 'lisa_configurations' in config.json, e.g.:
+        "lisa_configurations": {
+            "intervals": {"domain": "Interval"}
+        }
+    """
+
+    domain: str = "ConstantPropagation"
+    mode: str = "Statistics"
+    checkers: list[str] = field(default_factory=lambda: ["Assert"])
+    options: list[str] = field(default_factory=list)
+
+    def to_arguments(self) -> list[str]:
+        """
+            Translates the configuration into LiSA command line arguments
+        """
+
+        return [
+            "-n", self.domain,
+            "-m", self.mode,
+            "-c", *self.checkers,
+            *self.options,
+        ]
+
+# Configurations available even without any 'lisa_configurations' entry in config.json
+BUILTIN_LISA_CONFIGURATIONS = {
+    # the configuration LiSA has always been launched with
+    "default": LisaConfiguration(),
+}
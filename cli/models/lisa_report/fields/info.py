@@ -1,7 +1,7 @@
 # Standard library imports
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class Info:
     """
         Represents an 'info' field of a LiSA's 'report' JSON file
@@ -1,8 +1,61 @@
 # Standard library imports
 import re
+from enum import IntFlag
+from functools import lru_cache
 from dataclasses import dataclass
+from typing import Iterable, List, Tuple
 
-@dataclass
+# The analysis warning follows the checker tag, e.g. "Main.java:3:5: [ASSERT] DEFINITE: the assertion holds"
+_TAGGED = re.compile(r"\[[A-Z]+\]\s*(.*)$")
+
+class WarningTraits(IntFlag):
+    """
+        What an analysis warning is about (kind) and how sure LiSA is of it (certainty),
+        as spelled out by the wording of its message
+    """
+
+    NONE = 0
+    # kind
+    ASSERTION = 1               # "the assertion"
+    RUNTIME = 2                 # "uncaught runtime exception"
+    # certainty
+    HOLDS = 4                   # "assertion holds"
+    DOES_NOT_HOLD = 8           # "assertion DOES NOT hold"
+    POSSIBLE = 16               # "POSSIBLE"
+    DEFINITE = 32               # "DEFINITE"
+
+# All the wordings at once: each group, numbered as the trait bits, is looked ahead at every position so
+# that overlapping wordings (e.g. "the assertion holds") are all found, as independent substring tests would.
+# No two wordings can match at the same position ("assertion holds" and "assertion DOES NOT hold" share a prefix but
+# then differ), hence one alternative per position is enough
+_TRAITS = re.compile(
+    r"(?=(the assertion)|(uncaught runtime exception)|(assertion holds)|(assertion DOES NOT hold)|(POSSIBLE)|(DEFINITE))"
+)
+
+def classify_message(message: str) -> Tuple[str, WarningTraits]:
+    """
+        Extracts the analysis warning from a raw LiSA message and classifies it
+    """
+
+    match = _TAGGED.search(message) if message else None
+    return _classify_warning(match.group(1)) if match else ("", WarningTraits.NONE)
+
+@lru_cache(maxsize=4096)
+def _classify_warning(warning: str) -> Tuple[str, WarningTraits]:
+    # LiSA words its warnings in a handful of ways (the position in the code is only in the raw message):
+    # each wording is classified once, and the reports share one copy of it
+    traits = WarningTraits.NONE
+    for trait in _TRAITS.finditer(warning):
+        traits |= 1 << (trait.lastindex - 1)
+    return warning, WarningTraits(traits)
+
+def classify_messages(messages: Iterable[str]) -> List[WarningTraits]:
+    """
+        Classifies a whole list of raw LiSA messages, e.g. all the warnings of the reports being scored
+    """
+    return [traits for _, traits in map(classify_message, messages)]
+
+@dataclass(slots=True)
 class Warning:
     """
         Represents a 'warning' field of a LiSA's 'report' JSON file
@@ -15,13 +68,13 @@ class Warning:
         Extracts the analysis warning (e.g. how assertion holds, etc.)
         """
 
-        if not self.message:
-            return ""
-        match = re.search(r"\[[A-Z]+\]\s*(.*)$", self.message)
-        return match.group(1) if match else ""
+        return classify_message(self.message)[0]
+
+    def traits(self) -> WarningTraits:
+        return classify_message(self.message)[1]
 
     def is_assertion_warning(self) -> bool:
-        return "the assertion" in self.extract_warning()
+        return bool(self.traits() & WarningTraits.ASSERTION)
 
     def is_runtime_warning(self) -> bool:
-        return "uncaught runtime exception" in self.extract_warning()
\ No newline at end of file
+        return bool(self.traits() & WarningTraits.RUNTIME)
\ No newline at end of file
@@ -1,12 +1,12 @@
 # Standard library imports
 from typing import List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 # Project-local imports
 from cli.models.lisa_report.fields.info import Info
-from cli.models.lisa_report.fields.warning import Warning
+from cli.models.lisa_report.fields.warning import Warning, WarningTraits, classify_messages
 
-@dataclass
+@dataclass(slots=True)
 class LisaReport:
     """
         Represents the 'report' JSON file generated by LiSA
@@ -15,11 +15,26 @@ class LisaReport:
     # There are other fields (files, configuration, etc.) in the report. Add them up upon the need
     warnings: List[Warning]
     info: Info
+    # Traits of the assertion (resp. runtime) warnings, classified once: found in any of them, shared by all of them
+    any_assert: WarningTraits = field(init=False, repr=False, compare=False)
+    all_assert: WarningTraits = field(init=False, repr=False, compare=False)
+    any_runtime: WarningTraits = field(init=False, repr=False, compare=False)
+    all_runtime: WarningTraits = field(init=False, repr=False, compare=False)
 
     def __init__(self, warnings, info, **_):
         self.warnings = [Warning(**w) if isinstance(w, dict) else w for w in warnings]
         self.info = Info(**info)
 
+        self.any_assert = self.any_runtime = WarningTraits.NONE
+        self.all_assert = self.all_runtime = ~WarningTraits.NONE
+        for traits in classify_messages(w.message for w in self.warnings):
+            if traits & WarningTraits.ASSERTION:
+                self.any_assert |= traits
+                self.all_assert &= traits
+            if traits & WarningTraits.RUNTIME:
+                self.any_runtime |= traits
+                self.all_runtime &= traits
+
     def has_warnings(self) -> bool:
         return self.info.warnings > 0
 
@@ -32,25 +47,25 @@ class LisaReport:
         return [w.extract_warning() for w in self.warnings if w.is_assertion_warning()]
 
     def has_assert_warnings(self) -> bool:
-        return len(self.list_assert_warnings()) > 0
+        return bool(self.any_assert)
     
     def has_only_definite_holds_assert_warning(self) -> bool:
-        return all("assertion holds" in warning for warning in self.list_assert_warnings())
+        return bool(self.all_assert & WarningTraits.HOLDS)
     
     def has_definite_holds_assert_warning(self) -> bool:
-        return any("assertion holds" in warning for warning in self.list_assert_warnings())
+        return bool(self.any_assert & WarningTraits.HOLDS)
     
     def has_only_possibly_not_holds_assert_warning(self) -> bool:
-        return all("POSSIBLE" in warning for warning in self.list_assert_warnings())
+        return bool(self.all_assert & WarningTraits.POSSIBLE)
     
     def has_possibly_not_holds_assert_warning(self) -> bool:
-        return any("POSSIBLE" in warning for warning in self.list_assert_warnings())
+        return bool(self.any_assert & WarningTraits.POSSIBLE)
 
     def has_only_definite_not_holds_assert_warning(self) -> bool:
-        return all("assertion DOES NOT hold" in warning for warning in self.list_assert_warnings())
+        return bool(self.all_assert & WarningTraits.DOES_NOT_HOLD)
 
     def has_definite_not_holds_assert_warning(self) -> bool:
-        return any("assertion DOES NOT hold" in warning for warning in self.list_assert_warnings())
+        return bool(self.any_assert & WarningTraits.DOES_NOT_HOLD)
 
     # runtime specific
 
@@ -58,25 +73,16 @@ class LisaReport:
         return [w.extract_warning() for w in self.warnings if w.is_runtime_warning()]
     
     def has_runtime_warnings(self) -> bool:
-        return len(self.list_runtime_warnings()) > 0
+        return bool(self.any_runtime)
 
     def has_only_possibly_not_holds_runtime_warning(self) -> bool:
-        return all("POSSIBLE" in warning for warning in self.list_runtime_warnings())
+        return bool(self.all_runtime & WarningTraits.POSSIBLE)
 
     def has_possibly_not_holds_runtime_warning(self) -> bool:
-        return any("POSSIBLE" in warning for warning in self.list_runtime_warnings())
+        return bool(self.any_runtime & WarningTraits.POSSIBLE)
 
     def has_only_definite_not_holds_runtime_warning(self) -> bool:
-        return all("DEFINITE" in warning for warning in self.list_runtime_warnings())
+        return bool(self.all_runtime & WarningTraits.DEFINITE)
 
     def has_definite_not_holds_runtime_warning(self) -> bool:
-        return any("DEFINITE" in warning for warning in self.list_runtime_warnings())
-
-
-    
-
-    
-
-    
-
-    
+        return bool(self.any_runtime & WarningTraits.DEFINITE)
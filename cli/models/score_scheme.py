@@ -0,0 +1,39 @@
+# Standard library imports
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class ScoreScheme:
+    """
+        Represents the points a verdict earns on an SV-COMP test case, depending on the expected verdict.
+        Schemes are declared under 'score_schemes' in config.json, e.g.:
+        "score_schemes": {
+            "cautious": {"incorrect_true": -64, "incorrect_false": -32}
+        }
+    """
+
+    correct_true: int = 2       # TRUE verdict, TRUE expected
+    correct_false: int = 1      # FALSE verdict, FALSE expected
+    incorrect_true: int = -32   # TRUE verdict, FALSE expected (a missed violation)
+    incorrect_false: int = -16  # FALSE verdict, TRUE expected (a false alarm)
+    unknown: int = 0            # any other verdict (UNKNOWN, TIMEOUT, OOM, ...)
+
+    def score(self, expected: bool, verdict: str) -> int:
+        """
+            Points of a single verdict
+        """
+
+        if verdict == "TRUE":
+            return self.correct_true if expected else self.incorrect_true
+        if verdict == "FALSE":
+            return self.incorrect_false if expected else self.correct_false
+        return self.unknown
+
+# Schemes available even without any 'score_schemes' entry in config.json (config.json may override them)
+BUILTIN_SCORE_SCHEMES = {
+    # the SV-COMP scoring in use since 2016
+    "svcomp": ScoreScheme(),
+    # SV-COMP 2014 and 2015
+    "svcomp-2014": ScoreScheme(incorrect_true=-12, incorrect_false=-6),
+    # SV-COMP 2012 and 2013
+    "svcomp-2012": ScoreScheme(incorrect_true=-8, incorrect_false=-4),
+}
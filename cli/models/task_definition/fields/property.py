@@ -1,7 +1,27 @@
 # Standard library imports
-from dataclasses import dataclass
+import sys
+from enum import IntFlag
+from dataclasses import dataclass, field
 
-@dataclass
+class PropertyKind(IntFlag):
+    """
+        What a property file checks, resolved once from its name
+    """
+
+    NONE = 0
+    ASSERT = 1
+    RUNTIME_EXCEPTION = 2
+
+    @classmethod
+    def of(cls, property_file: str) -> "PropertyKind":
+        kind = cls.NONE
+        if "assert" in property_file:
+            kind |= cls.ASSERT
+        if "runtime-exception" in property_file:
+            kind |= cls.RUNTIME_EXCEPTION
+        return kind
+
+@dataclass(slots=True)
 class Property:
     """
         Represents a single 'properties' field of a task definition
@@ -13,7 +33,11 @@ class Property:
 
     property_file: str
     expected_verdict: bool
+    # Derived from property_file, hence not saved in tasks.json
+    kind: PropertyKind = field(init=False, repr=False, compare=False)
 
     def __init__(self, property_file: str, expected_verdict: bool):
-        self.property_file = property_file
-        self.expected_verdict = expected_verdict
\ No newline at end of file
+        # The same few property files are shared by every task: keep one copy of each name
+        self.property_file = sys.intern(property_file)
+        self.expected_verdict = expected_verdict
+        self.kind = PropertyKind.of(property_file)
@@ -1,39 +1,53 @@
 # Standard library imports
-from typing import List, Optional
+import sys
+from typing import List, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
 # Project-local imports
-from cli.models.task_definition.fields.property import Property
+from cli.models.task_definition.fields.property import Property, PropertyKind
 
-@dataclass
+@dataclass(slots=True)
 class TaskDefinition:
     """
         Represents the definition of a task
     """
 
     file_name: str
-    path_to_definition: Path
-    input_file: Path
-    properties: List[Property]
+    path_to_definition: str
+    input_files: Tuple[str, ...]
+    properties: Tuple[Property, ...]
+    # SV-COMP categories (.set files) selecting the task
+    categories: Tuple[str, ...]
 
-    def __init__(self, file_name:str, path_to_definition: Path, input_file:Path, properties: List[Property]):
+    def __init__(self, file_name: str, path_to_definition: Path | str, input_files: Optional[List[str]] = None, properties: List[Property] = (), categories: List[str] = (), input_file: Optional[str] = None):
         self.file_name = file_name
-        self.path_to_definition = path_to_definition
-        self.input_file = input_file
-        self.properties = [
+        self.path_to_definition = str(path_to_definition)
+        # tasks.json files harvested before input_files was introduced hold a single space-separated input_file
+        files = input_files if input_files is not None else (input_file or "").split()
+        # Tasks of the same category share directories (e.g. ../common): keep one copy of each path
+        self.input_files = tuple(sys.intern(str(f)) for f in files)
+        self.properties = tuple(
             p if isinstance(p, Property) else Property(**p)
             for p in properties
-        ]
+        )
+        self.categories = tuple(sys.intern(c) for c in categories)
 
-    def are_assertions_expected(self) -> Optional[bool]:
+    @property
+    def input_file(self) -> str:
+        """
+            The input files as passed to LiSA, each one followed by a space
+        """
+        return "".join(f"{f} " for f in self.input_files)
+
+    def _expected_verdict(self, kind: PropertyKind) -> Optional[bool]:
         for prop in self.properties:
-            if "assert" in prop.property_file:
+            if prop.kind & kind:
                 return prop.expected_verdict
         return None
 
+    def are_assertions_expected(self) -> Optional[bool]:
+        return self._expected_verdict(PropertyKind.ASSERT)
+
     def are_runtime_exceptions_expected(self) -> Optional[bool]:
-        for prop in self.properties:
-            if "runtime-exception" in prop.property_file:
-                return prop.expected_verdict
-        return None
\ No newline at end of file
+        return self._expected_verdict(PropertyKind.RUNTIME_EXCEPTION)
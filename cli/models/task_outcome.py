@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class TaskOutcome(Enum):
+    """
+    Represents an enumeration of the ways a single LiSA analysis launched by 'analyse' can end
+    """
+
+    DONE = "done"
+    TIMEOUT = "timeout"
+    FAILED = "failed"
+    OOM = "oom"  # killed by the sandbox for exceeding its memory limit
+    CACHED = "cached"  # results restored from the analysis cache, LiSA was not launched
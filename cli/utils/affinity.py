@@ -0,0 +1,98 @@
+# Standard library imports
+import os
+import re
+from pathlib import Path
+from queue import Queue
+from typing import Optional
+
+# Location of the NUMA topology exposed by the kernel
+NUMA_NODES_DIR = Path("/sys/devices/system/node")
+
+def parse_cpu_list(cpu_list: str) -> list[int]:
+    """
+        Parses a kernel CPU list (e.g. "0-3,8,10-11") into the list of CPU ids it denotes
+    """
+
+    cpus: list[int] = []
+    for chunk in cpu_list.strip().split(","):
+        if not chunk:
+            continue
+        first, _, last = chunk.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+def format_cpu_list(cpus: list[int]) -> str:
+    """
+        Formats CPU ids back to the compact kernel notation (e.g. [0, 1, 2, 3, 8] -> "0-3,8")
+    """
+
+    ranges: list[tuple[int, int]] = []
+    for cpu in sorted(cpus):
+        if ranges and ranges[-1][1] == cpu - 1:
+            ranges[-1] = (ranges[-1][0], cpu)
+        else:
+            ranges.append((cpu, cpu))
+    return ",".join(f"{a}-{b}" if a != b else f"{a}" for a, b in ranges)
+
+def numa_nodes(available: list[int]) -> list[list[int]]:
+    """
+        Groups the available CPUs by NUMA node. Falls back to a single node when the topology is not exposed
+    """
+
+    nodes: list[list[int]] = []
+    if NUMA_NODES_DIR.exists():
+        node_dirs = [d for d in NUMA_NODES_DIR.iterdir() if re.fullmatch(r"node\d+", d.name)]
+        for node_dir in sorted(node_dirs, key=lambda d: int(d.name[4:])):
+            cpus = [c for c in parse_cpu_list((node_dir / "cpulist").read_text()) if c in available]
+            if cpus:
+                nodes.append(cpus)
+    return nodes or [available]
+
+def plan_cpu_slots(parallelism: int, numa: bool = False, cpus_per_slot: Optional[int] = None) -> list[list[int]]:
+    """
+        Splits the CPUs this process may run on into one fixed, disjoint core set per worker slot.
+        With 'numa', a core set never spans two NUMA nodes and consecutive slots alternate between nodes,
+        so that the parallel analyses are spread evenly across sockets.
+        When there are not enough CPUs, core sets are reused (oversubscription)
+    """
+
+    available = sorted(os.sched_getaffinity(0))
+    per_slot = cpus_per_slot or max(1, len(available) // parallelism)
+    groups = numa_nodes(available) if numa else [available]
+
+    chunks_per_group = [
+        [group[i:i + per_slot] for i in range(0, len(group) - per_slot + 1, per_slot)]
+        for group in groups
+    ]
+    chunks = [
+        group_chunks[i]
+        for i in range(max(map(len, chunks_per_group), default=0))
+        for group_chunks in chunks_per_group
+        if i < len(group_chunks)
+    ]
+    if not chunks:
+        # more CPUs per slot requested than a single node (or the machine) offers
+        chunks = [group for group in groups]
+
+    return [chunks[i % len(chunks)] for i in range(parallelism)]
+
+class CpuSlots:
+    """
+        Pool of worker slots, each bound to a fixed core set. A worker holds a slot for the whole duration
+        of an analysis, so that no two concurrent analyses share cores
+    """
+
+    def __init__(self, slots: list[list[int]]):
+        self.slots = slots
+        self.free: Queue[int] = Queue()
+        for i in range(len(slots)):
+            self.free.put(i)
+
+    def acquire(self) -> int:
+        return self.free.get()
+
+    def release(self, slot: int):
+        self.free.put(slot)
+
+    def cpus(self, slot: int) -> list[int]:
+        return self.slots[slot]
@@ -0,0 +1,91 @@
+# Standard library imports
+import json
+import time
+import hashlib
+import zipfile
+from pathlib import Path
+
+# Version of the bundle layout written by 'export-run'
+BUNDLE_FORMAT = 1
+
+# Lists every other member of a bundle together with its checksum
+MANIFEST_FILE = "manifest.json"
+
+# Written to the output directory by 'analyse': how the run was launched (LiSA command, LiSA build, timestamps)
+RUN_FILE = "run.json"
+
+class BundleError(Exception):
+    """
+        Raised for bundles that are not valid 'export-run' archives or whose contents do not match their manifest
+    """
+
+def write_bundle(bundle: Path, files: dict[str, Path]):
+    """
+        Writes the given files (archive name -> path on disk) to a compressed bundle with a checksummed manifest
+    """
+
+    manifest = {"format": BUNDLE_FORMAT, "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "files": {}}
+    bundle.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(bundle, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        for name, path in sorted(files.items()):
+            archive.write(path, name)
+            manifest["files"][name] = {"sha256": _sha256_file(path), "size": path.stat().st_size}
+        archive.writestr(MANIFEST_FILE, json.dumps(manifest, indent=4))
+
+def read_manifest(bundle: Path) -> dict:
+    if not zipfile.is_zipfile(bundle):
+        raise BundleError(f"{bundle} is not a run bundle")
+    with zipfile.ZipFile(bundle) as archive:
+        try:
+            manifest = json.loads(archive.read(MANIFEST_FILE))
+        except KeyError:
+            raise BundleError(f"{bundle} has no {MANIFEST_FILE}")
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise BundleError(f"{bundle} uses bundle format {manifest.get('format')}, expected {BUNDLE_FORMAT}")
+    return manifest
+
+def read_bundle_member(bundle: Path, name: str) -> bytes:
+    """
+        Reads a single file of the bundle, checking it against the manifest
+    """
+
+    entry = read_manifest(bundle)["files"].get(name)
+    if entry is None:
+        raise BundleError(f"{bundle} does not contain {name}")
+    with zipfile.ZipFile(bundle) as archive:
+        data = archive.read(name)
+    if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+        raise BundleError(f"Checksum mismatch for {name} in {bundle}")
+    return data
+
+def extract_bundle(bundle: Path, destination: Path) -> dict:
+    """
+        Extracts the bundle into destination once all of its files passed the checksum verification.
+        Returns the manifest
+    """
+
+    manifest = read_manifest(bundle)
+    with zipfile.ZipFile(bundle) as archive:
+        for name, entry in manifest["files"].items():
+            digest = hashlib.sha256()
+            try:
+                with archive.open(name) as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+            except KeyError:
+                raise BundleError(f"{bundle} does not contain {name}")
+            except (zipfile.BadZipFile, EOFError) as e:
+                raise BundleError(f"Cannot read {name} in {bundle}: {e}")
+            if digest.hexdigest() != entry["sha256"]:
+                raise BundleError(f"Checksum mismatch for {name} in {bundle}")
+        destination.mkdir(parents=True, exist_ok=True)
+        for name in manifest["files"]:
+            archive.extract(name, destination)
+    return manifest
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
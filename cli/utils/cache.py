@@ -0,0 +1,148 @@
+# Standard library imports
+import os
+import re
+import time
+import shutil
+import hashlib
+from pathlib import Path
+from threading import Lock
+
+# Default location of the analysis result cache, shared by all runs and output directories
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "sv-comp-helper"
+
+# Default size bound of the cache in GB
+DEFAULT_CACHE_SIZE = 5
+
+# JVM options that only affect how fast LiSA runs, not what it reports: they are left out of cache keys
+_NEUTRAL_OPTIONS = re.compile(r" -XX:(?:SharedArchiveFile|ActiveProcessorCount)=\S+")
+
+class ResultCache:
+    """
+        Content-addressed store of analysis results, shared across runs and benchmark pulls.
+        An entry holds the files LiSA wrote for a task (report.json or the error CSVs) and is keyed by
+        the contents of the task's input files, the contents of the LiSA classpath and the LiSA command line.
+        Entries live in <cache dir>/<key[:2]>/<key>; their modification time records the last use,
+        and the least recently used ones are evicted once the cache grows beyond 'max_bytes'
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, lisa_fingerprint: str):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lisa_fingerprint = lisa_fingerprint
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        # input trees are often shared among tasks (e.g. ../common): hash each of them once per run
+        self.tree_hashes: dict[str, str] = {}
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.entries: dict[str, tuple[float, int]] = {}
+        for entry in self.directory.glob("??/*"):
+            if entry.is_dir() and not entry.name.startswith("."):
+                self.entries[entry.name] = (entry.stat().st_mtime, _tree_size(entry))
+        self.size = sum(size for _, size in self.entries.values())
+        # the size bound may have been lowered since the last run
+        self.__evict()
+
+    def key(self, input_file: str, command: str, output_dir: str) -> str:
+        """
+            Cache key of an analysis. Input and output locations are abstracted away from the command line,
+            so that moving the benchmark or the output directory does not invalidate the cache
+        """
+
+        digest = hashlib.sha256()
+        digest.update(self.lisa_fingerprint.encode())
+        normalized = _NEUTRAL_OPTIONS.sub("", command.replace(output_dir, "<output>").replace(input_file, "<input>"))
+        digest.update(normalized.encode())
+        for path in input_file.split():
+            digest.update(self.__tree_hash(path).encode())
+        return digest.hexdigest()
+
+    def restore(self, key: str, destination: Path) -> bool:
+        """
+            Materializes the cached results into 'destination'. Returns whether the entry was found
+        """
+
+        entry = self.__entry_path(key)
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return False
+            now = time.time()
+            os.utime(entry, (now, now))
+            self.entries[key] = (now, self.entries[key][1])
+            self.hits += 1
+
+        shutil.rmtree(destination, ignore_errors=True)
+        shutil.copytree(entry, destination)
+        return True
+
+    def store(self, key: str, source: Path):
+        """
+            Adds the results in 'source' to the cache, then evicts least recently used entries if needed
+        """
+
+        if not source.is_dir():
+            return
+        entry = self.__entry_path(key)
+        staging = entry.parent / f".{key}.{os.getpid()}.{id(source)}"
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copytree(source, staging)
+        size = _tree_size(staging)
+
+        with self.lock:
+            if key in self.entries:
+                shutil.rmtree(staging, ignore_errors=True)
+                return
+            try:
+                os.replace(staging, entry)
+            except OSError:
+                # another process sharing the cache stored the same results first (the lock only covers this one)
+                shutil.rmtree(staging, ignore_errors=True)
+                if not entry.is_dir():
+                    raise
+            self.entries[key] = (time.time(), size)
+            self.size += size
+            self.__evict()
+
+    def summary(self) -> str:
+        """
+            One-line report of how the cache performed during the run
+        """
+
+        total = self.hits + self.misses
+        ratio = f" ({self.hits / total:.0%})" if total else ""
+        return f"Result cache: {self.hits} hits / {self.misses} misses{ratio}, {self.size / 1024 ** 2:.1f} MB in {self.directory}"
+
+    def __evict(self):
+        for key, (_, size) in sorted(self.entries.items(), key=lambda item: item[1][0]):
+            if self.size <= self.max_bytes:
+                break
+            shutil.rmtree(self.__entry_path(key), ignore_errors=True)
+            del self.entries[key]
+            self.size -= size
+
+    def __entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def __tree_hash(self, path: str) -> str:
+        with self.lock:
+            cached = self.tree_hashes.get(path)
+        if cached is not None:
+            return cached
+
+        digest = hashlib.sha256()
+        root = Path(path)
+        files = sorted(p for p in root.rglob("*") if p.is_file()) if root.is_dir() else [root]
+        for file in files:
+            digest.update(str(file.relative_to(root) if root.is_dir() else file.name).encode())
+            if file.exists():
+                digest.update(file.read_bytes())
+        value = digest.hexdigest()
+
+        with self.lock:
+            self.tree_hashes[path] = value
+        return value
+
+def _tree_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
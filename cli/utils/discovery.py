@@ -0,0 +1,139 @@
+# Standard library imports
+import os
+import re
+from pathlib import Path
+from typing import Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+# Directories listed at once by the discovery: listings are mostly waiting on the filesystem (e.g. over NFS)
+DISCOVERY_WORKERS = 8
+
+# Directories at the top of the benchmark tree that hold shared inputs, not task definitions
+SHARED_DIRS = {"common", "properties"}
+
+# Glob characters of the .set file patterns
+_WILDCARDS = re.compile(r"[*?\[]")
+
+def discover_task_files(
+    root: Path,
+    include: Optional[Iterable[str]] = None,
+    exclude: Optional[Iterable[str]] = None,
+    workers: int = DISCOVERY_WORKERS,
+) -> list[str]:
+    """
+        Paths of the task definitions (.yml files) under root (the 'java' directory of the benchmark), in the order
+        os.walk would list them. Only the categories (top directories) in 'include' (all, if not given) and not
+        in 'exclude' are searched. Directories that cannot hold task definitions are not descended into:
+        hidden ones, the shared inputs, the input directories of the tasks next to them (named after a task)
+        and Java source trees (directories with .java files). Directories are listed a level at a time
+        by 'workers' threads
+    """
+
+    include = set(include) if include is not None else None
+    exclude = set(exclude or ())
+
+    def searched(directory: str, name: str, tasks: set[str]) -> bool:
+        if name.startswith(".") or name in tasks:
+            return False
+        if directory == top:
+            return name not in SHARED_DIRS and name not in exclude and (include is None or name in include)
+        return True
+
+    def scan(directory: str) -> tuple[list[str], list[str]]:
+        definitions, directories, sources = [], [], False
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # DirEntry caches the type the listing returned: no stat per entry, as with os.walk
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            directories.append(entry.name)
+                    elif entry.name.endswith(".yml"):
+                        definitions.append(entry.path)
+                    elif entry.name.endswith(".java"):
+                        sources = True
+        except OSError:
+            return [], []
+        if sources:
+            return definitions, []
+        tasks = {os.path.basename(path)[:-len(".yml")] for path in definitions}
+        return definitions, [os.path.join(directory, name) for name in directories if searched(directory, name, tasks)]
+
+    top = os.fspath(root)
+    listings: dict[str, tuple[list[str], list[str]]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        level = [top]
+        while level:
+            scanned = list(pool.map(scan, level))
+            listings.update(zip(level, scanned))
+            level = [subdirectory for _, subdirectories in scanned for subdirectory in subdirectories]
+
+    # depth first, as os.walk: the definitions of a directory, then those of each subdirectory in turn
+    paths: list[str] = []
+    pending = [top]
+    while pending:
+        definitions, subdirectories = listings[pending.pop()]
+        paths.extend(definitions)
+        pending.extend(reversed(subdirectories))
+    return paths
+
+def glob_to_regex(pattern: str) -> str:
+    """
+        Translates a glob pattern of a .set file into a regular expression: '*' and '?' do not cross directories
+        ('*' is '[^/]*'), '[...]' and '[!...]' match a character among (not among) the given ones
+    """
+
+    regex, i = [], 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            members = pattern[i + 1:end]
+            negated = members.startswith("!")
+            members = (members[1:] if negated else members).replace("\\", "\\\\")
+            regex.append(f"[{'^' if negated else ''}{members}]")
+            i = end
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return "".join(regex)
+
+class TaskSets:
+    """
+        SV-COMP categories, each defined by a .set file of glob patterns (one per line, '#' for comments)
+        matching task definitions by their path relative to the 'java' directory of the benchmark,
+        e.g. "jbmc-regression/*.yml". The category is the name of the .set file (e.g. ReachSafety-Java).
+        All the patterns are compiled at once, into one expression telling whether a definition is selected at all
+        and one expression per category
+    """
+
+    def __init__(self, set_files: Iterable[Path]):
+        self.patterns: dict[str, re.Pattern] = {}
+        self.globs: list[str] = []
+        for set_file in set_files:
+            globs = [line.strip() for line in Path(set_file).read_text().splitlines()]
+            globs = [glob.removeprefix("./") for glob in globs if glob and not glob.startswith("#")]
+            self.patterns[Path(set_file).stem] = re.compile("|".join(f"(?:{glob_to_regex(glob)})" for glob in globs) or "(?!)")
+            self.globs += globs
+        self.any = re.compile("|".join(f"(?:{glob_to_regex(glob)})" for glob in self.globs) or "(?!)")
+
+    def categories(self, path: str) -> tuple[str, ...]:
+        """
+            Categories of a task definition, by its path relative to the 'java' directory (none if no set selects it)
+        """
+
+        if not self.any.fullmatch(path):
+            return ()
+        return tuple(name for name, pattern in self.patterns.items() if pattern.fullmatch(path))
+
+    def roots(self) -> Optional[set[str]]:
+        """
+            Top directories the patterns can match in (None when a pattern starts with a wildcard)
+        """
+
+        roots = {glob.split("/")[0] for glob in self.globs}
+        return None if any(_WILDCARDS.search(root) for root in roots) else roots
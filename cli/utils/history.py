@@ -0,0 +1,183 @@
+# Standard library imports
+import sqlite3
+from pathlib import Path
+from typing import Optional
+
+# Default location of the run history, shared by all output directories
+DEFAULT_HISTORY_DB = Path.home() / ".local" / "share" / "sv-comp-helper" / "history.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL,
+    configuration TEXT NOT NULL DEFAULT '',
+    started TEXT NOT NULL,
+    ingested TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%S', 'now')),
+    lisa_sha256 TEXT,
+    absolute INTEGER NOT NULL,
+    normalized INTEGER,
+    UNIQUE (label, configuration)
+);
+CREATE INDEX IF NOT EXISTS runs_by_start ON runs (configuration, started, id);
+
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    test_case TEXT NOT NULL,
+    task TEXT NOT NULL,
+    property TEXT NOT NULL,
+    expected TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    category TEXT,
+    wall_time REAL,
+    PRIMARY KEY (run_id, test_case)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_task ON results (task, run_id);
+CREATE INDEX IF NOT EXISTS results_by_test_case ON results (test_case, run_id);
+"""
+
+# Verdicts that stand for an error of the analysis rather than an answer, by error category
+ERROR_CATEGORIES = {
+    "UNKNOWN (parsing)": "parsing",
+    "UNKNOWN (frontend)": "frontend",
+    "UNKNOWN (analysis)": "analysis",
+    "TIMEOUT": "timeout",
+    "OOM": "oom",
+}
+
+class HistoryDatabase:
+    """
+        SQLite database of scored runs: one row per run (and LiSA configuration, for matrix runs),
+        one row per SV-COMP test case (task and property) of each run.
+        Runs are ordered by start time; every query is answered from the (task, run) and (test case, run) indexes
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def ingest(self, label: str, configuration: str, started: str, lisa_sha256: Optional[str], absolute: int, normalized: Optional[int], rows: list[tuple]) -> int:
+        """
+            Records a run, replacing any run previously ingested with the same label and configuration.
+            Rows are (test case, verdict, score, wall time) tuples, as in svcomp.csv
+        """
+
+        with self.connection:
+            self.connection.execute("DELETE FROM runs WHERE label = ? AND configuration = ?", (label, configuration))
+            run_id = self.connection.execute(
+                "INSERT INTO runs (label, configuration, started, lisa_sha256, absolute, normalized) VALUES (?, ?, ?, ?, ?, ?)",
+                (label, configuration, started, lisa_sha256, absolute, normalized),
+            ).lastrowid
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO results (run_id, test_case, task, property, expected, verdict, score, category, wall_time)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, test_case, *test_case.split("|", 2), verdict, score, ERROR_CATEGORIES.get(verdict), wall_time)
+                    for test_case, verdict, score, wall_time in rows
+                ],
+            )
+        return run_id
+
+    def runs(self, configuration: str = "", last: Optional[int] = None) -> list[sqlite3.Row]:
+        """
+            Runs from the oldest to the most recent (only the 'last' most recent ones, if given)
+        """
+
+        rows = self.connection.execute(
+            "SELECT * FROM runs WHERE configuration = ? ORDER BY started DESC, id DESC LIMIT ?",
+            (configuration, last if last is not None else -1),
+        ).fetchall()
+        return rows[::-1]
+
+    def run(self, label: str, configuration: str = "") -> Optional[sqlite3.Row]:
+        return self.connection.execute(
+            "SELECT * FROM runs WHERE label = ? AND configuration = ?", (label, configuration)
+        ).fetchone()
+
+    def task_history(self, task: str, configuration: str = "") -> list[sqlite3.Row]:
+        """
+            Results of a task (all of its properties) or of a single test case ("<task>|<property>|<expected>"), run by run
+        """
+
+        column = "test_case" if "|" in task else "task"
+        return self.connection.execute(
+            f"SELECT runs.id AS run_id, runs.label, runs.started, runs.lisa_sha256, results.test_case, results.verdict, results.score, results.wall_time"
+            f" FROM results JOIN runs ON runs.id = results.run_id"
+            f" WHERE results.{column} = ? AND runs.configuration = ?"
+            f" ORDER BY runs.started, runs.id, results.test_case",
+            (task, configuration),
+        ).fetchall()
+
+    def flaky(self, configuration: str = "", last: Optional[int] = None, min_flips: int = 1, limit: int = 20) -> list[sqlite3.Row]:
+        """
+            Test cases whose verdict changed between consecutive runs, by number of flips
+        """
+
+        return self.connection.execute(
+            """
+            WITH recent AS (
+                SELECT id FROM runs WHERE configuration = :configuration ORDER BY started DESC, id DESC LIMIT :last
+            ), ordered AS (
+                SELECT results.test_case, results.verdict,
+                       LAG(results.verdict) OVER (PARTITION BY results.test_case ORDER BY runs.started, runs.id) AS previous
+                FROM results JOIN runs ON runs.id = results.run_id
+                WHERE results.run_id IN recent
+            )
+            SELECT test_case,
+                   SUM(verdict != previous) AS flips,
+                   COUNT(*) + 1 AS runs,
+                   GROUP_CONCAT(DISTINCT verdict) AS verdicts
+            FROM ordered
+            WHERE previous IS NOT NULL
+            GROUP BY test_case
+            HAVING flips >= :min_flips
+            ORDER BY flips DESC, test_case
+            LIMIT :limit
+            """,
+            {"configuration": configuration, "last": last if last is not None else -1, "min_flips": min_flips, "limit": limit},
+        ).fetchall()
+
+    def regressions(self, base_run: int, head_run: int, limit: int = 20) -> list[sqlite3.Row]:
+        """
+            Test cases scoring lower in head_run than in base_run, worst first
+        """
+
+        return self.connection.execute(
+            """
+            SELECT head.test_case, base.verdict AS base_verdict, head.verdict AS head_verdict,
+                   base.score AS base_score, head.score AS head_score, head.score - base.score AS delta
+            FROM results AS head JOIN results AS base ON base.test_case = head.test_case
+            WHERE head.run_id = ? AND base.run_id = ? AND head.score < base.score
+            ORDER BY delta, head.test_case
+            LIMIT ?
+            """,
+            (head_run, base_run, limit),
+        ).fetchall()
+
+    def task_timings(self, configuration: str = "", last: Optional[int] = None) -> list[sqlite3.Row]:
+        """
+            Wall time of each task in each of the 'last' most recent runs, and whether it timed out.
+            Only answers and timeouts have a wall time: errors (e.g. a parsing failure within seconds) say nothing
+            about how long the analysis of the task takes
+        """
+
+        return self.connection.execute(
+            """
+            WITH recent AS (
+                SELECT id FROM runs WHERE configuration = :configuration ORDER BY started DESC, id DESC LIMIT :last
+            )
+            SELECT task, run_id,
+                   MAX(CASE WHEN category IS NULL OR category = 'timeout' THEN wall_time END) AS wall_time,
+                   MAX(verdict = 'TIMEOUT') AS timed_out
+            FROM results
+            WHERE run_id IN recent
+            GROUP BY task, run_id
+            """,
+            {"configuration": configuration, "last": last if last is not None else -1},
+        ).fetchall()
+
+    def close(self):
+        self.connection.close()
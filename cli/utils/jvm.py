@@ -0,0 +1,65 @@
+# Standard library imports
+import os
+import hashlib
+import subprocess
+from pathlib import Path
+
+def classpath_entries(classpath) -> list[Path]:
+    """
+        Expands a Java classpath (as configured in 'path_to_lisa_instance') into the files and directories
+        it denotes: entries are ':'-separated, may be quoted and may end with the '*' jar wildcard
+    """
+
+    entries: list[Path] = []
+    for entry in str(classpath).strip('"').split(os.pathsep):
+        if not entry:
+            continue
+        if entry.endswith("*"):
+            directory = Path(entry[:-1] or ".")
+            if directory.is_dir():
+                entries.extend(sorted(p for p in directory.iterdir() if p.suffix.lower() == ".jar"))
+        else:
+            entries.append(Path(entry))
+    return entries
+
+def classpath_fingerprint(classpath, content: bool = False) -> str:
+    """
+        Hashes the classpath so that derived artifacts (e.g. CDS archives) can be invalidated when LiSA changes.
+        By default, names, sizes and modification times are hashed; with 'content', the bytes of every file are
+    """
+
+    digest = hashlib.sha256()
+    for entry in classpath_entries(classpath):
+        files = sorted(p for p in entry.rglob("*") if p.is_file()) if entry.is_dir() else [entry]
+        for file in files:
+            digest.update(str(file).encode())
+            if not file.exists():
+                continue
+            if content:
+                with file.open("rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+            else:
+                stat = file.stat()
+                digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+def cds_archive_path(archive_dir: Path, classpath, profile_name: str, jvm_options: list[str]) -> Path:
+    """
+        Location of the AppCDS archive for the given classpath and JVM profile. The JVM options the archive is
+        generated with (those of the profile and -Xmx) are part of its name: the JVM refuses, or ignores,
+        archives dumped with another garbage collector or heap layout
+    """
+
+    options = hashlib.sha256(" ".join(jvm_options).encode()).hexdigest()[:8]
+    return archive_dir / f"jlisa-{profile_name}-{classpath_fingerprint(classpath)[:16]}-{options}.jsa"
+
+def create_cds_archive(training_command: str, archive: Path) -> bool:
+    """
+        Runs a training analysis that dumps the classes it loads into a dynamic AppCDS archive
+        (the command is expected to carry -XX:ArchiveClassesAtExit). Returns whether the archive was created
+    """
+
+    archive.parent.mkdir(parents=True, exist_ok=True)
+    subprocess.run(training_command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return archive.exists()
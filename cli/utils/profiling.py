@@ -0,0 +1,128 @@
+# Standard library imports
+import io
+import os
+import sys
+import time
+import atexit
+import pstats
+import cProfile
+import tracemalloc
+import contextlib
+from enum import Enum
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Optional
+
+# Third-party imports
+import rich
+from rich.table import Table
+from rich.console import Console
+
+# Timing spans are collected only when this environment variable is set (e.g. SV_COMP_SPANS=1)
+SPANS_ENV = "SV_COMP_SPANS"
+
+# Output directory that replaces the configured one for the running command (e.g. analyse --outdir), see redirect_profile
+_redirected_dir: Optional[Path] = None
+
+class ProfileMode(str, Enum):
+    CPROFILE = "cprofile"
+    TRACEMALLOC = "tracemalloc"
+
+def redirect_profile(output_dir: Path):
+    """
+        Saves the profile of the running command to output_dir, in place of the directory given to start_profiling:
+        for commands that take their own output directory
+    """
+    global _redirected_dir
+    _redirected_dir = output_dir
+
+def start_profiling(mode: ProfileMode, output_dir: Path, command: str, top: int = 30) -> Callable[[], None]:
+    """
+        Starts profiling the current process. Returns the function that stops it, saves the dump
+        (profile-<command>.prof for cProfile, memory-<command>.tracemalloc for tracemalloc) and a summary
+        of the top entries (.txt) to output_dir (or to the directory the command redirected it to), and prints the summary
+    """
+
+    if mode == ProfileMode.CPROFILE:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def stop():
+            profiler.disable()
+            directory = __profile_dir(output_dir)
+            profiler.dump_stats(directory / f"profile-{command}.prof")
+            summary = io.StringIO()
+            pstats.Stats(profiler, stream=summary).strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+            __save_summary(directory / f"profile-{command}.txt", summary.getvalue())
+        return stop
+
+    tracemalloc.start(25)
+
+    def stop():
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        directory = __profile_dir(output_dir)
+        snapshot.dump(str(directory / f"memory-{command}.tracemalloc"))
+        snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        lines = [f"Peak traced memory: {peak / 1024 ** 2:.1f} MB, still allocated at the end: {current / 1024 ** 2:.1f} MB", ""]
+        lines += [str(statistic) for statistic in snapshot.statistics("lineno")[:top]]
+        __save_summary(directory / f"memory-{command}.txt", "\n".join(lines) + "\n")
+    return stop
+
+def __profile_dir(output_dir: Path) -> Path:
+    directory = _redirected_dir or output_dir
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+def __save_summary(path: Path, summary: str):
+    path.write_text(summary)
+    # stdout may carry the command output (e.g. piped CSV): keep the summary apart
+    print(summary, file=sys.stderr)
+    rich.print(f"[green]Profile saved to[/green] [cyan]{path.with_suffix('')}.*[/cyan]", file=sys.stderr)
+
+class _Span:
+    """
+        Times the enclosed block and adds it to the totals of its name
+    """
+
+    totals: dict[str, list] = {}
+    lock = Lock()
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_):
+        elapsed = time.perf_counter() - self.start
+        with _Span.lock:
+            total = _Span.totals.setdefault(self.name, [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += elapsed
+            total[2] = max(total[2], elapsed)
+
+def _print_spans():
+    if not _Span.totals:
+        return
+    table = Table(title="Timing spans")
+    for column in ("Span", "Count", "Total (s)", "Mean (ms)", "Max (ms)"):
+        table.add_column(column, justify="left" if column == "Span" else "right")
+    for name, (count, total, longest) in sorted(_Span.totals.items(), key=lambda item: -item[1][1]):
+        table.add_row(name, str(count), f"{total:.3f}", f"{1000 * total / count:.3f}", f"{1000 * longest:.3f}")
+    Console(stderr=True).print(table)
+
+_NO_SPAN = contextlib.nullcontext()
+
+if os.environ.get(SPANS_ENV):
+    span = _Span
+    atexit.register(_print_spans)
+else:
+    def span(_name: str) -> contextlib.nullcontext:
+        """
+            Times the enclosed block under the given name, when SV_COMP_SPANS is set (a shared no-op otherwise):
+            totals per name are printed to stderr when the process exits
+        """
+        return _NO_SPAN
@@ -0,0 +1,245 @@
+# Standard library imports
+import os
+import time
+from collections import deque
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import rich
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+
+# Project-local imports
+from cli.models.task_outcome import TaskOutcome
+
+# Number of most recently finished tasks the rolling mean task time is computed over
+ROLLING_WINDOW = 50
+
+# Minimal interval (in seconds) between two consecutive writes of the metrics file
+METRICS_FILE_INTERVAL = 1.0
+
+class AnalysisProgress:
+    """
+        Keeps track of the progress of an 'analyse' run (throughput, ETA, busy workers, outcome counters)
+        and reports it either as a live rich.progress display or as plain log lines (e.g., for CI)
+    """
+
+    def __init__(self, total_tasks: int, parallelism: int, plain: bool = False, metrics_file: Optional[Path] = None):
+        self.total_tasks = total_tasks
+        self.parallelism = parallelism
+        self.plain = plain or not rich.get_console().is_terminal
+        self.metrics_file = metrics_file
+
+        self.lock = Lock()
+        self.metrics_lock = Lock()
+        self.start_time = time.time()
+        self.active = 0
+        self.counters = {outcome: 0 for outcome in TaskOutcome}
+        self.durations = deque(maxlen=ROLLING_WINDOW)
+        self.last_metrics_write = 0.0
+        self.metrics_failed = False
+        # rewrites the metrics file while no task starts or finishes (elapsed time and ETA keep changing)
+        self.metrics_stop = Event()
+        self.metrics_writer: Optional[Thread] = None
+        self.server: Optional[ThreadingHTTPServer] = None
+
+        self.display: Optional[Progress] = None
+        self.display_task = None
+
+    def __enter__(self) -> 'AnalysisProgress':
+        self.start_time = time.time()
+        if not self.plain:
+            self.display = Progress(
+                SpinnerColumn(),
+                TextColumn("[bold blue]Analysing"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                TextColumn("{task.fields[stats]}"),
+                TimeElapsedColumn(),
+            )
+            self.display_task = self.display.add_task("analyse", total=self.total_tasks, stats="")
+            self.display.start()
+        if self.metrics_file:
+            self.metrics_stop.clear()
+            self.metrics_writer = Thread(target=self.__write_metrics_periodically, daemon=True)
+            self.metrics_writer.start()
+        return self
+
+    def __exit__(self, *_):
+        if self.metrics_writer:
+            self.metrics_stop.set()
+            self.metrics_writer.join()
+        self.__refresh(force_metrics=True)
+        if self.display:
+            self.display.stop()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    @property
+    def finished(self) -> int:
+        return sum(self.counters.values())
+
+    def log(self, message: str, verbose: bool = False):
+        """
+            Prints a log line. Verbose lines (e.g., the command of each task) are shown in plain mode only,
+            as the live display already conveys them
+        """
+
+        if self.plain or not verbose:
+            rich.print(message)
+
+    def extend(self, tasks: int):
+        """
+            Accounts for analyses scheduled after the run started (e.g., further portfolio stages)
+        """
+
+        with self.lock:
+            self.total_tasks += tasks
+        if self.display:
+            self.display.update(self.display_task, total=self.total_tasks)
+
+    def task_started(self):
+        with self.lock:
+            self.active += 1
+        self.__refresh()
+
+    def task_requeued(self):
+        """
+            Accounts for an analysis that started but will run again from scratch (e.g., a batched one whose JVM crashed)
+        """
+
+        with self.lock:
+            self.active -= 1
+        self.__refresh()
+
+    def task_finished(self, outcome: TaskOutcome, duration: float):
+        with self.lock:
+            self.active -= 1
+            self.counters[outcome] += 1
+            self.durations.append(duration)
+        self.__refresh()
+
+    def snapshot(self) -> dict:
+        """
+            Returns a consistent view of all the counters tracked so far
+        """
+
+        with self.lock:
+            elapsed = time.time() - self.start_time
+            finished = self.finished
+            mean = sum(self.durations) / len(self.durations) if self.durations else 0.0
+            remaining = self.total_tasks - finished
+            workers = max(min(self.parallelism, remaining), 1)
+            return {
+                "total": self.total_tasks,
+                "finished": finished,
+                "active": self.active,
+                "elapsed": elapsed,
+                "throughput": finished / elapsed if elapsed > 0 else 0.0,
+                "mean_task_time": mean,
+                "eta": remaining * mean / workers if mean else None,
+                **{outcome.value: count for outcome, count in self.counters.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """
+            Renders the counters in the Prometheus text exposition format
+        """
+
+        s = self.snapshot()
+        lines = [
+            "# HELP svh_tasks_total Number of tasks scheduled for analysis",
+            "# TYPE svh_tasks_total gauge",
+            f"svh_tasks_total {s['total']}",
+            "# HELP svh_tasks_finished_total Number of finished tasks by outcome",
+            "# TYPE svh_tasks_finished_total counter",
+            *[f'svh_tasks_finished_total{{outcome="{o.value}"}} {s[o.value]}' for o in TaskOutcome],
+            "# HELP svh_active_workers Number of analyses currently running",
+            "# TYPE svh_active_workers gauge",
+            f"svh_active_workers {s['active']}",
+            "# HELP svh_throughput_tasks_per_second Finished tasks per second since the run started",
+            "# TYPE svh_throughput_tasks_per_second gauge",
+            f"svh_throughput_tasks_per_second {s['throughput']:.6f}",
+            "# HELP svh_task_duration_seconds_mean Rolling mean of the task duration",
+            "# TYPE svh_task_duration_seconds_mean gauge",
+            f"svh_task_duration_seconds_mean {s['mean_task_time']:.6f}",
+            "# HELP svh_eta_seconds Estimated time until all tasks are finished",
+            "# TYPE svh_eta_seconds gauge",
+            f"svh_eta_seconds {s['eta'] if s['eta'] is not None else 'NaN'}",
+            "# HELP svh_elapsed_seconds Time elapsed since the run started",
+            "# TYPE svh_elapsed_seconds gauge",
+            f"svh_elapsed_seconds {s['elapsed']:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def serve_metrics(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+            Exposes the Prometheus metrics over HTTP on the given address and port (served from a daemon thread until the run ends)
+        """
+
+        progress = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = progress.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        # shut down when the run ends
+        self.server = server
+        return server
+
+    def __refresh(self, force_metrics: bool = False):
+        if self.display:
+            s = self.snapshot()
+            eta = time.strftime('%H:%M:%S', time.gmtime(s["eta"])) if s["eta"] is not None else "--:--:--"
+            stats = (
+                f"[cyan]{s['throughput']:.2f} tasks/s[/cyan] "
+                f"mean [cyan]{s['mean_task_time']:.1f}s[/cyan] "
+                f"ETA [cyan]{eta}[/cyan] "
+                f"workers [blue]{s['active']}/{self.parallelism}[/blue] "
+                f"[green]{s['done']} done[/green] "
+                f"[cyan]{s['cached']} cached[/cyan] "
+                f"[yellow]{s['timeout']} timeout[/yellow] "
+                f"[red]{s['failed']} failed[/red] "
+                f"[magenta]{s['oom']} OOM[/magenta]"
+            )
+            self.display.update(self.display_task, completed=s["finished"], stats=stats)
+
+        if self.metrics_file:
+            self.__write_metrics(force_metrics)
+
+    def __write_metrics_periodically(self):
+        while not self.metrics_stop.wait(METRICS_FILE_INTERVAL):
+            self.__write_metrics()
+
+    def __write_metrics(self, force: bool = False):
+        with self.metrics_lock:
+            now = time.time()
+            if not force and now - self.last_metrics_write < METRICS_FILE_INTERVAL:
+                return
+            self.last_metrics_write = now
+            tmp = self.metrics_file.with_name(f".{self.metrics_file.name}.{os.getpid()}.tmp")
+            try:
+                tmp.write_text(self.to_prometheus())
+                os.replace(tmp, self.metrics_file)
+            except OSError as e:
+                # metrics are a side channel: a full disk or an unwritable path must not stop the analyses
+                if not self.metrics_failed:
+                    self.metrics_failed = True
+                    rich.print(f"[bold yellow]Cannot write the metrics file {self.metrics_file}: {e}[/bold yellow]")
@@ -0,0 +1,132 @@
+# Standard library imports
+import os
+import zlib
+import shutil
+import sqlite3
+from abc import ABC, abstractmethod
+from pathlib import Path
+from threading import Lock
+
+# Packed results written by 'analyse --pack', next to (instead of) the results directory
+PACKED_RESULTS_FILE = "results.sqlite"
+
+class ResultsStore(ABC):
+    """
+        Read access to the outputs LiSA produced for each task, wherever they are stored.
+        Tasks are addressed by their path relative to the results directory
+        (e.g. "Ackermann01.yml", or "intervals/Ackermann01.yml" in matrix runs)
+    """
+
+    @abstractmethod
+    def tasks(self, prefix: str = "") -> list[str]:
+        """
+            Names of the tasks with results directly under 'prefix' (a "<configuration>/" or the empty string)
+        """
+
+    @abstractmethod
+    def files(self, task: str) -> list[str]:
+        pass
+
+    @abstractmethod
+    def read(self, task: str, file: str) -> bytes:
+        pass
+
+    def close(self):
+        pass
+
+class DirectoryStore(ResultsStore):
+    """
+        Results as LiSA writes them: one directory per task
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def tasks(self, prefix: str = "") -> list[str]:
+        directory = self.root / prefix
+        if not directory.is_dir():
+            return []
+        return [entry.name for entry in os.scandir(directory) if entry.is_dir()]
+
+    def files(self, task: str) -> list[str]:
+        directory = self.root / task
+        if not directory.is_dir():
+            return []
+        return [entry.name for entry in os.scandir(directory) if entry.is_file()]
+
+    def read(self, task: str, file: str) -> bytes:
+        return (self.root / task / file).read_bytes()
+
+class SqliteStore(ResultsStore):
+    """
+        Results packed into a single SQLite database, one zlib-compressed blob per file.
+        Any (task, file) pair is read without unpacking the rest, and tasks are appended as they finish:
+        a compressed tar would need a full scan (or a side index) for every lookup
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " task TEXT NOT NULL,"
+            " file TEXT NOT NULL,"
+            " data BLOB NOT NULL,"
+            " PRIMARY KEY (task, file))"
+        )
+        self.connection.commit()
+
+    def pack(self, task: str, directory: Path, remove: bool = True):
+        """
+            Moves (or, without 'remove', copies) the files of a task results directory into the store
+        """
+
+        if not directory.is_dir():
+            return
+        rows = [
+            (task, entry.name, zlib.compress(Path(entry.path).read_bytes()))
+            for entry in os.scandir(directory)
+            if entry.is_file()
+        ]
+        with self.lock:
+            self.connection.execute("DELETE FROM results WHERE task = ?", (task,))
+            self.connection.executemany("INSERT INTO results (task, file, data) VALUES (?, ?, ?)", rows)
+            self.connection.commit()
+        if remove:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def tasks(self, prefix: str = "") -> list[str]:
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT DISTINCT task FROM results WHERE substr(task, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+        names = [task[len(prefix):] for (task,) in rows]
+        return [name for name in names if "/" not in name]
+
+    def files(self, task: str) -> list[str]:
+        with self.lock:
+            rows = self.connection.execute("SELECT file FROM results WHERE task = ?", (task,)).fetchall()
+        return [file for (file,) in rows]
+
+    def read(self, task: str, file: str) -> bytes:
+        with self.lock:
+            row = self.connection.execute("SELECT data FROM results WHERE task = ? AND file = ?", (task, file)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{task}/{file}")
+        return zlib.decompress(row[0])
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+def open_results_store(output_dir: Path) -> ResultsStore:
+    """
+        Opens the results of the last 'analyse' run in output_dir, packed or not
+    """
+
+    packed = output_dir / PACKED_RESULTS_FILE
+    if packed.exists():
+        return SqliteStore(packed)
+    return DirectoryStore(output_dir / "results")
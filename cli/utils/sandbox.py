@@ -0,0 +1,224 @@
+# Standard library imports
+import os
+import time
+import resource
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+from dataclasses import dataclass
+
+# Location where the unified (v2) cgroup hierarchy is expected to be mounted
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# Controllers a per-task cgroup needs to enforce the limits
+CGROUP_CONTROLLERS = ("memory", "cpu", "pids")
+
+# Scheduling period used to express the CPU quota in cpu.max (in microseconds)
+CPU_PERIOD_USEC = 100_000
+
+class SandboxMode(str, Enum):
+    """
+        Represents an enumeration of the ways 'analyse' can confine each LiSA process
+    """
+
+    NONE = "none"       # no limits besides -Xmx
+    AUTO = "auto"       # cgroup v2 when writable, setrlimit otherwise
+    CGROUP = "cgroup"   # cgroup v2 only
+    RLIMIT = "rlimit"   # setrlimit only
+
+@dataclass
+class SandboxLimits:
+    """
+        Hard limits applied to every single analysis
+    """
+
+    memory_bytes: int
+    cpu_cores: Optional[float]
+    pids: int
+    timeout: int
+
+@dataclass
+class ResourceUsage:
+    """
+        Resources consumed by a single analysis, as read back from its sandbox.
+        Values are None when the sandbox cannot measure them (e.g., setrlimit fallback)
+    """
+
+    memory_peak: Optional[int] = None
+    cpu_usage_usec: Optional[int] = None
+    cpu_user_usec: Optional[int] = None
+    cpu_system_usec: Optional[int] = None
+    oom_killed: bool = False
+
+class Sandbox:
+    """
+        No-op sandbox: the process runs unconfined
+    """
+
+    def enter(self, name: str) -> 'SandboxSlot':
+        return SandboxSlot()
+
+    def close(self):
+        pass
+
+class SandboxSlot:
+    """
+        The confinement of a single analysis. 'preexec' runs in the forked child right before exec,
+        'release' runs in the parent once the child has terminated
+    """
+
+    def preexec(self):
+        pass
+
+    def kill(self):
+        pass
+
+    def release(self) -> ResourceUsage:
+        return ResourceUsage()
+
+class RlimitSandbox(Sandbox):
+    """
+        Confines each analysis with setrlimit. RLIMIT_DATA bounds the writable private memory (heap, metaspace,
+        malloc arenas) while leaving the JVM free to reserve address space; RLIMIT_CPU bounds the CPU seconds
+        to what the CPU limit allows within the timeout. Process counts are left alone, as RLIMIT_NPROC is
+        accounted per user and would be shared among all the parallel analyses
+    """
+
+    def __init__(self, limits: SandboxLimits):
+        self.limits = limits
+
+    def enter(self, name: str) -> SandboxSlot:
+        return RlimitSlot(self.limits)
+
+class RlimitSlot(SandboxSlot):
+    def __init__(self, limits: SandboxLimits):
+        self.limits = limits
+
+    def preexec(self):
+        resource.setrlimit(resource.RLIMIT_DATA, (self.limits.memory_bytes, self.limits.memory_bytes))
+        if self.limits.cpu_cores:
+            cpu_seconds = int(self.limits.cpu_cores * self.limits.timeout) + 1
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+
+class CgroupSandbox(Sandbox):
+    """
+        Places each analysis in its own cgroup v2 with memory.max, cpu.max and pids.max set.
+        Task cgroups live under a per-run cgroup created inside the parent cgroup (by default the one
+        this process belongs to). Following the cgroup v2 delegation rules, if the parent still holds
+        processes, this process is first moved into a leaf 'svh-supervisor' cgroup
+    """
+
+    def __init__(self, limits: SandboxLimits, parent: Optional[Path] = None):
+        if not (CGROUP_ROOT / "cgroup.controllers").exists():
+            raise OSError("cgroup v2 hierarchy is not mounted")
+
+        self.limits = limits
+        self.parent = parent or _own_cgroup()
+        self.__enable_controllers(self.parent, move_self=parent is None)
+
+        self.base = self.parent / f"svh-analyse-{os.getpid()}"
+        self.base.mkdir(exist_ok=True)
+        self.__enable_controllers(self.base, move_self=False)
+
+    def enter(self, name: str) -> SandboxSlot:
+        path = self.base / name
+        path.mkdir(exist_ok=True)
+        (path / "memory.max").write_text(str(self.limits.memory_bytes))
+        if (path / "memory.swap.max").exists():
+            (path / "memory.swap.max").write_text("0")
+        if self.limits.cpu_cores:
+            (path / "cpu.max").write_text(f"{int(self.limits.cpu_cores * CPU_PERIOD_USEC)} {CPU_PERIOD_USEC}")
+        (path / "pids.max").write_text(str(self.limits.pids))
+        return CgroupSlot(path)
+
+    def close(self):
+        try:
+            self.base.rmdir()
+        except OSError:
+            pass
+
+    def __enable_controllers(self, cgroup: Path, move_self: bool):
+        enabled = (cgroup / "cgroup.subtree_control").read_text().split()
+        missing = [c for c in CGROUP_CONTROLLERS if c not in enabled]
+        if not missing:
+            return
+
+        request = " ".join(f"+{c}" for c in missing)
+        try:
+            (cgroup / "cgroup.subtree_control").write_text(request)
+        except OSError:
+            if not move_self:
+                raise
+            # 'no internal processes' rule: controllers can only be delegated from a cgroup without processes
+            supervisor = cgroup / "svh-supervisor"
+            supervisor.mkdir(exist_ok=True)
+            (supervisor / "cgroup.procs").write_text(str(os.getpid()))
+            (cgroup / "cgroup.subtree_control").write_text(request)
+
+class CgroupSlot(SandboxSlot):
+    def __init__(self, path: Path):
+        self.path = path
+
+    def preexec(self):
+        # "0" stands for the writing process, i.e., the freshly forked child
+        with open(self.path / "cgroup.procs", "w") as f:
+            f.write("0")
+
+    def kill(self):
+        kill_file = self.path / "cgroup.kill"
+        if kill_file.exists():
+            kill_file.write_text("1")
+
+    def release(self) -> ResourceUsage:
+        usage = ResourceUsage()
+
+        peak = self.path / "memory.peak"
+        if peak.exists():
+            usage.memory_peak = int(peak.read_text())
+
+        cpu_stat = _read_flat_keyed(self.path / "cpu.stat")
+        usage.cpu_usage_usec = cpu_stat.get("usage_usec")
+        usage.cpu_user_usec = cpu_stat.get("user_usec")
+        usage.cpu_system_usec = cpu_stat.get("system_usec")
+        usage.oom_killed = _read_flat_keyed(self.path / "memory.events").get("oom_kill", 0) > 0
+
+        # leftover processes (e.g., orphaned JVM threads) keep the cgroup busy for a short while
+        self.kill()
+        for _ in range(50):
+            try:
+                self.path.rmdir()
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        return usage
+
+def create_sandbox(mode: SandboxMode, limits: SandboxLimits, cgroup_parent: Optional[Path] = None) -> Sandbox:
+    """
+        Builds the sandbox for the requested mode. In 'auto' mode, cgroups are preferred and setrlimit is
+        used whenever the cgroup hierarchy is not writable
+    """
+
+    if mode == SandboxMode.NONE:
+        return Sandbox()
+    if mode == SandboxMode.RLIMIT:
+        return RlimitSandbox(limits)
+
+    try:
+        return CgroupSandbox(limits, cgroup_parent)
+    except OSError:
+        if mode == SandboxMode.CGROUP:
+            raise
+        return RlimitSandbox(limits)
+
+def _own_cgroup() -> Path:
+    for line in Path("/proc/self/cgroup").read_text().splitlines():
+        if line.startswith("0::"):
+            return CGROUP_ROOT / line[3:].lstrip("/")
+    raise OSError("Process does not belong to a cgroup v2 hierarchy")
+
+def _read_flat_keyed(path: Path) -> dict[str, int]:
+    if not path.exists():
+        return {}
+    entries = (line.split() for line in path.read_text().splitlines())
+    return {key: int(value) for key, value in entries}
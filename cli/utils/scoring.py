@@ -0,0 +1,58 @@
+# Standard library imports
+from enum import Enum
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Load vendored packages
+from vendor.package_loader import load_packages
+load_packages()
+
+# Third-party imports
+import numpy
+
+# Project-local imports
+from cli.models.score_scheme import ScoreScheme
+from cli.utils.util import AssertClassification, RuntimeClassification
+
+# Classifications of the LiSA warnings on each property type, as in the 'Type' column of score.csv
+CLASSIFICATIONS: Dict[str, type[Enum]] = {
+    "assert": AssertClassification,
+    "runtime": RuntimeClassification,
+}
+
+# Verdicts by code, for bulk scoring: any other verdict (UNKNOWN, TIMEOUT, ...) has the code of UNKNOWN
+VERDICTS = ["TRUE", "FALSE", "UNKNOWN"]
+
+@lru_cache
+def score_table(scheme: ScoreScheme) -> Dict[Tuple[str, bool, Enum], Tuple[int, str]]:
+    """
+        Score and SV-COMP verdict of every (property type, expected verdict, classification), computed once per scheme
+    """
+    return {
+        (property_type, expected, classification): (scheme.score(expected, classification.value[1]), classification.value[1])
+        for property_type, classifications in CLASSIFICATIONS.items()
+        for expected in (False, True)
+        for classification in classifications
+    }
+
+@lru_cache
+def verdict_points(scheme: ScoreScheme) -> numpy.ndarray:
+    """
+        Points of each verdict code (columns, see VERDICTS) when FALSE (row 0) or TRUE (row 1) is expected
+    """
+    points = numpy.array([[scheme.score(expected, verdict) for verdict in VERDICTS] for expected in (False, True)])
+    points.flags.writeable = False
+    return points
+
+def verdict_codes(verdicts) -> numpy.ndarray:
+    """
+        Codes (see VERDICTS) of a column of verdicts
+    """
+    verdicts = numpy.asarray(verdicts, dtype=object)
+    return numpy.where(verdicts == "TRUE", 0, numpy.where(verdicts == "FALSE", 1, 2))
+
+def score_verdicts(scheme: ScoreScheme, expected, verdicts) -> numpy.ndarray:
+    """
+        Scores whole columns at once: the expected verdicts (booleans) and the verdicts given, e.g. of svcomp.csv
+    """
+    return verdict_points(scheme)[numpy.asarray(expected, dtype=int), verdict_codes(verdicts)]
@@ -0,0 +1,66 @@
+# Standard library imports
+import csv
+import heapq
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+# Rows sorted in memory at once by iter_sorted_rows; larger tables are sorted in runs merged from disk
+SORT_CHUNK_ROWS = 100_000
+
+class NumberedCsvWriter:
+    """
+        Writes a CSV table row by row, prefixed by a 'No.' column numbering the distinct values of one column
+        in order of first appearance (rows sharing the value share the number, e.g. the properties of a task).
+        Rows are flushed as they are written, so the table is complete up to the last scored task at any time
+    """
+
+    def __init__(self, path: Path, columns: list[str], numbered_by: str):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.writer(self.file, lineterminator="\n")
+        self.writer.writerow(["No.", *columns])
+        self.key = columns.index(numbered_by)
+        self.numbers: dict[str, int] = {}
+
+    def write(self, rows: list[list]):
+        for row in rows:
+            number = self.numbers.setdefault(row[self.key], len(self.numbers) + 1)
+            self.writer.writerow([number, *row])
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+def iter_sorted_rows(path: Path, key: Callable[[list[str]], Any], chunk_rows: int = SORT_CHUNK_ROWS) -> Iterator[list[str]]:
+    """
+        Yields the rows of a CSV table (header excluded) sorted by key, stably, holding at most chunk_rows rows in memory:
+        sorted runs of chunk_rows rows are spilled to temporary files, then merged
+    """
+
+    with open(path, newline="") as f, tempfile.TemporaryDirectory() as scratch:
+        reader = csv.reader(f)
+        next(reader, None)
+        runs = []
+        while True:
+            chunk = [row for _, row in zip(range(chunk_rows), reader)]
+            if not chunk:
+                break
+            chunk.sort(key=key)
+            run = Path(scratch) / f"run{len(runs)}.csv"
+            with open(run, "w", newline="") as out:
+                csv.writer(out).writerows(chunk)
+            runs.append(run)
+
+        files = [open(run, newline="") for run in runs]
+        try:
+            # heapq.merge breaks ties by run order, which keeps the sort stable
+            yield from heapq.merge(*(csv.reader(run) for run in files), key=key)
+        finally:
+            for run in files:
+                run.close()
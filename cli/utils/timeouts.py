@@ -0,0 +1,189 @@
+# Standard library imports
+import json
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+from dataclasses import dataclass, field
+
+# Project-local imports
+from cli.models.task_outcome import TaskOutcome
+from cli.utils.progress import AnalysisProgress
+from cli.utils.history import HistoryDatabase
+
+# Written to the output directory by runs with an adaptive timeout policy: one JSON object per decision taken
+TIMEOUTS_FILE = "timeouts.jsonl"
+
+# Tasks that completed before get this many times their longest past wall time...
+HISTORY_MARGIN = 2.0
+
+# ...plus this many seconds (JVM start-up, a loaded machine)
+HISTORY_SLACK = 10
+
+# Tasks that never completed in past runs, and ran out of the full timeout in at least one, get this fraction of it
+HOPELESS_FRACTION = 0.25
+
+# Names the default LiSA configuration goes by: the history of runs without any configuration is its own
+DEFAULT_CONFIGURATIONS = (None, "default")
+
+# Shortest timeout (in seconds) the policy gives a task it runs at all
+MIN_TIMEOUT = 1
+
+@dataclass
+class TaskHistory:
+    """
+        How the past runs of a task ended: wall times (in seconds) of those that completed and of those that timed out
+    """
+
+    completed: list[float] = field(default_factory=list)
+    timed_out: list[float] = field(default_factory=list)
+
+    def timed_out_after(self, timeout: float) -> int:
+        """
+            Number of past runs that timed out only after running for 'timeout' seconds: runs given a shorter
+            timeout (by the policy itself) or killed early tell nothing about whether the task can complete
+        """
+        return sum(wall_time >= timeout for wall_time in self.timed_out)
+
+def load_task_history(db: Path, configurations: list[Optional[str]], last: int, usage: list[dict]) -> dict[tuple[Optional[str], str], TaskHistory]:
+    """
+        Past timings of every task, by (LiSA configuration, task): from the 'last' most recent runs of the history
+        database or, if it records none, from the usage.csv of the previous run (its rows, as read by read_usage).
+        Runs that were not matrix runs are recorded under the None configuration
+    """
+
+    history: dict[tuple[Optional[str], str], TaskHistory] = {}
+    if db.exists():
+        database = HistoryDatabase(db)
+        try:
+            for configuration in dict.fromkeys([None, *configurations]):
+                for row in database.task_timings(configuration or "", last):
+                    # no wall time: restored from the cache or ended by an error, it tells nothing of how long the task takes
+                    if not row["timed_out"] and row["wall_time"] is None:
+                        continue
+                    past = history.setdefault((configuration, row["task"]), TaskHistory())
+                    if row["timed_out"]:
+                        past.timed_out.append(row["wall_time"] or 0.0)
+                    else:
+                        past.completed.append(row["wall_time"])
+        finally:
+            database.close()
+    if history:
+        return history
+
+    # a portfolio stage or a repeat is a run of its own: the times of the regular executions are kept per configuration
+    for row in usage:
+        if row.get("Repeat", "1") != "1" or row["Outcome"] == TaskOutcome.CACHED.value:
+            continue
+        past = history.setdefault((row["Configuration"] or None, row["Test case"]), TaskHistory())
+        if row["Outcome"] == TaskOutcome.TIMEOUT.value:
+            past.timed_out.append(float(row["Wall time"]))
+        elif row["Outcome"] == TaskOutcome.DONE.value:
+            past.completed.append(float(row["Wall time"]))
+    return history
+
+class TimeoutPolicy:
+    """
+        Decides how long each analysis may run, in place of the single --timeout, which stays the upper bound:
+        - adaptive: tasks get a timeout from their past wall times (HISTORY_MARGIN times the longest, plus HISTORY_SLACK),
+          and tasks that never completed but ran out of the full timeout get HOPELESS_FRACTION of it (once such runs
+          leave the history window, the task gets the full timeout again);
+        - with a run budget: the wall-clock time left is shared among the analyses not finished yet, 'parallelism'
+          at a time; analyses starting once it is spent do not run (and time out);
+        - with early kill: analyses past the given fraction of their timeout are killed while others wait for a worker,
+          unless a past run of the task completed after running at least as long.
+        Every decision is appended to the audit log (TIMEOUTS_FILE)
+    """
+
+    def __init__(self, timeout: int, history: dict[tuple[Optional[str], str], TaskHistory], audit: Path, progress: AnalysisProgress, adaptive: bool = True, budget: Optional[float] = None, early_kill: Optional[float] = None):
+        self.timeout = timeout
+        self.history = history
+        self.progress = progress
+        self.adaptive = adaptive
+        self.budget = budget
+        self.early_kill = early_kill
+        self.start_time = time.time()
+        self.lock = Lock()
+        self.decisions = {"shortened": 0, "skipped": 0, "killed early": 0}
+        self.audit = audit.open("w")
+
+    def past(self, configuration: Optional[str], task: str) -> Optional[TaskHistory]:
+        """
+            Past runs of the task with the configuration. Other configurations (e.g., later portfolio stages) are often
+            slower than the default one: they do not learn from its history
+        """
+        if configuration in DEFAULT_CONFIGURATIONS:
+            return self.history.get((None, task)) or self.history.get(("default", task))
+        return self.history.get((configuration, task))
+
+    def assign(self, task: str, configuration: Optional[str], timeout: float) -> float:
+        """
+            Timeout (in seconds) of an analysis about to start, at most the given one; 0 when it should not run
+        """
+
+        reasons = []
+        past = self.past(configuration, task) if self.adaptive else None
+        learned = None
+        full_timeouts = past.timed_out_after(self.timeout) if past else 0
+        if past and full_timeouts and not past.completed:
+            learned = ("hopeless", max(MIN_TIMEOUT, HOPELESS_FRACTION * self.timeout))
+        elif past and past.completed and not full_timeouts:
+            learned = ("history", max(MIN_TIMEOUT, HISTORY_MARGIN * max(past.completed) + HISTORY_SLACK))
+        if learned and learned[1] < timeout:
+            reasons.append(learned[0])
+            timeout = learned[1]
+
+        if self.budget is not None:
+            remaining = self.budget - (time.time() - self.start_time)
+            progress = self.progress.snapshot()
+            unfinished = max(progress["total"] - progress["finished"], 1)
+            share = min(remaining, remaining * self.progress.parallelism / unfinished)
+            if share < timeout:
+                reasons.append("budget")
+                timeout = max(MIN_TIMEOUT, share) if remaining >= MIN_TIMEOUT else 0
+
+        decision = "skip" if timeout <= 0 else "timeout"
+        if reasons:
+            with self.lock:
+                self.decisions["skipped" if decision == "skip" else "shortened"] += 1
+        self.__log(decision, task, configuration, timeout=round(timeout, 3), reasons=reasons or ["default"], history=past)
+        return timeout
+
+    def should_kill(self, task: str, configuration: Optional[str], elapsed: float, timeout: float) -> bool:
+        """
+            Whether an analysis running for 'elapsed' seconds (out of 'timeout') is to be killed early
+        """
+
+        if self.early_kill is None or elapsed < self.early_kill * timeout:
+            return False
+        progress = self.progress.snapshot()
+        if progress["total"] - progress["finished"] - progress["active"] <= 0:
+            return False
+        past = self.past(configuration, task)
+        if past and any(wall_time >= elapsed for wall_time in past.completed):
+            return False
+        with self.lock:
+            self.decisions["killed early"] += 1
+        self.__log("early-kill", task, configuration, elapsed=round(elapsed, 3), timeout=round(timeout, 3), history=past)
+        return True
+
+    def summary(self) -> str:
+        return "Timeout policy: " + ", ".join(f"{count} {decision}" for decision, count in self.decisions.items())
+
+    def close(self):
+        self.audit.close()
+
+    def __log(self, decision: str, task: str, configuration: Optional[str], history: Optional[TaskHistory], **details):
+        record = {
+            "at": round(time.time() - self.start_time, 3),
+            "decision": decision,
+            "task": task,
+            "configuration": configuration,
+            **details,
+            "past_completed": len(history.completed) if history else 0,
+            "past_longest": max(history.completed, default=None) if history else None,
+            "past_timed_out": len(history.timed_out) if history else 0,
+        }
+        with self.lock:
+            self.audit.write(json.dumps(record) + "\n")
+            self.audit.flush()
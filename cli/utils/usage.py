@@ -0,0 +1,59 @@
+# Standard library imports
+import csv
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+# Project-local imports
+from cli.models.task_outcome import TaskOutcome
+from cli.utils.sandbox import ResourceUsage
+
+USAGE_FILE = "usage.csv"
+USAGE_COLUMNS = ["Test case", "Configuration", "Outcome", "Wall time", "Memory peak", "CPU usage", "CPU user", "CPU system", "Repeat"]
+
+class UsageJournal:
+    """
+        Append-only record (usage.csv) of how each analysis ended and which resources it consumed.
+        Wall time is in seconds, memory in bytes, CPU times in microseconds; unmeasured values are left empty.
+        Rows are flushed as soon as a task finishes, so the journal can be followed while 'analyse' runs
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = Lock()
+        self.file = path.open("w", newline="")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(USAGE_COLUMNS)
+        self.file.flush()
+
+    def record(self, file_name: str, outcome: TaskOutcome, wall_time: float, usage: Optional[ResourceUsage] = None, configuration: Optional[str] = None, repeat: int = 1):
+        usage = usage or ResourceUsage()
+        with self.lock:
+            self.writer.writerow([
+                file_name,
+                _optional(configuration),
+                outcome.value,
+                f"{wall_time:.3f}",
+                _optional(usage.memory_peak),
+                _optional(usage.cpu_usage_usec),
+                _optional(usage.cpu_user_usec),
+                _optional(usage.cpu_system_usec),
+                repeat,
+            ])
+            self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def read_usage(path: Path) -> list[dict]:
+    """
+        Reads back a usage.csv journal as a list of rows keyed by column name
+    """
+
+    if not path.exists():
+        return []
+    with path.open(newline="") as f:
+        return list(csv.DictReader(f))
+
+def _optional(value) -> str:
+    return "" if value is None else str(value)
@@ -16,7 +16,8 @@ def json_serializer(obj):
     if isinstance(obj, Path):
         return str(obj)
     elif dataclasses.is_dataclass(obj):
-        return dataclasses.asdict(obj)
+        # Fields derived on construction (init=False) are left out: they are computed again when loading
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj) if f.init}
     else:
         return json.JSONEncoder.default(obj)
 
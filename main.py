@@ -1,4 +1,8 @@
 #!/usr/bin/python3
+# Standard library imports
+from pathlib import Path
+from typing import Optional
+
 # Load vendored packages
 from vendor.package_loader import load_packages
 load_packages()
@@ -8,6 +12,7 @@ import typer
 
 # Project-local imports
 from cli.utils.util import get_meta_info
+from cli.utils.profiling import ProfileMode, start_profiling
 
 # CLI setup
 cli = typer.Typer(
@@ -25,21 +30,36 @@ cli = typer.Typer(
 
 @cli.callback(invoke_without_command=True)
 def main(
+    ctx: typer.Context,
     version: bool = typer.Option(
         False, "--version", "-v", help="Show the CLI version and exit", is_eager=True
     ),
+    profile: Optional[ProfileMode] = typer.Option(
+        None, "--profile", help="Profile the command (cprofile for time, tracemalloc for memory) and save the results to the output directory"
+    ),
+    profile_top: int = typer.Option(
+        30, "--profile-top", help="Number of entries in the profile summary"
+    ),
 ):
     if version:
         from cli.commands.version import version as vs
         vs()
         raise typer.Exit()
 
+    if profile and ctx.invoked_subcommand:
+        from cli.models.config import Config
+        output_dir = Config.get().path_to_output_dir or Path.cwd()
+        ctx.call_on_close(start_profiling(profile, output_dir, ctx.invoked_subcommand, profile_top))
+
 from cli.commands.setup import cli as setup
 from cli.commands.harvest import cli as harvest
 from cli.commands.analyse import cli as analyse
 from cli.commands.check import cli as check
 from cli.commands.statistics import cli as statistics
 from cli.commands.compare import cli as compare
+from cli.commands.export_run import cli as export_run
+from cli.commands.import_run import cli as import_run
+from cli.commands.history import cli as history
 from cli.commands.version import cli as version
 
 cli.add_typer(setup)
@@ -48,6 +68,9 @@ cli.add_typer(analyse)
 cli.add_typer(check)
 cli.add_typer(statistics)
 cli.add_typer(compare)
+cli.add_typer(export_run)
+cli.add_typer(import_run)
+cli.add_typer(history)
 cli.add_typer(version)
 
 if __name__ == "__main__":